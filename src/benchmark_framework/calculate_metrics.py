@@ -1,3 +1,4 @@
+import shutil
 import typer
 from pathlib import Path
 from typing import List, Dict, Any
@@ -11,6 +12,7 @@ from src.benchmark_framework.metrics.rouge_w import RougeWMetric
 from src.common.file_operations import FileOperations
 from src.parsers.extractors.legal_reference_extractor import LegalReferenceExtractor
 from src.common.text_formatter import TextFormatter
+from src.benchmark_framework.utils.coverage import get_coverage_path
 
 app = typer.Typer(help="CLI for calculating metrics on benchmark results")
 
@@ -56,6 +58,7 @@ def process_entry(entry: Dict[str, Any], metrics: List[BaseMetric]) -> Dict[str,
     entry["accuracy_metrics"] = accuracy_metrics
     entry["text_metrics"] = text_metrics
     entry.pop("model_response", None)
+    entry.pop("sampled_responses", None)
     return entry
 
 
@@ -135,6 +138,9 @@ def calculate_metrics(
         ]
 
         FileOperations.save_jsonl(processed_entries, output_path)
+        coverage_path = get_coverage_path(jsonl_file)
+        if coverage_path.exists():
+            shutil.copyfile(coverage_path, get_coverage_path(output_path))
         processed_count += 1
 
     typer.echo("")
@@ -1,11 +1,29 @@
 import typer
+from dataclasses import replace
 from pathlib import Path
 from typing import Optional
 
 from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.configs.pricing import load_price_table
+from src.benchmark_framework.configs.runner_config import CONTEXT_POLICIES
 from src.benchmark_framework.runner import BenchmarkRunner
 from src.benchmark_framework.getters.get_manager import get_manager
-from src.benchmark_framework.getters.get_llm_model import get_llm_model
+from src.benchmark_framework.getters.get_llm_model import (
+    get_llm_model,
+    get_model_class,
+)
+from src.benchmark_framework.managers.exam_manager import (
+    ADAPTIVE_TRACK_SUFFIX,
+    SCORING_MODES,
+)
+from src.benchmark_framework.models.local_model import QUANTIZATION_MODES
+from src.benchmark_framework.utils.cassette import CassetteServer
+from src.benchmark_framework.utils.deadline import parse_deadline
+from src.benchmark_framework.utils.irt import ItemParameters
+from src.benchmark_framework.utils.provider_stats import PROVIDER_STATS_FILENAME
+
+# Results of replayed runs, per cassette, under the output directory
+REPLAY_RESULTS_DIRNAME = "replays"
 
 app = typer.Typer(help="CLI for LLM Benchmark Framework")
 
@@ -33,17 +51,365 @@ def run(
         "-y",
         help="Specific year of tests to run (e.g. 2012). If not provided, runs all available.",
     ),
+    min_concurrency: Optional[int] = typer.Option(
+        None,
+        "--min-concurrency",
+        help="Floor for the adaptive number of in-flight requests.",
+    ),
+    max_concurrency: Optional[int] = typer.Option(
+        None,
+        "--max-concurrency",
+        help="Ceiling for the adaptive number of in-flight requests (1 runs sequentially).",
+    ),
+    deadline: Optional[str] = typer.Option(
+        None,
+        "--deadline",
+        help="Stop starting new tasks at this time: a duration (e.g. 8h, 90m) or an ISO datetime. Tasks are spread evenly across years and exam types.",
+    ),
+    max_cost: Optional[float] = typer.Option(
+        None, "--max-cost", help="Stop the run once this much (USD) has been spent."
+    ),
+    max_daily_cost: Optional[float] = typer.Option(
+        None,
+        "--max-daily-cost",
+        help="Stop once this much (USD) has been spent today across runs.",
+    ),
+    pause_on_budget: bool = typer.Option(
+        False,
+        "--pause-on-budget",
+        help="Wait for the next day instead of stopping when the daily budget is spent.",
+    ),
+    pack_size: int = typer.Option(
+        1,
+        "--pack-size",
+        help="Send up to this many exam questions from the same exam in one request.",
+    ),
+    samples: int = typer.Option(
+        1,
+        "--samples",
+        help="Sample this many answers per question and keep the majority vote (self-consistency).",
+    ),
+    cascade_samples: int = typer.Option(
+        1,
+        "--cascade-samples",
+        help="Cascade models: small-model samples per question used to judge its confidence.",
+    ),
+    cascade_min_agreement: float = typer.Option(
+        1.0,
+        "--cascade-min-agreement",
+        help="Cascade models: escalate when fewer than this share of small-model samples agree.",
+    ),
+    quantize: Optional[str] = typer.Option(
+        None,
+        "--quantize",
+        help="Local models: 4bit or 8bit (bitsandbytes, CUDA) or int8 (dynamic, CPU).",
+    ),
+    revision: Optional[str] = typer.Option(
+        None,
+        "--revision",
+        help="Local and ONNX models: Hugging Face revision (branch, tag or commit).",
+    ),
+    batch_size: Optional[int] = typer.Option(
+        None,
+        "--batch-size",
+        help="Local models: generate this many tasks per batched forward pass.",
+    ),
+    chunk_size: int = typer.Option(
+        64,
+        "--chunk-size",
+        help="Local models: pending tasks length-sorted together into batches.",
+    ),
+    prefix_cache: bool = typer.Option(
+        True,
+        "--prefix-cache/--no-prefix-cache",
+        help="Local models: reuse the key/value cache of each distinct system prompt.",
+    ),
+    weights_cache: Optional[Path] = typer.Option(
+        None,
+        "--weights-cache",
+        help="Local models: directory caching prepared (converted, quantized) weights across runs.",
+    ),
+    threads: Optional[int] = typer.Option(
+        None, "--threads", help="GGUF models: llama.cpp threads (default all cores)."
+    ),
+    context_size: Optional[int] = typer.Option(
+        None,
+        "--context-size",
+        help="GGUF models: context window in tokens (default the model's trained context).",
+    ),
+    scoring: Optional[str] = typer.Option(
+        None,
+        "--scoring",
+        help="Exams on local models: answer by log-likelihood of each choice's letter or full text.",
+    ),
+    adaptive_from: Optional[Path] = typer.Option(
+        None,
+        "--adaptive-from",
+        help="Results with metrics of other models; calibrate question difficulty on them and ask only the most informative questions.",
+    ),
+    target_se: float = typer.Option(
+        0.3,
+        "--target-se",
+        help="Adaptive mode: stop once the ability estimate's standard error is this small.",
+    ),
+    max_items: Optional[int] = typer.Option(
+        None,
+        "--max-items",
+        help="Adaptive mode: ask at most this many questions.",
+    ),
+    context_window: Optional[int] = typer.Option(
+        None,
+        "--context-window",
+        help="Judgments: keep only this many tokens (words) around each mask instead of the whole justification.",
+    ),
+    header_tokens: int = typer.Option(
+        100,
+        "--header-tokens",
+        help="Judgments with --context-window: leading tokens of the justification to keep.",
+    ),
+    context_policy: Optional[str] = typer.Option(
+        None,
+        "--context-policy",
+        help="Count tokens before sending and skip, truncate or route to --context-fallback tasks that exceed the context window.",
+    ),
+    context_limit: Optional[int] = typer.Option(
+        None,
+        "--context-limit",
+        help="Context window in tokens (defaults to the known limit of the model).",
+    ),
+    context_fallback: Optional[str] = typer.Option(
+        None,
+        "--context-fallback",
+        help="Long-context model answering tasks that do not fit (with --context-policy fallback).",
+    ),
+    max_output_tokens: Optional[int] = typer.Option(
+        None,
+        "--max-output-tokens",
+        help="Cap output tokens per request (truncated responses are retried with a higher cap).",
+    ),
+    auto_output_cap: bool = typer.Option(
+        False,
+        "--auto-output-cap",
+        help="Cap output tokens at p99 (+25%) of this model's stored response lengths for the task type.",
+    ),
+    structured_output: bool = typer.Option(
+        False,
+        "--structured-output",
+        help="Constrain responses to the task's JSON schema with the provider's structured-output feature.",
+    ),
+    request_timeout: float = typer.Option(
+        300.0,
+        "--request-timeout",
+        help="Seconds before a single request is abandoned and retried (0 disables the timeout).",
+    ),
+    http_pool_size: int = typer.Option(
+        100,
+        "--http-pool-size",
+        help="Kept-alive connections shared by OpenAI-SDK based models (OpenAI, OpenRouter, NVIDIA).",
+    ),
+    http2: bool = typer.Option(
+        False,
+        "--http2",
+        help="Use HTTP/2 for OpenAI-SDK based models (needs the h2 package).",
+    ),
+    rank_providers: bool = typer.Option(
+        False,
+        "--rank-providers",
+        help="OpenRouter: rank upstream providers (same quantization) by recent latency and error rate.",
+    ),
+    price_table: Optional[Path] = typer.Option(
+        None,
+        "--price-table",
+        help="JSON file with per-model prices (USD per million input/output tokens).",
+    ),
+    record_cassette: Optional[Path] = typer.Option(
+        None,
+        "--record-cassette",
+        help="Proxy the model's HTTP API through a local server and record every exchange to this JSONL file.",
+    ),
+    replay_cassette: Optional[Path] = typer.Option(
+        None,
+        "--replay-cassette",
+        help="Serve the model's HTTP API from exchanges recorded with --record-cassette (no network).",
+    ),
+    replay_latency_scale: float = typer.Option(
+        1.0,
+        "--replay-latency-scale",
+        help="Multiply recorded latencies when replaying (0 answers immediately).",
+    ),
+    replay_error_rate: float = typer.Option(
+        0.0,
+        "--replay-error-rate",
+        help="Share of replayed requests answered with an injected 429 or 503 error.",
+    ),
 ):
-    model_config = ModelConfig(google_search=google_search)
+    if quantize is not None and quantize not in QUANTIZATION_MODES:
+        raise typer.BadParameter(
+            f"--quantize must be one of: {', '.join(QUANTIZATION_MODES)}."
+        )
+    if replay_cassette is not None:
+        # Replayed answers are not new results: keep them out of the real results tree
+        output_path = output_path / REPLAY_RESULTS_DIRNAME / replay_cassette.stem
+        typer.echo(f"Replayed results go to {output_path}")
+    model_config = ModelConfig(
+        google_search=google_search,
+        quantize=quantize,
+        revision=revision,
+        batch_size=batch_size,
+        chunk_size=chunk_size,
+        prefix_cache=prefix_cache,
+        weights_cache_dir=weights_cache,
+        threads=threads,
+        context_size=context_size,
+        cascade_samples=cascade_samples,
+        cascade_min_agreement=cascade_min_agreement,
+        max_output_tokens=max_output_tokens,
+        structured_output=structured_output,
+        request_timeout=request_timeout or None,
+        http_pool_size=http_pool_size,
+        http2=http2,
+        rank_providers=rank_providers,
+        provider_stats_path=(
+            output_path / PROVIDER_STATS_FILENAME if rank_providers else None
+        ),
+    )
+
+    cassette_server = None
+    if record_cassette is not None or replay_cassette is not None:
+        if record_cassette is not None and replay_cassette is not None:
+            raise typer.BadParameter(
+                "--record-cassette cannot be combined with --replay-cassette."
+            )
+        if replay_cassette is not None and not replay_cassette.exists():
+            raise typer.BadParameter(f"Cassette '{replay_cassette}' does not exist.")
+        upstream = get_model_class(model_name).get_api_base_url()
+        if upstream is None:
+            raise typer.BadParameter(
+                f"Model '{model_name}' has no HTTP API to record or replay."
+            )
+        cassette_server = CassetteServer(
+            record_cassette or replay_cassette,
+            upstream,
+            record_mode=record_cassette is not None,
+            latency_scale=replay_latency_scale,
+            error_rate=replay_error_rate,
+        )
+        model_config.base_url = cassette_server.start()
+
     model = get_llm_model(model_name, model_config)
-    manager = get_manager(task_type, model, Path(input_path), year)
+    manager_kwargs = {}
+    if context_window is not None:
+        if task_type != "judgments":
+            raise typer.BadParameter("--context-window applies to judgments only.")
+        manager_kwargs = {
+            "context_window": context_window,
+            "header_tokens": header_tokens,
+        }
+    if scoring is not None:
+        if scoring not in SCORING_MODES:
+            raise typer.BadParameter(
+                f"--scoring must be one of: {', '.join(SCORING_MODES)}."
+            )
+        if task_type != "exams":
+            raise typer.BadParameter("--scoring applies to exams only.")
+        if not model.supports_scoring:
+            raise typer.BadParameter(
+                f"Model '{model_name}' does not support log-likelihood scoring."
+            )
+        if samples > 1 or pack_size > 1 or adaptive_from is not None:
+            raise typer.BadParameter(
+                "--scoring cannot be combined with --samples, --pack-size or --adaptive-from."
+            )
+        manager_kwargs["scoring"] = scoring
+    if adaptive_from is not None:
+        if task_type != "exams":
+            raise typer.BadParameter("--adaptive-from applies to exams only.")
+        manager_kwargs["adaptive"] = True
+    manager = get_manager(task_type, model, Path(input_path), year, **manager_kwargs)
+
+    runner_config = model.get_default_runner_config()
+    if min_concurrency is not None:
+        runner_config.min_concurrency = min_concurrency
+    if max_concurrency is not None:
+        runner_config.max_concurrency = max_concurrency
+    runner_config.max_concurrency = max(
+        runner_config.max_concurrency, runner_config.min_concurrency
+    )
+    if deadline is not None:
+        runner_config.deadline = parse_deadline(deadline)
+    runner_config.max_run_cost = max_cost
+    runner_config.max_daily_cost = max_daily_cost
+    runner_config.pause_on_budget = pause_on_budget
+    # Replayed requests cost nothing, so they never count against the daily budget
+    runner_config.track_daily_cost = replay_cassette is None
+    if pack_size > 1 and not manager.supports_packing:
+        raise typer.BadParameter(f"Task type '{task_type}' does not support packing.")
+    runner_config.pack_size = pack_size
+    if samples > 1 and not manager.supports_sampling:
+        raise typer.BadParameter(
+            f"Task type '{task_type}' does not support self-consistency sampling."
+        )
+    if samples > 1 and pack_size > 1:
+        raise typer.BadParameter("--samples cannot be combined with --pack-size.")
+    if batch_size is not None and batch_size > 1:
+        if not model.supports_batching:
+            raise typer.BadParameter(
+                f"Model '{model_name}' does not support batched generation."
+            )
+        if samples > 1 or pack_size > 1:
+            raise typer.BadParameter(
+                "--batch-size cannot be combined with --samples or --pack-size."
+            )
+    runner_config.samples = samples
+    runner_config.adaptive_target_se = target_se
+    runner_config.adaptive_max_items = max_items
+
+    if context_policy is not None and context_policy not in CONTEXT_POLICIES:
+        raise typer.BadParameter(
+            f"--context-policy must be one of: {', '.join(CONTEXT_POLICIES)}."
+        )
+    if context_policy == "fallback" and context_fallback is None:
+        raise typer.BadParameter("--context-policy fallback needs --context-fallback.")
+    runner_config.context_policy = context_policy
+    runner_config.context_limit = context_limit
+    runner_config.auto_output_cap = auto_output_cap
+    fallback_model = (
+        # The cassette server only stands in for the main model's API
+        get_llm_model(context_fallback, replace(model_config, base_url=None))
+        if context_policy == "fallback"
+        else None
+    )
+
+    item_parameters = None
+    if adaptive_from is not None:
+        # Calibrate on other models only, never on earlier results of this one
+        model_dir = model_name.replace("/", "-")
+        item_parameters = ItemParameters.fit(
+            adaptive_from,
+            exclude_models=[model_dir, model_dir + ADAPTIVE_TRACK_SUFFIX],
+        )
+        typer.echo(
+            f"Calibrated {len(item_parameters.item_keys)} questions on "
+            f"{len(item_parameters.calibration_models)} models."
+        )
 
-    runner = BenchmarkRunner(manager, output_path=Path(output_path))
+    runner = BenchmarkRunner(
+        manager,
+        output_path=Path(output_path),
+        runner_config=runner_config,
+        price_table=load_price_table(price_table),
+        item_parameters=item_parameters,
+        fallback_model=fallback_model,
+    )
     typer.echo(f"Running benchmark for {model_name} on {len(manager.tasks)} tasks...")
     if year:
         typer.echo(f"Filtering for year: {year}")
 
-    runner.run()
+    try:
+        runner.run()
+    finally:
+        if cassette_server is not None:
+            cassette_server.stop()
 
 
 if __name__ == "__main__":
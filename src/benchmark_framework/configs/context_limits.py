@@ -0,0 +1,21 @@
+from typing import Dict, Optional
+
+# Context windows in tokens (input and output together); override with `--context-limit`.
+CONTEXT_LIMITS: Dict[str, int] = {
+    "gpt-4o": 128_000,
+    "gpt-4o-mini": 128_000,
+    "claude-3-5-sonnet-latest": 200_000,
+    "gemini-2.0-flash": 1_048_576,
+    "mistral-large-latest": 128_000,
+    "meta-llama/llama-3.3-70b-instruct": 131_072,
+    "meta-llama/llama-3.1-405b-instruct": 131_072,
+    "meta-llama/llama-4-maverick": 1_048_576,
+    "deepseek/deepseek-v3.2": 163_840,
+    "google/gemma-3-12b-it": 131_072,
+    "mistralai/mistral-nemo": 131_072,
+    "speakleash/Bielik-11B-v2.6-Instruct": 32_768,
+}
+
+
+def get_context_limit(model_name: str) -> Optional[int]:
+    return CONTEXT_LIMITS.get(model_name)
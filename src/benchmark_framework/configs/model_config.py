@@ -1,6 +1,12 @@
-from dataclasses import dataclass
+import json
+from dataclasses import asdict, dataclass
+from pathlib import Path
 from typing import Optional
 
+# Where a run keeps its files and connects to rather than how the model answers;
+# left out of the configuration stored with each result
+RUNTIME_FIELDS = ("base_url", "provider_stats_path", "weights_cache_dir")
+
 
 @dataclass
 class ModelConfig:
@@ -10,6 +16,49 @@ class ModelConfig:
 
     google_search: bool = False
     quantize: Optional[str] = None
+    # Local and ONNX models: Hugging Face revision (branch, tag or commit)
+    revision: Optional[str] = None
     batch_size: Optional[int] = None
     chunk_size: int = 64
+    # Local models: reuse the key/value cache of each distinct system prompt
+    prefix_cache: bool = True
+    # Local models: directory of prepared weights reused across runs (None
+    # loads and converts the checkpoint every time)
+    weights_cache_dir: Optional[Path] = None
+    # GGUF models: llama.cpp threads (None uses all cores) and context window in
+    # tokens (None uses the model's trained context)
+    threads: Optional[int] = None
+    context_size: Optional[int] = None
+    # Seconds before a single request is abandoned (None disables the timeout)
+    request_timeout: Optional[float] = 300.0
+    # Replaces the provider's API root URL (e.g. a local cassette server)
+    base_url: Optional[str] = None
+    # Connections kept open per shared HTTP client of OpenAI-SDK adapters, and
+    # whether they negotiate HTTP/2 (needs the `h2` package)
+    http_pool_size: int = 100
+    http2: bool = False
+    # Output token cap per request (None keeps each adapter's default)
+    max_output_tokens: Optional[int] = None
+    # Ask providers for responses following the task's JSON schema
+    structured_output: bool = False
+    # OpenRouter: rank upstream providers by recent latency and error rate, with
+    # statistics persisted in `provider_stats_path`
+    rank_providers: bool = False
+    provider_stats_path: Optional[Path] = None
+    # Cascade models: small-model samples per question and the share of them that
+    # must agree to keep the small model's answer
+    cascade_samples: int = 1
+    cascade_min_agreement: float = 1.0
     extra_body = None
+
+    def to_json(self) -> str:
+        """
+        JSON of the settings stored with each result (without RUNTIME_FIELDS).
+        """
+        return json.dumps(
+            {
+                name: value
+                for name, value in asdict(self).items()
+                if name not in RUNTIME_FIELDS
+            }
+        )
@@ -0,0 +1,45 @@
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.constants import ENCODING
+
+
+@dataclass
+class ModelPrice:
+    """Provider price in USD per million tokens."""
+
+    input_per_million: float
+    output_per_million: float
+
+    def cost(self, input_tokens: int, output_tokens: int) -> float:
+        return (
+            input_tokens * self.input_per_million
+            + output_tokens * self.output_per_million
+        ) / 1_000_000
+
+
+# List prices; override or extend with `--price-table` when providers change them.
+MODEL_PRICES: Dict[str, ModelPrice] = {
+    "gpt-4o": ModelPrice(input_per_million=2.5, output_per_million=10.0),
+    "gpt-4o-mini": ModelPrice(input_per_million=0.15, output_per_million=0.6),
+    "claude-3-5-sonnet-latest": ModelPrice(
+        input_per_million=3.0, output_per_million=15.0
+    ),
+    "gemini-2.0-flash": ModelPrice(input_per_million=0.1, output_per_million=0.4),
+    "mistral-large-latest": ModelPrice(input_per_million=2.0, output_per_million=6.0),
+}
+
+
+def load_price_table(path: Optional[Path] = None) -> Dict[str, ModelPrice]:
+    """
+    Default price table, optionally updated from a JSON file of the form
+    {"model-name": {"input_per_million": 1.0, "output_per_million": 2.0}}.
+    """
+    prices = dict(MODEL_PRICES)
+    if path is not None:
+        with open(path, "r", encoding=ENCODING) as f:
+            for model_name, price in json.load(f).items():
+                prices[model_name] = ModelPrice(**price)
+    return prices
@@ -1,12 +1,48 @@
 from dataclasses import dataclass
 from typing import Optional
 
+CONTEXT_POLICIES = ("skip", "truncate", "fallback")
+
 
 @dataclass
 class RunnerConfig:
     """
     A dataclass to hold configuration settings for a benchmark runner.
+
+    `min_concurrency` and `max_concurrency` are the floor and ceiling for the
+    adaptive in-flight request limit. A ceiling of 1 keeps the sequential runner.
+    `deadline` is a Unix timestamp after which no new tasks are started.
+    Costs are in USD; when the daily budget is spent the run stops, or waits for
+    the next day if `pause_on_budget` is set. Timeouts, 429 and 5xx errors are
+    retried up to `max_retries` times with exponential backoff. A `pack_size` above 1
+    sends up to that many tasks sharing a system prompt in a single request.
+    `samples` above 1 asks for that many responses per task and keeps the majority
+    vote (self-consistency). Adaptive runs stop once the ability estimate's standard
+    error reaches `adaptive_target_se` or after `adaptive_max_items` questions.
+    With a `context_policy`, tasks whose counted input tokens exceed the model's
+    context window (or `context_limit`) are skipped, truncated or routed to a
+    fallback model before any request is sent. `auto_output_cap` caps output tokens
+    at a high percentile of this model's stored response lengths; truncated
+    responses are retried with a doubled cap. Without `track_daily_cost` (replayed
+    runs) spend still counts against the run budget but is never added to the daily
+    ledger.
     """
 
     requests_per_minute: Optional[int] = None
     daily_limit: Optional[int] = None
+    min_concurrency: int = 1
+    max_concurrency: int = 1
+    deadline: Optional[float] = None
+    max_run_cost: Optional[float] = None
+    max_daily_cost: Optional[float] = None
+    pause_on_budget: bool = False
+    max_retries: int = 2
+    retry_backoff: float = 2.0
+    pack_size: int = 1
+    samples: int = 1
+    adaptive_target_se: float = 0.3
+    adaptive_max_items: Optional[int] = None
+    context_policy: Optional[str] = None
+    context_limit: Optional[int] = None
+    auto_output_cap: bool = False
+    track_daily_cost: bool = True
@@ -0,0 +1,28 @@
+import json
+from dataclasses import fields
+from pathlib import Path
+
+from src.benchmark_framework.configs.model_config import RUNTIME_FIELDS, ModelConfig
+
+
+def test_path_fields_are_runtime_only():
+    path_fields = [
+        field.name for field in fields(ModelConfig) if "Path" in str(field.type)
+    ]
+
+    assert path_fields
+    assert set(path_fields) <= set(RUNTIME_FIELDS)
+
+
+def test_to_json_keeps_answer_settings_only(tmp_path):
+    config = ModelConfig(
+        quantize="int8",
+        weights_cache_dir=tmp_path / "weights",
+        provider_stats_path=tmp_path / "stats.json",
+    )
+
+    stored = json.loads(config.to_json())
+
+    assert stored["quantize"] == "int8"
+    assert not set(RUNTIME_FIELDS) & set(stored)
+    assert not any(isinstance(value, Path) for value in stored.values())
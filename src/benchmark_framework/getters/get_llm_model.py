@@ -1,13 +1,19 @@
 import re
+from typing import Type
 
 from src.benchmark_framework.models.anthropic import AnthropicModel
 from src.benchmark_framework.models.openai import OpenAIModel
 from src.benchmark_framework.models.base_model import BaseModel
+from src.benchmark_framework.models.cascade_model import CascadeModel
 from src.benchmark_framework.models.gemini import GeminiModel
+from src.benchmark_framework.models.gguf_model import GGUFModel
 from src.benchmark_framework.configs.model_config import ModelConfig
 from src.benchmark_framework.models.mistral_model import MistralModel
 from src.benchmark_framework.models.hfe_model import HFEndpointModel
+from src.benchmark_framework.models.local_model import LocalModel
+from src.benchmark_framework.models.onnx_model import ONNXModel
 from src.benchmark_framework.models.open_router import OpenRouterModel
+from src.benchmark_framework.models.sim_model import SimModel
 
 MODEL_REGISTRY = {
     "gemini": GeminiModel,
@@ -24,6 +30,11 @@ MODEL_REGISTRY = {
     "mistralai": OpenRouterModel,
     "mistral": MistralModel,
     "google": OpenRouterModel,
+    "cascade": CascadeModel,
+    "sim": SimModel,
+    "local": LocalModel,
+    "gguf": GGUFModel,
+    "onnx": ONNXModel,
 }
 
 
@@ -36,13 +47,21 @@ def _get_model_type(model_name: str) -> str:
     return model_name_split[0]
 
 
-def get_llm_model(model_name, model_config: ModelConfig) -> BaseModel:
+def get_model_class(model_name: str) -> Type[BaseModel]:
     """
-    Factory function to get a model instance by name.
+    Model class registered for a model name.
     """
     model_type = _get_model_type(model_name)
     model_class = MODEL_REGISTRY.get(model_type)
     if not model_class:
         raise ValueError(f"Model name '{model_name}' is not recognized.")
+    return model_class
+
+
+def get_llm_model(model_name, model_config: ModelConfig) -> BaseModel:
+    """
+    Factory function to get a model instance by name.
+    """
+    model_class = get_model_class(model_name)
     model_instance = model_class(model_name, model_config)
     return model_instance
@@ -13,12 +13,14 @@ def get_manager(
     model: BaseModel,
     tasks_path: Path,
     year: Optional[int] = None,
+    **manager_kwargs,
 ) -> BaseManager:
     """
     Factory function to get a manager instance by dataset name.
+    Extra keyword arguments are passed to the manager (e.g. `context_window` for judgments).
     """
     manager_class = MANAGER_REGISTRY.get(task_type)
     if not manager_class:
         raise ValueError(f"Dataset name '{task_type}' is not recognized.")
-    manager_instance = manager_class(model, tasks_path, year=year)
+    manager_instance = manager_class(model, tasks_path, year=year, **manager_kwargs)
     return manager_instance
@@ -0,0 +1,161 @@
+import multiprocessing
+import resource
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import typer
+
+from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.getters.get_manager import get_manager
+from src.benchmark_framework.metrics.exact_match import ExactMatchMetric
+from src.benchmark_framework.models.local_model import (
+    LOCAL_PREFIX,
+    QUANTIZATION_MODES,
+    LocalModel,
+)
+from src.benchmark_framework.models.onnx_model import ONNX_PREFIX, ONNXModel
+from src.benchmark_framework.runner import BenchmarkRunner
+from src.common.file_operations import FileOperations
+
+# Unquantized transformers baseline in the report
+NO_QUANTIZATION = "none"
+# ONNX Runtime export of the same model
+ONNX_MODE = "onnx"
+BENCHMARK_MODES = (NO_QUANTIZATION, *QUANTIZATION_MODES, ONNX_MODE)
+
+app = typer.Typer(
+    help="Compare local model backends and quantizations on the same exam questions."
+)
+
+
+def _run_mode(
+    model_name: str,
+    mode: str,
+    input_path: Path,
+    year: Optional[int],
+    limit: Optional[int],
+    max_output_tokens: int,
+    weights_cache_dir: Optional[Path],
+) -> Dict[str, Any]:
+    """
+    Answer exam questions with one backend or quantization. Runs in its own
+    process so that peak RSS covers this model only.
+    """
+    model_config = ModelConfig(
+        max_output_tokens=max_output_tokens, weights_cache_dir=weights_cache_dir
+    )
+    model_path = LocalModel.get_model_path(model_name)
+    load_start = time.monotonic()
+    if mode == ONNX_MODE:
+        model = ONNXModel(f"{ONNX_PREFIX}/{model_path}", model_config)
+    else:
+        model_config.quantize = None if mode == NO_QUANTIZATION else mode
+        model = LocalModel(f"{LOCAL_PREFIX}/{model_path}", model_config)
+    load_time = time.monotonic() - load_start
+    manager = get_manager("exams", model, input_path, year)
+    manager.tasks = manager.tasks[:limit]
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        runner = BenchmarkRunner(
+            manager, Path(output_dir), model.get_default_runner_config()
+        )
+        runner.run()
+        entries: List[Dict[str, Any]] = [
+            entry
+            for path in Path(output_dir).rglob("*.jsonl")
+            for entry in FileOperations.load_jsonl(path)
+        ]
+
+    exact_match = ExactMatchMetric()
+    correct = sum(
+        exact_match(entry.get("model_answer") or "", entry["correct_answer"])
+        for entry in entries
+    )
+    output_tokens = sum(
+        # Generation time covers truncation retries, so count their tokens too
+        (entry.get("total_usage") or entry.get("usage", {})).get("output_tokens", 0)
+        for entry in entries
+    )
+    generation_time = sum(entry["latency"] for entry in entries)
+    return {
+        "tasks": len(entries),
+        "accuracy": correct / len(entries) if entries else 0.0,
+        "mean_latency": generation_time / len(entries) if entries else 0.0,
+        "tokens_per_second": (
+            output_tokens / generation_time if generation_time else 0.0
+        ),
+        # ru_maxrss is reported in kilobytes on Linux
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "load_time": load_time,
+    }
+
+
+@app.command()
+def run(
+    model_name: str = typer.Argument(
+        ...,
+        help=f"Local model, e.g. {LOCAL_PREFIX}/speakleash/Bielik-1.5B-v3.0-Instruct",
+    ),
+    input_path: Path = typer.Argument(
+        "data/tasks", help="Path to the input tasks directory"
+    ),
+    modes: Optional[List[str]] = typer.Option(
+        None,
+        "--mode",
+        help=f"Backend or quantization to compare (repeatable): "
+        f"{', '.join(BENCHMARK_MODES)}. Defaults to {NO_QUANTIZATION}, int8 and {ONNX_MODE}.",
+    ),
+    limit: Optional[int] = typer.Option(
+        50, "--limit", help="Number of exam questions answered in each mode."
+    ),
+    max_output_tokens: int = typer.Option(
+        256, "--max-output-tokens", help="Output token cap per question."
+    ),
+    weights_cache: Optional[Path] = typer.Option(
+        None,
+        "--weights-cache",
+        help="Cache prepared transformers weights here (a second run measures warm loads).",
+    ),
+    year: Optional[int] = typer.Option(None, "--year", "-y"),
+):
+    modes = modes or [NO_QUANTIZATION, "int8", ONNX_MODE]
+    for mode in modes:
+        if mode not in BENCHMARK_MODES:
+            raise typer.BadParameter(
+                f"--mode must be one of: {', '.join(BENCHMARK_MODES)}."
+            )
+
+    report = []
+    context = multiprocessing.get_context("spawn")
+    for mode in modes:
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            result = executor.submit(
+                _run_mode,
+                model_name,
+                mode,
+                input_path,
+                year,
+                limit,
+                max_output_tokens,
+                weights_cache,
+            ).result()
+        report.append((mode, result))
+
+    typer.echo(f"\n=== Local backend benchmark: {model_name} ===")
+    typer.echo(
+        f"  {'mode':<6} {'tasks':>6} {'accuracy':>9} {'latency':>9} {'tokens/s':>9} "
+        f"{'peak RSS':>10} {'load':>7}"
+    )
+    for mode, result in report:
+        typer.echo(
+            f"  {mode:<6} {result['tasks']:>6} {result['accuracy']:>9.1%} "
+            f"{result['mean_latency']:>8.2f}s {result['tokens_per_second']:>9.2f} "
+            f"{result['peak_rss_mb']:>8.0f}MB {result['load_time']:>6.1f}s"
+        )
+
+
+if __name__ == "__main__":
+    app()
@@ -1,11 +1,13 @@
 import json
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Optional, Dict, Set
+from collections import Counter
+from typing import Hashable, List, Optional, Dict, Set, Tuple
 
 from src.common.domain.task import Task
 from src.benchmark_framework.utils.task_loader import initialize_tasks
 from src.benchmark_framework.models.base_model import BaseModel
+from src.benchmark_framework.utils.coverage import save_coverage
 from src.constants import ENCODING
 
 
@@ -14,6 +16,19 @@ class BaseManager(ABC):
     Abstract base class for benchmark managers.
     """
 
+    # Whether several tasks can be answered in a single request (see get_packed_prompt)
+    supports_packing: bool = False
+    # Whether several sampled responses can be merged by majority vote (see get_sampled_result)
+    supports_sampling: bool = False
+    # Whether tasks can be selected adaptively from IRT item parameters (see get_item_key)
+    supports_adaptive: bool = False
+    # Whether answers can be scored by choice log-likelihood (see get_scoring_request)
+    supports_scoring: bool = False
+    # Active scoring mode; None answers tasks by generation
+    scoring: Optional[str] = None
+    # Whether results are stored as a separate adaptive-testing track
+    adaptive: bool = False
+
     def __init__(
         self,
         model: BaseModel,
@@ -34,6 +49,60 @@ class BaseManager(ABC):
         """Generate a result dictionary for a completed task."""
         pass
 
+    def get_sampled_result(self, task: Task, model_responses: List[str]) -> dict:
+        """
+        Generate a single result from several sampled responses to the same task.
+        """
+        raise NotImplementedError(
+            f"Task type '{self.task_type}' does not support self-consistency sampling."
+        )
+
+    def get_item_key(self, task: Task) -> str:
+        """
+        Identifier of the task in a calibrated IRT item bank.
+        """
+        raise NotImplementedError(
+            f"Task type '{self.task_type}' does not support adaptive testing."
+        )
+
+    def score_result(self, result: dict) -> float:
+        """
+        Correctness of a result (0 or 1) used to update the ability estimate.
+        """
+        raise NotImplementedError(
+            f"Task type '{self.task_type}' does not support adaptive testing."
+        )
+
+    def get_scoring_request(self, task: Task) -> Tuple[str, str, Dict[str, str]]:
+        """
+        System prompt, prompt and the continuation of each answer to score.
+        """
+        raise NotImplementedError(
+            f"Task type '{self.task_type}' does not support log-likelihood scoring."
+        )
+
+    def get_scored_response(self, task: Task, scores: Dict[str, float]) -> str:
+        """
+        Response text of the best-scoring answer, parsed like a generated one.
+        """
+        raise NotImplementedError(
+            f"Task type '{self.task_type}' does not support log-likelihood scoring."
+        )
+
+    def get_response_schema(self, task: Task) -> Optional[dict]:
+        """
+        JSON schema of a response to the task, used by models with structured output
+        enabled; None leaves responses unconstrained.
+        """
+        return None
+
+    def get_results_root(self, results_dir: Path) -> Path:
+        """
+        Directory holding all results of this model for this task type.
+        """
+        model_name = self.model.model_name.replace("/", "-")
+        return results_dir / model_name / self.task_type
+
     @abstractmethod
     def get_output_path(self, task: Task, results_dir: Path) -> Path:
         """
@@ -84,5 +153,61 @@ class BaseManager(ABC):
             self._processed_cache[output_path] = set()
         self._processed_cache[output_path].add(str(task.id))
 
+    def get_task_group(self, task: Task) -> Hashable:
+        """
+        Key used to spread a partial run evenly across task groups.
+        """
+        return None
+
+    def get_pack_key(self, task: Task) -> Hashable:
+        """
+        Tasks with the same pack key share a system prompt and may be packed together.
+        """
+        return self.get_system_prompt(task)
+
+    def get_packed_system_prompt(self, tasks: List[Task]) -> str:
+        raise NotImplementedError(
+            f"Task type '{self.task_type}' does not support packing several tasks per request."
+        )
+
+    def get_packed_prompt(self, tasks: List[Task]) -> str:
+        raise NotImplementedError(
+            f"Task type '{self.task_type}' does not support packing several tasks per request."
+        )
+
+    def split_packed_response(
+        self, tasks: List[Task], model_response: str
+    ) -> Dict[str, str]:
+        """
+        Map task ids to their individual responses; ids that could not be parsed are omitted.
+        """
+        raise NotImplementedError(
+            f"Task type '{self.task_type}' does not support packing several tasks per request."
+        )
+
+    def estimate_task_cost(self, task: Task) -> int:
+        """
+        Relative cost of a task used for scheduling (prompt length in characters).
+        """
+        return len(self.get_prompt(task))
+
+    def save_coverage(self, results_dir: Path) -> None:
+        """
+        Write a coverage sidecar next to every output file of the loaded tasks.
+        """
+        totals: Counter = Counter()
+        completed: Counter = Counter()
+        for task in self.tasks:
+            output_path = self.get_output_path(task, results_dir)
+            totals[output_path] += 1
+            if self.is_task_processed(task, results_dir):
+                completed[output_path] += 1
+
+        for output_path, total in totals.items():
+            save_coverage(output_path, total, completed[output_path])
+
+    def get_prompt(self, task: Task) -> str:
+        return task.get_prompt()
+
     def get_system_prompt(self, task: Task) -> str:
         return ""
@@ -1,12 +1,21 @@
 import json
+from collections import Counter
 from pathlib import Path
-from typing import Optional
-from dataclasses import asdict
+from typing import Dict, List, Optional, Tuple
 
 from src.benchmark_framework.models.base_model import BaseModel
 from src.common.domain.exam import ExamQuestion, ExamResult
 from src.benchmark_framework.managers.base_manager import BaseManager
-from src.benchmark_framework.utils.response_parser import extract_json_field
+from src.benchmark_framework.metrics.exact_match import ExactMatchMetric
+from src.benchmark_framework.utils.irt import get_item_key
+from src.benchmark_framework.utils.response_parser import (
+    extract_json_field,
+    extract_json_objects,
+)
+from src.benchmark_framework.utils.response_schema import (
+    build_response_schema,
+    string_field,
+)
 
 EXACT_DATE_DICT: dict[int, str] = {
     2025: "17 marca 2025",
@@ -21,20 +30,106 @@ EXACT_DATE_DICT: dict[int, str] = {
     2016: "9 marca 2016",
 }
 
+# Answer-only tracks scoring the choice letter or the full option text
+SCORING_MODES = ("letter", "text")
+# Adaptive testing asks questions near the model's ability, so its answers are a
+# separate track rather than a partial run
+ADAPTIVE_TRACK_SUFFIX = "-adaptive"
+SCORING_SYSTEM_PROMPT = (
+    "Jesteś ekspertem w polskim prawie. Odpowiedz na pytanie testowe z zakresu "
+    "prawa polskiego, podając wyłącznie poprawną odpowiedź."
+)
+
 
 class ExamManager(BaseManager):
     """
     Manager for handling legal exam benchmark evaluations.
     """
 
-    def __init__(self, model: BaseModel, tasks_path: Path, year: Optional[int] = None):
+    supports_packing = True
+    supports_sampling = True
+    supports_adaptive = True
+    supports_scoring = True
+
+    def __init__(
+        self,
+        model: BaseModel,
+        tasks_path: Path,
+        year: Optional[int] = None,
+        scoring: Optional[str] = None,
+        adaptive: bool = False,
+    ):
         super().__init__(model, "exams", tasks_path, year)
+        if scoring is not None and scoring not in SCORING_MODES:
+            raise ValueError(
+                f"Scoring mode must be one of: {', '.join(SCORING_MODES)}."
+            )
+        if scoring is not None and adaptive:
+            raise ValueError("Scoring cannot be combined with adaptive testing.")
+        self.scoring = scoring
+        self.adaptive = adaptive
+
+    def get_results_root(self, results_dir: Path) -> Path:
+        results_root = super().get_results_root(results_dir)
+        if self.scoring is not None:
+            suffix = f"-loglik-{self.scoring}"
+        elif self.adaptive:
+            suffix = ADAPTIVE_TRACK_SUFFIX
+        else:
+            return results_root
+        # Scored and adaptive answers are separate tracks, stored like another model
+        model_dir = results_root.parent
+        return model_dir.with_name(model_dir.name + suffix) / results_root.name
 
     def get_output_path(self, task: ExamQuestion, results_dir: Path) -> Path:
         year_str = str(task.year)
         filename = f"{task.exam_type}.jsonl"
-        model_name = self.model.model_name.replace("/", "-")
-        return results_dir / model_name / self.task_type / year_str / filename
+        return self.get_results_root(results_dir) / year_str / filename
+
+    def get_task_group(self, task: ExamQuestion) -> tuple:
+        return task.year, task.exam_type
+
+    def get_pack_key(self, task: ExamQuestion) -> tuple:
+        # The system prompt only depends on the year; question ids are unique per exam
+        return task.year, task.exam_type
+
+    def get_packed_system_prompt(self, tasks: List[ExamQuestion]) -> str:
+        return (
+            self.get_system_prompt(tasks[0])
+            + """
+
+**TRYB WIELU PYTAŃ**
+W tym zadaniu otrzymasz kilka pytań naraz. Każde pytanie jest poprzedzone identyfikatorem w formacie [ID: <id>]. Odpowiedz na każde pytanie niezależnie, zgodnie z powyższymi zasadami, i zwróć WYŁĄCZNIE tablicę JSON zawierającą po jednym obiekcie na każde pytanie. Każdy obiekt musi zawierać dodatkowe pole "id" z identyfikatorem pytania, np.:
+[
+{"id": "1", "answer": "C", "legal_basis": "art. 4 § 4 k.k.", "legal_basis_content": "..."},
+{"id": "2", "answer": "A", "legal_basis": "art. 415 k.c.", "legal_basis_content": "..."}
+]"""
+        )
+
+    def get_packed_prompt(self, tasks: List[ExamQuestion]) -> str:
+        return "\n".join(f"[ID: {task.id}]\n{task.get_prompt()}" for task in tasks)
+
+    def split_packed_response(
+        self, tasks: List[ExamQuestion], model_response: str
+    ) -> Dict[str, str]:
+        task_ids = {str(task.id) for task in tasks}
+        answers = {}
+        for obj in extract_json_objects(model_response):
+            if "id" in obj:
+                answers[str(obj.pop("id"))] = obj
+            else:
+                # Also accept an object keyed by question id
+                answers.update(
+                    (str(key), value)
+                    for key, value in obj.items()
+                    if isinstance(value, dict)
+                )
+
+        return {
+            task_id: json.dumps(answer, ensure_ascii=False)
+            for task_id, answer in answers.items()
+            if task_id in task_ids and "answer" in answer
+        }
 
     def get_result(self, exam: ExamQuestion, model_response: str) -> ExamResult:
         model_answer = extract_json_field(model_response, "answer").upper()
@@ -54,13 +149,75 @@ class ExamManager(BaseManager):
             "legal_basis_content": exam.legal_basis_content,
             "model_name": self.model.model_name,
             "model_response": model_response,
-            "model_config": json.dumps(asdict(self.model.model_config)),
+            "model_config": self.model.model_config.to_json(),
             "model_answer": model_answer,
             "model_legal_basis": model_legal_basis,
             "model_legal_basis_content": model_legal_basis_content,
         }
         return result
 
+    def get_sampled_result(
+        self, exam: ExamQuestion, model_responses: List[str]
+    ) -> ExamResult:
+        answers = [
+            extract_json_field(response, "answer").upper()
+            for response in model_responses
+        ]
+        votes = Counter(answer for answer in answers if answer)
+        if votes:
+            # Ties go to the answer sampled first
+            majority_answer, majority_count = votes.most_common(1)[0]
+        else:
+            majority_answer, majority_count = "", 0
+
+        # Legal basis and citation come from the first sample that agrees with the vote
+        representative = model_responses[answers.index(majority_answer)]
+        result = self.get_result(exam, representative)
+        result["model_answer"] = majority_answer
+        result["sampled_responses"] = model_responses
+        result["sampled_answers"] = answers
+        result["agreement_rate"] = majority_count / len(model_responses)
+        return result
+
+    def get_scoring_request(
+        self, task: ExamQuestion
+    ) -> Tuple[str, str, Dict[str, str]]:
+        if self.scoring == "letter":
+            system_prompt = (
+                f"{SCORING_SYSTEM_PROMPT} Podaj tylko literę poprawnej odpowiedzi."
+            )
+            continuations = {letter: letter for letter in task.choices}
+        else:
+            system_prompt = f"{SCORING_SYSTEM_PROMPT} Przepisz poprawną odpowiedź."
+            continuations = {
+                letter: f"{letter}) {text}" for letter, text in task.choices.items()
+            }
+        return system_prompt, task.get_prompt(), continuations
+
+    def get_scored_response(self, task: ExamQuestion, scores: Dict[str, float]) -> str:
+        return json.dumps({"answer": max(scores, key=scores.get)}, ensure_ascii=False)
+
+    def get_item_key(self, task: ExamQuestion) -> str:
+        return get_item_key(task.year, task.exam_type, task.id)
+
+    def score_result(self, result: ExamResult) -> float:
+        return ExactMatchMetric()(result["model_answer"], result["correct_answer"])
+
+    def get_response_schema(self, task: ExamQuestion) -> dict:
+        return build_response_schema(
+            {
+                "answer": string_field(
+                    "Litera poprawnej odpowiedzi", list(task.choices)
+                ),
+                "legal_basis": string_field(
+                    'Pełne oznaczenie przepisu, np. "art. 415 § 1 k.c."'
+                ),
+                "legal_basis_content": string_field(
+                    "Dosłowna treść cytowanego paragrafu/punktu lub artykułu"
+                ),
+            }
+        )
+
     def get_system_prompt(self, task: ExamQuestion) -> str:
         return f"""**ROLA I ZAKRES**
 Jesteś ekspertem w polskim prawie biorącym udział w egzaminu zawodowym. Twoim zadaniem jest analiza pytań testowych z zakresu prawa polskiego (jedno pytanie naraz) i zwrócenie WYŁĄCZNIE poprawnej odpowiedzi w ściśle określonym formacie JSON wraz z jednoznaczną podstawą prawną i cytatem przepisu. Odpowiadaj WYŁĄCZNIE w języku polskim.
@@ -1,12 +1,19 @@
-import json
+import re
 from pathlib import Path
-from typing import Optional
-from dataclasses import asdict
+from typing import Dict, Optional
 
 from src.benchmark_framework.models.base_model import BaseModel
 from src.common.domain.judgment import Judgment, JudgmentResult
 from src.benchmark_framework.managers.base_manager import BaseManager
 from src.benchmark_framework.utils.response_parser import extract_json_field
+from src.benchmark_framework.utils.response_schema import (
+    build_response_schema,
+    string_field,
+)
+from src.benchmark_framework.utils.windowing import compact_masked_text
+
+# Leading tokens kept in windowed prompts (court, case number and parties)
+DEFAULT_HEADER_TOKENS = 100
 
 
 class JudgmentManager(BaseManager):
@@ -14,12 +21,44 @@ class JudgmentManager(BaseManager):
     Manager for handling legal judgment benchmark evaluations.
     """
 
-    def __init__(self, model: BaseModel, tasks_path: Path, year: Optional[int] = None):
+    def __init__(
+        self,
+        model: BaseModel,
+        tasks_path: Path,
+        year: Optional[int] = None,
+        context_window: Optional[int] = None,
+        header_tokens: int = DEFAULT_HEADER_TOKENS,
+    ):
         super().__init__(model, "judgments", tasks_path, year)
+        # Tokens kept on each side of every mask; None sends the whole justification
+        self.context_window = context_window
+        self.header_tokens = header_tokens
+        self._prompt_cache: Dict[str, str] = {}
 
     def get_output_path(self, task: Judgment, results_dir: Path) -> Path:
-        model_name = self.model.model_name.replace("/", "-")
-        return results_dir / model_name / self.task_type / "all.jsonl"
+        # Windowed runs are kept apart so window sizes can be compared
+        filename = (
+            "all.jsonl"
+            if self.context_window is None
+            else f"all_window{self.context_window}.jsonl"
+        )
+        return self.get_results_root(results_dir) / filename
+
+    def get_prompt(self, task: Judgment) -> str:
+        if self.context_window is None:
+            return task.get_prompt()
+        if str(task.id) not in self._prompt_cache:
+            self._prompt_cache[str(task.id)] = compact_masked_text(
+                task.get_prompt(), self.context_window, self.header_tokens
+            )
+        return self._prompt_cache[str(task.id)]
+
+    def get_task_group(self, task: Judgment) -> str:
+        year_match = re.search(r"\d{4}", str(task.date))
+        return year_match.group(0) if year_match else None
+
+    def estimate_task_cost(self, task: Judgment) -> int:
+        return len(self.get_prompt(task) or "")
 
     def get_result(self, judgment: Judgment, model_response: str) -> JudgmentResult:
         model_legal_basis = extract_json_field(model_response, "legal_basis")
@@ -34,13 +73,27 @@ class JudgmentManager(BaseManager):
             "legal_basis": judgment.legal_basis,
             "legal_basis_content": judgment.legal_basis_content,
             "model_name": self.model.model_name,
-            "model_config": json.dumps(asdict(self.model.model_config)),
+            "model_config": self.model.model_config.to_json(),
             "model_response": model_response,
             "model_legal_basis": model_legal_basis,
             "model_legal_basis_content": model_legal_basis_content,
         }
+        if self.context_window is not None:
+            result["context_window"] = self.context_window
         return result
 
+    def get_response_schema(self, task: Judgment) -> dict:
+        return build_response_schema(
+            {
+                "legal_basis": string_field(
+                    'Oznaczenie zamaskowanego artykułu, np. "art. 415 k.c."'
+                ),
+                "legal_basis_content": string_field(
+                    "Dosłowna treść zamaskowanego artykułu"
+                ),
+            }
+        )
+
     def get_system_prompt(self, task: Judgment) -> str:
         return f"""**ROLA I ZAKRES**
         Jesteś ekspertem w polskim prawie, specjalizującym się w analizie orzecznictwa sądowego. Twoim zadaniem jest analiza zamaskowanego tekstu uzasadnienia orzeczenia i zwrócenie numeru zamaskowanego artykułu oraz jego treści w określonym formacie. Odpowiadaj WYŁĄCZNIE w języku polskim.
@@ -1,9 +1,11 @@
+import json
 import os
 import anthropic
 
 from src.benchmark_framework.configs.runner_config import RunnerConfig
 from src.benchmark_framework.models.base_model import BaseModel
 from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.utils.response_schema import RESPONSE_SCHEMA_NAME
 from src.constants import MAX_NEW_TOKENS
 
 
@@ -15,24 +17,54 @@ class AnthropicModel(BaseModel):
     Requires ANTHROPIC_API_KEY environment variable to be set.
     """
 
+    api_base_url = "https://api.anthropic.com"
+
     def __init__(self, model_name: str, model_config: ModelConfig, **kwargs):
         super().__init__(model_name, model_config, **kwargs)
         api_key = os.getenv("ANTHROPIC_API_KEY")
         if not api_key:
             raise ValueError("ANTHROPIC_API_KEY environment variable must be set")
 
-        self.client = anthropic.Anthropic(api_key=api_key)
+        self.client = anthropic.Anthropic(
+            api_key=api_key,
+            base_url=model_config.base_url,
+            timeout=model_config.request_timeout,
+        )
 
     def generate_response(self, system_prompt: str, prompt: str) -> str:
+        request_kwargs = {}
+        schema = self.get_response_schema()
+        if schema is not None:
+            # Forcing a tool call makes the answer arrive as input matching the schema
+            request_kwargs["tools"] = [
+                {
+                    "name": RESPONSE_SCHEMA_NAME,
+                    "description": "Zwróć odpowiedź w wymaganym formacie.",
+                    "input_schema": schema,
+                }
+            ]
+            request_kwargs["tool_choice"] = {
+                "type": "tool",
+                "name": RESPONSE_SCHEMA_NAME,
+            }
+
         message = self.client.messages.create(
             model=self.model_name,
             system=system_prompt,
-            max_tokens=MAX_NEW_TOKENS,
+            max_tokens=self.get_max_output_tokens() or MAX_NEW_TOKENS,
             messages=[
                 {"role": "user", "content": prompt},
             ],
+            **request_kwargs,
         )
 
+        self.record_usage(message.usage.input_tokens, message.usage.output_tokens)
+        if message.stop_reason == "max_tokens":
+            self.record_call_info(truncated=True)
+
+        for block in message.content:
+            if block.type == "tool_use":
+                return json.dumps(block.input, ensure_ascii=False)
         return message.content[0].text
 
     def get_default_runner_config(self):
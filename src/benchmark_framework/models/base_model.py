@@ -1,7 +1,12 @@
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
 
 from src.benchmark_framework.configs.model_config import ModelConfig
 from src.benchmark_framework.configs.runner_config import RunnerConfig
+from src.benchmark_framework.utils.errors import is_timeout
 
 
 class BaseModel(ABC):
@@ -13,14 +18,131 @@ class BaseModel(ABC):
     model-specific API calls and response formatting.
     """
 
+    # Root URL of the provider's HTTP API (replaced by `ModelConfig.base_url`)
+    api_base_url: Optional[str] = None
+    # Whether generate_batch answers several prompts faster than one by one
+    supports_batching: bool = False
+    # Whether score_continuations can rank answers by log-likelihood
+    supports_scoring: bool = False
+    # Whether calls report usage per underlying model (`tier_usage`), e.g. cascades
+    composite: bool = False
+
     def __init__(self, model_name: str, model_config: ModelConfig, **kwargs):
         super().__init__()
         self.model_name = model_name
         self.model_config = model_config
+        # Per-thread metadata about the last call (token usage etc.), so concurrent
+        # runner workers never read each other's values.
+        self._call_info = threading.local()
+        # Per-thread request options set by the runner (output token cap, schema)
+        self._call_options = threading.local()
 
     def get_default_runner_config(self):
         return RunnerConfig()
 
+    @classmethod
+    def get_api_base_url(cls) -> Optional[str]:
+        """
+        Root URL of the provider's HTTP API, or None for models without one.
+        """
+        return cls.api_base_url
+
+    def record_call_info(self, **info: Any) -> None:
+        """
+        Store metadata about the current call for the calling thread.
+        """
+        if not hasattr(self._call_info, "data"):
+            self._call_info.data = {}
+        self._call_info.data.update(info)
+
+    def record_usage(
+        self, input_tokens: Optional[int], output_tokens: Optional[int]
+    ) -> None:
+        """
+        Store token usage reported by the provider for the current call.
+        """
+        self.record_call_info(
+            model_name=self.model_name,
+            input_tokens=input_tokens or 0,
+            output_tokens=output_tokens or 0,
+        )
+
+    def get_max_output_tokens(self) -> Optional[int]:
+        """
+        Output token cap for the calling thread's requests: the runner's override if
+        one is active, otherwise `ModelConfig.max_output_tokens`. None leaves the
+        adapter's default.
+        """
+        if hasattr(self._call_options, "max_output_tokens"):
+            return self._call_options.max_output_tokens
+        return self.model_config.max_output_tokens
+
+    def get_response_schema(self) -> Optional[dict]:
+        """
+        JSON schema the calling thread's responses must follow, or None. Adapters only
+        see a schema when `ModelConfig.structured_output` is enabled.
+        """
+        if not self.model_config.structured_output:
+            return None
+        return getattr(self._call_options, "response_schema", None)
+
+    @contextmanager
+    def _call_option(self, name: str, value: Any) -> Iterator[None]:
+        """
+        Set a request option for requests made by this thread in the block.
+        """
+        previous = getattr(self._call_options, name, ...)
+        setattr(self._call_options, name, value)
+        try:
+            yield
+        finally:
+            if previous is ...:
+                delattr(self._call_options, name)
+            else:
+                setattr(self._call_options, name, previous)
+
+    @contextmanager
+    def output_cap(self, max_output_tokens: Optional[int]) -> Iterator[None]:
+        """
+        Override the output token cap for requests made by this thread in the block.
+        """
+        with self._call_option("max_output_tokens", max_output_tokens):
+            yield
+
+    @contextmanager
+    def structured_output(self, schema: Optional[dict]) -> Iterator[None]:
+        """
+        Constrain responses to requests made by this thread in the block to `schema`.
+        """
+        with self._call_option("response_schema", schema):
+            yield
+
+    def pop_call_info(self) -> Dict[str, Any]:
+        """
+        Return and clear metadata recorded by the calling thread's last call.
+        """
+        data = getattr(self._call_info, "data", {})
+        self._call_info.data = {}
+        return data
+
+    def score_continuations(
+        self, system_prompt: str, prompt: str, continuations: Sequence[str]
+    ) -> List[float]:
+        """
+        Mean log-probability per token of each continuation of the response to
+        the prompt (models with `supports_scoring`).
+        """
+        raise NotImplementedError(
+            f"Model '{self.model_name}' does not support log-likelihood scoring."
+        )
+
+    def count_tokens(self, system_prompt: str, prompt: str) -> Optional[int]:
+        """
+        Input tokens of a request counted with a local tokenizer, or None if the
+        model has none (token counts are then estimated).
+        """
+        return None
+
     @abstractmethod
     def generate_response(
         self,
@@ -28,3 +150,69 @@ class BaseModel(ABC):
         prompt: str,
     ) -> str:
         pass
+
+    def generate_responses(self, system_prompt: str, prompt: str, n: int) -> List[str]:
+        """
+        Sample `n` responses to the same prompt.
+
+        The default sends `n` requests in parallel and sums their token usage
+        (or joins the per-model usage of composite models); providers that can
+        return several choices in one call override this.
+        """
+
+        # Worker threads do not see this thread's request options
+        max_output_tokens = self.get_max_output_tokens()
+        schema = self.get_response_schema()
+
+        def sample(_) -> tuple:
+            with self.output_cap(max_output_tokens), self.structured_output(schema):
+                response = self.generate_response(system_prompt, prompt)
+            return response, self.pop_call_info()
+
+        with ThreadPoolExecutor(max_workers=n) as executor:
+            samples = list(executor.map(sample, range(n)))
+
+        infos = [info for _, info in samples if "input_tokens" in info]
+        if infos:
+            self.record_usage(
+                sum(info["input_tokens"] for info in infos),
+                sum(info["output_tokens"] for info in infos),
+            )
+        # Composite models report usage per underlying model, priced one by one
+        tier_usage = [
+            usage for _, info in samples for usage in info.get("tier_usage", [])
+        ]
+        if tier_usage:
+            self.record_call_info(tier_usage=tier_usage)
+        if any(info.get("truncated") for _, info in samples):
+            self.record_call_info(truncated=True)
+        return [response for response, _ in samples]
+
+    def generate_batch(
+        self,
+        requests: Sequence[Tuple[str, str]],
+        response_schemas: Optional[Sequence[Optional[dict]]] = None,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Answer several (system prompt, prompt) requests, each with its optional
+        response schema (see `structured_output`). Returns each response with
+        the call info of its request, in the order of `requests`. Call info with
+        `timed_out` marks a response cut off by `ModelConfig.request_timeout`;
+        the runner retries those requests one by one.
+
+        The default answers them one by one, marking requests that time out;
+        models that batch generation (`supports_batching`) override this.
+        """
+        response_schemas = response_schemas or [None] * len(requests)
+        results = []
+        for (system_prompt, prompt), schema in zip(requests, response_schemas):
+            try:
+                with self.structured_output(schema):
+                    response = self.generate_response(system_prompt, prompt)
+            except Exception as e:
+                if not is_timeout(e):
+                    raise
+                response = ""
+                self.record_call_info(timed_out=True)
+            results.append((response, self.pop_call_info()))
+        return results
@@ -0,0 +1,136 @@
+from collections import Counter
+from typing import List, Optional, Tuple
+
+from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.configs.runner_config import RunnerConfig
+from src.benchmark_framework.models.base_model import BaseModel
+from src.benchmark_framework.utils.response_parser import extract_json_field
+
+CASCADE_PREFIX = "cascade/"
+TIER_SEPARATOR = "+"
+# Response fields checked for malformed answers, if the system prompt asks for them
+RESPONSE_FIELDS = ("answer", "legal_basis", "legal_basis_content")
+
+
+def parse_cascade_name(model_name: str) -> Tuple[str, str]:
+    """
+    Split `cascade/<small model>+<large model>` into the two tier model names.
+    """
+    tiers = model_name[len(CASCADE_PREFIX) :].split(TIER_SEPARATOR)
+    if not model_name.startswith(CASCADE_PREFIX) or len(tiers) != 2 or not all(tiers):
+        raise ValueError(
+            f"Cascade model name '{model_name}' must look like "
+            f"'cascade/<small model>{TIER_SEPARATOR}<large model>'."
+        )
+    return tiers[0], tiers[1]
+
+
+class CascadeModel(BaseModel):
+    """
+    Two-tier cascade of registered models.
+
+    The small model answers first; the question is escalated to the large model
+    only when the small model's answer is malformed or, with
+    `ModelConfig.cascade_samples` above 1, when fewer than
+    `ModelConfig.cascade_min_agreement` of its samples agree.
+    The answering tier is recorded as call info and stored with each result.
+    """
+
+    composite = True
+
+    def __init__(
+        self,
+        model_name: str,
+        model_config: ModelConfig,
+        small_model: Optional[BaseModel] = None,
+        large_model: Optional[BaseModel] = None,
+        **kwargs,
+    ):
+        super().__init__(model_name, model_config, **kwargs)
+        small_name, large_name = parse_cascade_name(model_name)
+        if small_model is None or large_model is None:
+            # Imported here because the model factory registers this class
+            from src.benchmark_framework.getters.get_llm_model import get_llm_model
+
+            small_model = small_model or get_llm_model(small_name, model_config)
+            large_model = large_model or get_llm_model(large_name, model_config)
+        self.small_model = small_model
+        self.large_model = large_model
+
+    def generate_response(self, system_prompt: str, prompt: str) -> str:
+        fields = [field for field in RESPONSE_FIELDS if f'"{field}"' in system_prompt]
+        samples = self.model_config.cascade_samples
+        max_output_tokens = self.get_max_output_tokens()
+        schema = self.get_response_schema()
+
+        with self.small_model.output_cap(
+            max_output_tokens
+        ), self.small_model.structured_output(schema):
+            if samples > 1:
+                responses = self.small_model.generate_responses(
+                    system_prompt, prompt, samples
+                )
+            else:
+                responses = [self.small_model.generate_response(system_prompt, prompt)]
+        tier_usage = [self.small_model.pop_call_info()]
+
+        response, agreement = self._majority_response(responses, fields)
+        escalation_reason = None
+        if self._is_malformed(response, fields):
+            escalation_reason = "malformed"
+        elif agreement < self.model_config.cascade_min_agreement:
+            escalation_reason = "low_agreement"
+
+        if escalation_reason is not None:
+            with self.large_model.output_cap(
+                max_output_tokens
+            ), self.large_model.structured_output(schema):
+                response = self.large_model.generate_response(system_prompt, prompt)
+            tier_usage.append(self.large_model.pop_call_info())
+        if tier_usage[-1].get("truncated"):
+            self.record_call_info(truncated=True)
+
+        self.record_call_info(
+            tier_usage=[usage for usage in tier_usage if "input_tokens" in usage],
+            cascade_tier="small" if escalation_reason is None else "large",
+            cascade_escalation_reason=escalation_reason,
+            cascade_agreement=agreement,
+        )
+        return response
+
+    @staticmethod
+    def _is_malformed(response: str, fields: List[str]) -> bool:
+        return any(not extract_json_field(response, field) for field in fields)
+
+    @staticmethod
+    def _majority_response(
+        responses: List[str], fields: List[str]
+    ) -> Tuple[str, float]:
+        """
+        Return the first response carrying the most common value of the first
+        expected field, and the share of responses that agree with it.
+        """
+        if len(responses) == 1 or not fields:
+            return responses[0], 1.0
+
+        values = [
+            extract_json_field(response, fields[0]).upper() for response in responses
+        ]
+        votes = Counter(value for value in values if value)
+        if not votes:
+            return responses[0], 0.0
+        majority_value, majority_count = votes.most_common(1)[0]
+        return responses[values.index(majority_value)], majority_count / len(responses)
+
+    def get_default_runner_config(self) -> RunnerConfig:
+        # Respect the stricter rate limit of the two tiers
+        configs = [
+            self.small_model.get_default_runner_config(),
+            self.large_model.get_default_runner_config(),
+        ]
+        limits = [
+            config.requests_per_minute
+            for config in configs
+            if config.requests_per_minute is not None
+        ]
+        return RunnerConfig(requests_per_minute=min(limits) if limits else None)
@@ -14,10 +14,20 @@ class GeminiModel(BaseModel):
     Requires GEMINI_API_KEY environment variable to be set.
     """
 
+    api_base_url = "https://generativelanguage.googleapis.com"
+
     def __init__(self, model_name: str, model_config: ModelConfig, **kwargs):
         # uses GEMINI_API_KEY env var
         super().__init__(model_name, model_config, **kwargs)
-        self.client = genai.Client()
+        timeout = None
+        if model_config.request_timeout is not None:
+            # google-genai expects the timeout in milliseconds
+            timeout = int(model_config.request_timeout * 1000)
+        self.client = genai.Client(
+            http_options=types.HttpOptions(
+                timeout=timeout, base_url=model_config.base_url
+            )
+        )
 
     def generate_response(self, system_prompt: str, prompt: str):
         resp = self.client.models.generate_content(
@@ -25,16 +35,36 @@ class GeminiModel(BaseModel):
             config=self.create_generate_config(system_prompt),
             contents=prompt,
         )
+        if resp.usage_metadata is not None:
+            self.record_usage(
+                resp.usage_metadata.prompt_token_count,
+                resp.usage_metadata.candidates_token_count,
+            )
+        if (
+            resp.candidates
+            and resp.candidates[0].finish_reason == types.FinishReason.MAX_TOKENS
+        ):
+            self.record_call_info(truncated=True)
         return resp.text
 
     def create_generate_config(self, system_prompt: str):
+        max_output_tokens = self.get_max_output_tokens()
         if self.model_config.google_search:
+            # Gemini does not combine tools with JSON responses, so no schema here
             grounding_tool = types.Tool(google_search=types.GoogleSearch())
             config = types.GenerateContentConfig(
-                system_instruction=system_prompt, tools=[grounding_tool]
+                system_instruction=system_prompt,
+                tools=[grounding_tool],
+                max_output_tokens=max_output_tokens,
             )
         else:
-            config = types.GenerateContentConfig(system_instruction=system_prompt)
+            schema = self.get_response_schema()
+            config = types.GenerateContentConfig(
+                system_instruction=system_prompt,
+                max_output_tokens=max_output_tokens,
+                response_mime_type="application/json" if schema else None,
+                response_json_schema=schema,
+            )
         return config
 
     def get_default_runner_config(self):
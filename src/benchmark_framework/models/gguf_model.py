@@ -0,0 +1,132 @@
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.models.base_model import BaseModel
+from src.constants import MAX_NEW_TOKENS
+
+GGUF_PREFIX = "gguf"
+# Bytes of prompt states kept for reuse (enough for a few long system prompts)
+PROMPT_CACHE_BYTES = 2 << 30
+
+
+class GGUFModel(BaseModel):
+    """
+    Local GGUF model run on CPU with llama.cpp (`llama-cpp-python`).
+
+    Registered as `gguf/<path to .gguf file>`. The file is memory-mapped, and
+    `ModelConfig.threads` and `ModelConfig.context_size` set the llama.cpp thread
+    count and context window (by default all cores and the model's trained
+    context). With `ModelConfig.prefix_cache`, evaluated prompt states are kept
+    in RAM so that requests sharing a system prompt only evaluate the new tokens.
+    Each result records the generation speed in `tokens_per_second`, and a
+    response stopped by `ModelConfig.request_timeout` raises `TimeoutError`.
+    """
+
+    supports_batching = True
+
+    def __init__(self, model_name: str, model_config: ModelConfig, **kwargs):
+        super().__init__(model_name, model_config, **kwargs)
+
+        # only import when GGUFModel is actually used
+        from llama_cpp import Llama, LlamaRAMCache
+
+        self.llm = Llama(
+            model_path=self.get_model_path(model_name),
+            n_ctx=model_config.context_size or 0,
+            n_threads=model_config.threads,
+            n_threads_batch=model_config.threads,
+            use_mmap=True,
+            verbose=False,
+        )
+        if model_config.prefix_cache:
+            self.llm.set_cache(LlamaRAMCache(capacity_bytes=PROMPT_CACHE_BYTES))
+        # A llama.cpp context evaluates one sequence at a time
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def get_model_path(model_name: str) -> str:
+        """
+        Path of the GGUF file of a `gguf/<path>` model name.
+        """
+        if model_name.startswith(f"{GGUF_PREFIX}/"):
+            return model_name[len(GGUF_PREFIX) + 1 :]
+        return model_name
+
+    def count_tokens(self, system_prompt: str, prompt: str) -> int:
+        return len(
+            self.llm.tokenize(f"{system_prompt.strip()}\n{prompt.strip()}".encode())
+        )
+
+    def generate_response(self, system_prompt: str, prompt: str) -> str:
+        kwargs: Dict[str, Any] = {}
+        response_schema = self.get_response_schema()
+        if response_schema is not None:
+            kwargs["response_format"] = {
+                "type": "json_object",
+                "schema": response_schema,
+            }
+        request_timeout = self.model_config.request_timeout
+        timed_out = False
+
+        with self._lock:
+            # Waiting for the context counts neither against the time limit nor
+            # as generation time
+            start = time.monotonic()
+            if request_timeout is not None:
+                from llama_cpp import StoppingCriteriaList
+
+                deadline = start + request_timeout
+
+                def past_deadline(input_ids, logits) -> bool:
+                    nonlocal timed_out
+                    timed_out = time.monotonic() > deadline
+                    return timed_out
+
+                # Local generation cannot be cancelled, stop it at the time limit instead
+                kwargs["stopping_criteria"] = StoppingCriteriaList([past_deadline])
+            completion = self.llm.create_chat_completion(
+                messages=[
+                    {"role": "system", "content": system_prompt.strip()},
+                    {"role": "user", "content": prompt.strip()},
+                ],
+                max_tokens=self.get_max_output_tokens() or MAX_NEW_TOKENS,
+                temperature=0.0,
+                **kwargs,
+            )
+            elapsed = time.monotonic() - start
+
+        usage = completion["usage"]
+        self.record_usage(usage["prompt_tokens"], usage["completion_tokens"])
+        self.record_call_info(
+            tokens_per_second=usage["completion_tokens"] / elapsed if elapsed else 0.0
+        )
+        if timed_out:
+            # llama.cpp reports a stopping criterion as a regular "stop"
+            raise TimeoutError(
+                f"Local generation stopped at the {request_timeout:g}s time limit "
+                f"after {usage['completion_tokens']} tokens."
+            )
+        choice = completion["choices"][0]
+        if choice["finish_reason"] == "length":
+            self.record_call_info(truncated=True)
+        return choice["message"]["content"] or ""
+
+    def generate_batch(
+        self,
+        requests: Sequence[Tuple[str, str]],
+        response_schemas: Optional[Sequence[Optional[dict]]] = None,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        llama.cpp evaluates one sequence per context, so requests are generated
+        one after another, grouped by system prompt so that each group evaluates
+        its shared prefix once.
+        """
+        order = sorted(range(len(requests)), key=lambda i: requests[i][0])
+        results = super().generate_batch(
+            [requests[i] for i in order],
+            [response_schemas[i] for i in order] if response_schemas else None,
+        )
+        # Back to the order of `requests`
+        return [result for _, result in sorted(zip(order, results))]
@@ -1,4 +1,6 @@
 import os
+from typing import Optional
+
 import requests
 
 from transformers import AutoTokenizer
@@ -22,7 +24,7 @@ class HFEndpointModel(BaseModel):
         super().__init__(model_name, model_config, **kwargs)
 
         self.api_key = os.getenv("HF_TOKEN")
-        self.endpoint_url = os.getenv("HF_ENDPOINT_URL")
+        self.endpoint_url = model_config.base_url or self.get_api_base_url()
         self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
 
         if not self.api_key:
@@ -30,15 +32,27 @@ class HFEndpointModel(BaseModel):
         if not self.endpoint_url:
             raise ValueError("HF_ENDPOINT_URL environment variable must be set")
 
-    def generate_response(self, system_prompt: str, prompt: str) -> str:
+    @classmethod
+    def get_api_base_url(cls) -> Optional[str]:
+        return os.getenv("HF_ENDPOINT_URL")
+
+    def _get_full_input(self, system_prompt: str, prompt: str) -> str:
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": prompt},
         ]
-        full_input = self.tokenizer.apply_chat_template(
+        return self.tokenizer.apply_chat_template(
             messages, tokenize=False, add_generation_prompt=True
         )
 
+    def count_tokens(self, system_prompt: str, prompt: str) -> int:
+        full_input = self._get_full_input(system_prompt, prompt)
+        return len(self.tokenizer.encode(full_input, add_special_tokens=False))
+
+    def generate_response(self, system_prompt: str, prompt: str) -> str:
+        full_input = self._get_full_input(system_prompt, prompt)
+        max_new_tokens = self.get_max_output_tokens() or MAX_NEW_TOKENS
+
         headers = {
             "Accept": "application/json",
             "Authorization": f"Bearer {self.api_key}",
@@ -48,12 +62,17 @@ class HFEndpointModel(BaseModel):
         payload = {
             "inputs": full_input,
             "parameters": {
-                "max_new_tokens": MAX_NEW_TOKENS,
+                "max_new_tokens": max_new_tokens,
                 "return_full_text": False,
             },
         }
 
-        response = requests.post(self.endpoint_url, headers=headers, json=payload)
+        response = requests.post(
+            self.endpoint_url,
+            headers=headers,
+            json=payload,
+            timeout=self.model_config.request_timeout,
+        )
         response.raise_for_status()
         output = response.json()
 
@@ -62,11 +81,23 @@ class HFEndpointModel(BaseModel):
             and len(output) > 0
             and "generated_text" in output[0]
         ):
-            return output[0]["generated_text"]
+            generated_text = output[0]["generated_text"]
         elif isinstance(output, dict) and "generated_text" in output:
-            return output["generated_text"]
+            generated_text = output["generated_text"]
         else:
             return str(output)
 
+        # Inference Endpoints do not report usage, count with the local tokenizer
+        output_tokens = len(
+            self.tokenizer.encode(generated_text, add_special_tokens=False)
+        )
+        self.record_usage(
+            len(self.tokenizer.encode(full_input, add_special_tokens=False)),
+            output_tokens,
+        )
+        if output_tokens >= max_new_tokens:
+            self.record_call_info(truncated=True)
+        return generated_text
+
     def get_default_runner_config(self):
         return RunnerConfig()
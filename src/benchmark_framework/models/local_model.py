@@ -1,53 +1,437 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
 from src.benchmark_framework.models.base_model import BaseModel
 from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.utils.constrained_decoding import (
+    SchemaConstraint,
+    SchemaLogitsProcessor,
+    TokenIndex,
+    get_token_texts,
+)
+from src.benchmark_framework.utils.model_cache import (
+    get_cache_path,
+    resolve_revision,
+    save_atomically,
+)
 from src.constants import MAX_NEW_TOKENS
 
+LOCAL_PREFIX = "local"
+# bitsandbytes 4/8-bit (CUDA only) and PyTorch dynamic int8 of linear layers (CPU)
+QUANTIZATION_MODES = ("4bit", "8bit", "int8")
+# Distinct system prompts whose key/value cache is kept (one per exam year or task type)
+PREFIX_CACHE_SIZE = 8
+
 
 class LocalModel(BaseModel):
     """
     Local model utilizing the pipeline interface for text-generation task implementation from Hugging Face.
+
+    Registered as `local/<Hugging Face repo>`. `ModelConfig.quantize` selects
+    bitsandbytes `4bit`/`8bit` on CUDA, or `int8`: float32 weights on CPU with
+    linear layers quantized dynamically to int8 (activations are quantized per
+    batch at inference time).
+
+    With `ModelConfig.batch_size` above 1 the runner hands it chunks of tasks
+    (`generate_batch`), which are sorted by input length and generated in
+    left-padded batches so that prompts of similar length share a batch.
+
+    With `ModelConfig.prefix_cache`, single requests reuse the key/value cache of
+    their system prompt, computed once per distinct prompt, so only the question
+    tokens are prefilled.
+
+    With `ModelConfig.structured_output`, decoding is constrained to the task's
+    response schema: JSON keys and punctuation are forced, enum fields (the
+    answer letter) accept only their values and generation ends at the closing
+    brace.
+
+    With `ModelConfig.weights_cache_dir`, the first load saves the prepared
+    weights (converted dtype, bitsandbytes-quantized weights) and tokenizer with
+    its chat template as safetensors, keyed by model, resolved revision and
+    quantization; later loads memory-map them instead of downloading and
+    converting the checkpoint.
+
+    `score_continuations` ranks answers by log-likelihood with a single forward
+    pass over all of them instead of generating.
+
+    Generation cannot be cancelled, so `ModelConfig.request_timeout` stops it
+    through `max_time`. A response cut off by the time limit raises
+    `TimeoutError` (single requests) or is marked `timed_out` (batches) instead
+    of passing as complete.
     """
 
+    model_prefix = LOCAL_PREFIX
+    supports_batching = True
+    supports_scoring = True
+    # Whether the loaded model accepts a transformers `past_key_values` cache
+    supports_prefix_cache = True
+
     def __init__(
         self, model_name: str, model_config: ModelConfig, quantize: str = None, **kwargs
     ):
         super().__init__(model_name, model_config, **kwargs)
 
+        self.pipe = self._load_pipeline(
+            self.get_model_path(model_name), quantize or model_config.quantize
+        )
+        # Decoder-only models generate after the prompt, so batches pad on the left
+        tokenizer = self.pipe.tokenizer
+        tokenizer.padding_side = "left"
+        if tokenizer.pad_token_id is None:
+            tokenizer.pad_token_id = tokenizer.eos_token_id
+
+        # system prompt -> (prefix token ids, key/value cache of the prefix)
+        self._prefix_caches: "OrderedDict[str, Tuple[List[int], Any]]" = OrderedDict()
+        self._prefix_lock = threading.Lock()
+        # Token texts for constrained decoding, built on first use
+        self._token_index: Optional[TokenIndex] = None
+        self._token_index_lock = threading.Lock()
+
+    def _load_pipeline(self, model_path: str, quantize: Optional[str]) -> Any:
+        """
+        Text-generation pipeline of the model, quantized as requested.
+        """
         # only import when LocalModel is actually used
         import torch
         from transformers import pipeline, BitsAndBytesConfig
 
-        quantization_config = None
+        if quantize is not None and quantize not in QUANTIZATION_MODES:
+            raise ValueError(
+                f"Quantization must be one of: {', '.join(QUANTIZATION_MODES)}."
+            )
+
+        pipeline_kwargs = {"device_map": "auto", "torch_dtype": torch.bfloat16}
         if quantize == "4bit":
-            quantization_config = BitsAndBytesConfig(
+            pipeline_kwargs["quantization_config"] = BitsAndBytesConfig(
                 load_in_4bit=True, bnb_4bit_compute_dtype=torch.bfloat16
             )
         elif quantize == "8bit":
-            quantization_config = BitsAndBytesConfig(load_in_8bit=True)
+            pipeline_kwargs["quantization_config"] = BitsAndBytesConfig(
+                load_in_8bit=True
+            )
+        elif quantize == "int8":
+            # Dynamic quantization kernels run on CPU and expect float32 weights
+            pipeline_kwargs = {"device": "cpu", "torch_dtype": torch.float32}
+
+        cache_path = self._get_weights_cache_path(model_path, quantize)
+        if cache_path is not None and cache_path.exists():
+            # Safetensors of the cache are memory-mapped, not read and converted
+            pipe = pipeline(task="text-generation", model=cache_path, **pipeline_kwargs)
+        else:
+            pipe = pipeline(
+                task="text-generation",
+                model=model_path,
+                revision=self.model_config.revision,
+                **pipeline_kwargs,
+            )
+            if cache_path is not None:
+                print(f"Caching prepared weights of '{model_path}' in {cache_path}")
+
+                def save(staging_path: Path) -> None:
+                    pipe.model.save_pretrained(staging_path, safe_serialization=True)
+                    pipe.tokenizer.save_pretrained(staging_path)
 
-        self.pipe = pipeline(
-            task="text-generation",
-            model=model_name,
-            device_map="auto",
-            torch_dtype=torch.bfloat16,
-            quantization_config=quantization_config,
+                save_atomically(cache_path, save)
+        if quantize == "int8":
+            # Dynamically quantized modules cannot be serialized, so the cache
+            # holds their float32 weights and quantization is redone on load
+            torch.ao.quantization.quantize_dynamic(
+                pipe.model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True
+            )
+        return pipe
+
+    def _get_weights_cache_path(
+        self, model_path: str, quantize: Optional[str]
+    ) -> Optional[Path]:
+        """
+        Directory of the prepared weights and tokenizer of the model in
+        `ModelConfig.weights_cache_dir`, keyed by model, resolved revision and
+        quantization; None when the cache is disabled.
+        """
+        cache_dir = self.model_config.weights_cache_dir
+        if cache_dir is None:
+            return None
+        key = quantize or "bf16"
+        revision = resolve_revision(
+            model_path, self.model_config.revision, cache_dir, (key,)
         )
+        return get_cache_path(cache_dir, model_path, revision, key)
 
-    def generate_response(self, system_prompt: str, prompt: str) -> str:
-        messages = [
+    @classmethod
+    def get_model_path(cls, model_name: str) -> str:
+        """
+        Hugging Face repo (or local directory) of a `<prefix>/<repo>` model name.
+        """
+        if model_name.startswith(f"{cls.model_prefix}/"):
+            return model_name[len(cls.model_prefix) + 1 :]
+        return model_name
+
+    @staticmethod
+    def _get_messages(system_prompt: str, prompt: str) -> List[Dict[str, str]]:
+        return [
             {"role": "system", "content": system_prompt.strip()},
             {"role": "user", "content": prompt.strip()},
         ]
-        outputs = self.pipe(
-            messages,
-            max_new_tokens=MAX_NEW_TOKENS,
-            do_sample=False,
-            return_full_text=False,
+
+    def count_tokens(self, system_prompt: str, prompt: str) -> int:
+        return len(
+            self.pipe.tokenizer.apply_chat_template(
+                self._get_messages(system_prompt, prompt),
+                tokenize=True,
+                add_generation_prompt=True,
+            )
+        )
+
+    def _get_generation_constraints(
+        self, response_schemas: Sequence[Optional[dict]]
+    ) -> Dict[str, Any]:
+        """
+        `generate` arguments constraining each sequence of a batch to its response
+        schema (none when no sequence has one).
+        """
+        if not any(response_schemas):
+            return {}
+        from transformers import LogitsProcessorList
+
+        with self._token_index_lock:
+            if self._token_index is None:
+                tokenizer = self.pipe.tokenizer
+                self._token_index = TokenIndex(
+                    get_token_texts(tokenizer), tokenizer.eos_token_id
+                )
+        constraints = [
+            SchemaConstraint(schema, self._token_index) if schema else None
+            for schema in response_schemas
+        ]
+        return {
+            "logits_processor": LogitsProcessorList(
+                [SchemaLogitsProcessor(constraints)]
+            )
+        }
+
+    def _get_prefix_cache(self, system_prompt: str) -> Tuple[List[int], Any]:
+        """
+        Token ids of the chat-formatted system prompt and their key/value cache,
+        computed on first use.
+        """
+        import torch
+
+        with self._prefix_lock:
+            if system_prompt in self._prefix_caches:
+                self._prefix_caches.move_to_end(system_prompt)
+                return self._prefix_caches[system_prompt]
+
+            prefix_ids = self.pipe.tokenizer.apply_chat_template(
+                [{"role": "system", "content": system_prompt.strip()}],
+                tokenize=True,
+                add_generation_prompt=False,
+            )
+            model = self.pipe.model
+            with torch.no_grad():
+                cache = model(
+                    torch.tensor([prefix_ids], device=model.device), use_cache=True
+                ).past_key_values
+            self._prefix_caches[system_prompt] = (prefix_ids, cache)
+            if len(self._prefix_caches) > PREFIX_CACHE_SIZE:
+                self._prefix_caches.popitem(last=False)
+            return prefix_ids, cache
+
+    def _generate_with_prefix_cache(
+        self,
+        system_prompt: str,
+        prompt: str,
+        max_new_tokens: int,
+        generate_kwargs: Dict[str, Any],
+    ) -> Optional[str]:
+        """
+        Generate continuing from the cached system prompt. Returns None when the
+        chat template does not render the system prompt as a prefix of the
+        conversation (e.g. templates merging it into the user turn).
+        """
+        import torch
+
+        tokenizer = self.pipe.tokenizer
+        input_ids = tokenizer.apply_chat_template(
+            self._get_messages(system_prompt, prompt),
+            tokenize=True,
+            add_generation_prompt=True,
         )
+        prefix_ids, cache = self._get_prefix_cache(system_prompt)
+        if (
+            len(prefix_ids) >= len(input_ids)
+            or input_ids[: len(prefix_ids)] != prefix_ids
+        ):
+            return None
 
-        response = outputs[0].get("generated_text")
+        model = self.pipe.model
+        inputs = torch.tensor([input_ids], device=model.device)
+        with torch.no_grad():
+            output_ids = model.generate(
+                inputs,
+                attention_mask=torch.ones_like(inputs),
+                # Generation extends the cache, so each request gets its own copy
+                past_key_values=copy.deepcopy(cache),
+                max_new_tokens=max_new_tokens,
+                do_sample=False,
+                pad_token_id=tokenizer.pad_token_id,
+                max_time=self.model_config.request_timeout,
+                **generate_kwargs,
+            )
+        self.record_call_info(cached_input_tokens=len(prefix_ids))
+        return tokenizer.decode(
+            output_ids[0, len(input_ids) :], skip_special_tokens=True
+        )
+
+    def _is_timed_out(
+        self, start: float, output_tokens: int, max_new_tokens: int
+    ) -> bool:
+        """
+        Whether generation started at `start` was stopped by the time limit
+        (`max_time`) rather than by the end of the response or `max_new_tokens`.
+        """
+        request_timeout = self.model_config.request_timeout
+        return (
+            request_timeout is not None
+            and output_tokens < max_new_tokens
+            and time.monotonic() - start >= request_timeout
+        )
+
+    def generate_response(self, system_prompt: str, prompt: str) -> str:
+        max_new_tokens = self.get_max_output_tokens() or MAX_NEW_TOKENS
+        generate_kwargs = self._get_generation_constraints([self.get_response_schema()])
+        response = None
+        start = time.monotonic()
+        if self.model_config.prefix_cache and self.supports_prefix_cache:
+            response = self._generate_with_prefix_cache(
+                system_prompt, prompt, max_new_tokens, generate_kwargs
+            )
         if response is None:
-            return ""
+            start = time.monotonic()
+            outputs = self.pipe(
+                self._get_messages(system_prompt, prompt),
+                max_new_tokens=max_new_tokens,
+                do_sample=False,
+                return_full_text=False,
+                # Local generation cannot be cancelled, stop it at the time limit instead
+                max_time=self.model_config.request_timeout,
+                **generate_kwargs,
+            )
+            response = outputs[0].get("generated_text")
+            if response is None:
+                return ""
 
         assert isinstance(response, str), "generated_text should be of type str"
+        output_tokens = len(
+            self.pipe.tokenizer.encode(response, add_special_tokens=False)
+        )
+        self.record_usage(self.count_tokens(system_prompt, prompt), output_tokens)
+        if output_tokens >= max_new_tokens:
+            self.record_call_info(truncated=True)
+        if self._is_timed_out(start, output_tokens, max_new_tokens):
+            raise TimeoutError(
+                f"Local generation stopped at the {self.model_config.request_timeout:g}s "
+                f"time limit after {output_tokens} tokens."
+            )
         return response
+
+    def generate_batch(
+        self,
+        requests: Sequence[Tuple[str, str]],
+        response_schemas: Optional[Sequence[Optional[dict]]] = None,
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        if not self.model_config.structured_output:
+            response_schemas = None
+        response_schemas = response_schemas or [None] * len(requests)
+        batch_size = self.model_config.batch_size or 1
+        max_new_tokens = self.get_max_output_tokens() or MAX_NEW_TOKENS
+        tokenizer = self.pipe.tokenizer
+        input_tokens = [self.count_tokens(*request) for request in requests]
+
+        # Length-sorted buckets keep padding within a batch small
+        order = sorted(range(len(requests)), key=lambda i: input_tokens[i])
+        results: List[Tuple[str, Dict[str, Any]]] = [None] * len(requests)
+        for start in range(0, len(order), batch_size):
+            bucket = order[start : start + batch_size]
+            bucket_start = time.monotonic()
+            outputs = self.pipe(
+                [self._get_messages(*requests[i]) for i in bucket],
+                batch_size=len(bucket),
+                max_new_tokens=max_new_tokens,
+                do_sample=False,
+                return_full_text=False,
+                max_time=self.model_config.request_timeout,
+                **self._get_generation_constraints(
+                    [response_schemas[i] for i in bucket]
+                ),
+            )
+            for i, output in zip(bucket, outputs):
+                response = output[0].get("generated_text") or ""
+                output_tokens = len(
+                    tokenizer.encode(response, add_special_tokens=False)
+                )
+                info = {
+                    "model_name": self.model_name,
+                    "input_tokens": input_tokens[i],
+                    "output_tokens": output_tokens,
+                    "batch_size": len(bucket),
+                }
+                if output_tokens >= max_new_tokens:
+                    info["truncated"] = True
+                if self._is_timed_out(bucket_start, output_tokens, max_new_tokens):
+                    # Unfinished sequences of the batch were cut off together
+                    info["timed_out"] = True
+                results[i] = (response, info)
+        return results
+
+    def score_continuations(
+        self, system_prompt: str, prompt: str, continuations: Sequence[str]
+    ) -> List[float]:
+        import torch
+
+        tokenizer = self.pipe.tokenizer
+        model = self.pipe.model
+        context_ids = tokenizer.apply_chat_template(
+            self._get_messages(system_prompt, prompt),
+            tokenize=True,
+            add_generation_prompt=True,
+        )
+        continuation_ids = [
+            tokenizer.encode(continuation, add_special_tokens=False)
+            for continuation in continuations
+        ]
+        rows = [context_ids + ids for ids in continuation_ids]
+        length = max(map(len, rows))
+        # Left padding aligns the continuations at the end, so only the logits
+        # of the last positions are computed
+        input_ids = torch.tensor(
+            [[tokenizer.pad_token_id] * (length - len(row)) + row for row in rows],
+            device=model.device,
+        )
+        attention_mask = torch.tensor(
+            [[0] * (length - len(row)) + [1] * len(row) for row in rows],
+            device=model.device,
+        )
+        position_ids = (attention_mask.cumsum(-1) - 1).clamp(min=0)
+        keep = max(map(len, continuation_ids)) + 1
+        with torch.no_grad():
+            logits = model(
+                input_ids=input_ids,
+                attention_mask=attention_mask,
+                position_ids=position_ids,
+                logits_to_keep=keep,
+            ).logits
+        logprobs = torch.log_softmax(logits[:, :-1].float(), dim=-1)
+
+        scores = []
+        for row, ids in enumerate(continuation_ids):
+            targets = torch.tensor(ids, device=logprobs.device)
+            positions = torch.arange(
+                keep - 1 - len(ids), keep - 1, device=logprobs.device
+            )
+            scores.append(logprobs[row, positions, targets].mean().item())
+        self.record_usage(sum(map(len, rows)), 0)
+        return scores
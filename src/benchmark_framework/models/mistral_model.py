@@ -11,13 +11,20 @@ class MistralModel(BaseModel):
     Mistral language model implementation.
     """
 
+    api_base_url = "https://api.mistral.ai"
+
     def __init__(self, model_name: str, model_config: ModelConfig, **kwargs):
         super().__init__(model_name, model_config, **kwargs)
         api_key = os.getenv("MISTRAL_API_KEY")
         if not api_key:
             raise ValueError("MISTRAL_API_KEY environment variable must be set")
 
-        self.client = Mistral(api_key=api_key)
+        timeout_ms = None
+        if model_config.request_timeout is not None:
+            timeout_ms = int(model_config.request_timeout * 1000)
+        self.client = Mistral(
+            api_key=api_key, server_url=model_config.base_url, timeout_ms=timeout_ms
+        )
 
     def generate_response(self, system_prompt: str, prompt: str) -> str:
         messages = [
@@ -25,11 +32,26 @@ class MistralModel(BaseModel):
             {"role": "user", "content": prompt},
         ]
 
+        request_kwargs = {}
+        if self.get_response_schema() is not None:
+            # JSON mode; the expected fields are described in the system prompt
+            request_kwargs["response_format"] = {"type": "json_object"}
+
         chat_response = self.client.chat.complete(
             model=self.model_name,
             messages=messages,
+            max_tokens=self.get_max_output_tokens(),
+            **request_kwargs,
         )
 
+        if chat_response.usage is not None:
+            self.record_usage(
+                chat_response.usage.prompt_tokens,
+                chat_response.usage.completion_tokens,
+            )
+
+        if chat_response.choices[0].finish_reason == "length":
+            self.record_call_info(truncated=True)
         return chat_response.choices[0].message.content
 
     def get_default_runner_config(self):
@@ -5,6 +5,7 @@ from openai import OpenAI
 from src.benchmark_framework.configs.runner_config import RunnerConfig
 from src.benchmark_framework.models.base_model import BaseModel
 from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.utils.http_clients import get_http_client
 
 
 class NvidiaModel(BaseModel):
@@ -12,6 +13,8 @@ class NvidiaModel(BaseModel):
     Model implementation via NVIDIA API.
     """
 
+    api_base_url = "https://integrate.api.nvidia.com/v1"
+
     def __init__(
         self, model_name: str, model_config: Optional[ModelConfig] = None, **kwargs
     ):
@@ -24,7 +27,12 @@ class NvidiaModel(BaseModel):
 
     def _set_client(self):
         self.client = OpenAI(
-            base_url="https://integrate.api.nvidia.com/v1", api_key=self._api_key
+            base_url=self.model_config.base_url or self.api_base_url,
+            api_key=self._api_key,
+            timeout=self.model_config.request_timeout,
+            http_client=get_http_client(
+                self.model_config.http_pool_size, self.model_config.http2
+            ),
         )
 
     def generate_response(self, system_prompt: str, prompt: str) -> str:
@@ -33,12 +41,24 @@ class NvidiaModel(BaseModel):
             {"role": "user", "content": prompt},
         ]
 
+        request_kwargs = {}
+        max_output_tokens = self.get_max_output_tokens()
+        if max_output_tokens is not None:
+            request_kwargs["max_tokens"] = max_output_tokens
+
         completion = self.client.chat.completions.create(
             model=self.model_name,
             messages=messages,
             extra_body=self.model_config.extra_body,
             stream=False,
+            **request_kwargs,
         )
+        if completion.usage is not None:
+            self.record_usage(
+                completion.usage.prompt_tokens, completion.usage.completion_tokens
+            )
+        if completion.choices[0].finish_reason == "length":
+            self.record_call_info(truncated=True)
         return completion.choices[0].message.content
 
     def get_default_runner_config(self):
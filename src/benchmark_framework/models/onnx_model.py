@@ -0,0 +1,81 @@
+import os
+from pathlib import Path
+from typing import Any, Optional
+
+from src.benchmark_framework.models.local_model import LocalModel
+from src.benchmark_framework.utils.model_cache import (
+    get_cache_path,
+    resolve_revision,
+    save_atomically,
+)
+
+ONNX_PREFIX = "onnx"
+# Exported models, one directory per model and revision
+ONNX_CACHE_DIR = Path(
+    os.getenv("ONNX_CACHE_DIR", Path.home() / ".cache" / "benchmark_framework" / "onnx")
+)
+
+
+def get_export_path(model_path: str, revision: str) -> Path:
+    return get_cache_path(ONNX_CACHE_DIR, model_path, revision)
+
+
+class ONNXModel(LocalModel):
+    """
+    Local model run with ONNX Runtime on CPU, for small models in nightly
+    regression runs.
+
+    Registered as `onnx/<Hugging Face repo>`. The first use exports the model to
+    ONNX (with its key/value cache as inputs and outputs) into `ONNX_CACHE_DIR`,
+    keyed by model and resolved revision; later runs load the export. The ORT
+    session binds inputs and outputs to preallocated buffers (IO binding), so the
+    key/value cache stays in place between decoding steps. Generation, batching
+    and usage reporting follow LocalModel.
+    """
+
+    model_prefix = ONNX_PREFIX
+    # ORT sessions take their own key/value inputs, not a transformers cache
+    supports_prefix_cache = False
+    # ORT sessions return logits for every position only
+    supports_scoring = False
+
+    def _load_pipeline(self, model_path: str, quantize: Optional[str]) -> Any:
+        # only import when ONNXModel is actually used
+        from optimum.onnxruntime import ORTModelForCausalLM
+        from transformers import AutoTokenizer, pipeline
+
+        if quantize is not None:
+            raise ValueError("ONNX models do not support quantization.")
+
+        revision = resolve_revision(
+            model_path, self.model_config.revision, ONNX_CACHE_DIR
+        )
+        export_path = get_export_path(model_path, revision)
+        if not export_path.exists():
+            print(f"Exporting '{model_path}' ({revision}) to ONNX in {export_path}")
+
+            def export(staging_path: Path) -> None:
+                model = ORTModelForCausalLM.from_pretrained(
+                    model_path,
+                    revision=self.model_config.revision,
+                    export=True,
+                    use_cache=True,
+                )
+                model.save_pretrained(staging_path)
+                AutoTokenizer.from_pretrained(
+                    model_path, revision=self.model_config.revision
+                ).save_pretrained(staging_path)
+
+            save_atomically(export_path, export)
+
+        model = ORTModelForCausalLM.from_pretrained(
+            export_path,
+            use_cache=True,
+            use_io_binding=True,
+            provider="CPUExecutionProvider",
+        )
+        return pipeline(
+            task="text-generation",
+            model=model,
+            tokenizer=AutoTokenizer.from_pretrained(export_path),
+        )
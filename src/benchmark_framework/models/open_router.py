@@ -1,9 +1,17 @@
 import os
+import time
+from typing import List, Optional
 from openai import OpenAI
 
 from src.benchmark_framework.configs.runner_config import RunnerConfig
 from src.benchmark_framework.models.base_model import BaseModel
 from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.utils.http_clients import get_http_client
+from src.benchmark_framework.utils.provider_stats import (
+    ProviderStats,
+    get_provider_stats,
+)
+from src.benchmark_framework.utils.response_schema import get_json_schema_format
 
 MODEL_PROVIDER_DICT = {
     "meta-llama/llama-3.3-70b-instruct": {
@@ -19,6 +27,23 @@ MODEL_PROVIDER_DICT = {
     "google/gemma-3-12b-it": {"order": ["deepinfra/bf16"], "allow_fallbacks": False},
     "mistralai/mistral-nemo": {"order": ["deepinfra/fp8"], "allow_fallbacks": False},
 }
+# OpenRouter's own provider ordering for models without latency history
+NO_HISTORY_SORT = "throughput"
+
+
+def get_quantizations(provider_preferences: Optional[dict]) -> List[str]:
+    """
+    Quantizations allowed by a pinned provider setting ("novita/bf16" -> "bf16").
+    """
+    if not provider_preferences:
+        return []
+    if "quantizations" in provider_preferences:
+        return list(provider_preferences["quantizations"])
+    return [
+        slug.split("/", 1)[1]
+        for slug in provider_preferences.get("order", [])
+        if "/" in slug
+    ]
 
 
 class OpenRouterModel(BaseModel):
@@ -29,16 +54,74 @@ class OpenRouterModel(BaseModel):
     Requires OPENROUTER_API_KEY environment variable to be set.
     """
 
+    api_base_url = "https://openrouter.ai/api/v1"
+
     def __init__(self, model_name: str, model_config: ModelConfig, **kwargs):
         super().__init__(model_name, model_config, **kwargs)
         api_key = os.getenv("OPENROUTER_API_KEY")
-        base_url = "https://openrouter.ai/api/v1"
+        base_url = model_config.base_url or self.api_base_url
         if not api_key:
             raise ValueError("OPENROUTER_API_KEY environment variable must be set")
 
-        self.client = OpenAI(base_url=base_url, api_key=api_key)
+        self.client = OpenAI(
+            base_url=base_url,
+            api_key=api_key,
+            timeout=model_config.request_timeout,
+            http_client=get_http_client(
+                model_config.http_pool_size, model_config.http2
+            ),
+        )
+        self.provider_stats: Optional[ProviderStats] = None
+        if model_config.rank_providers:
+            self.provider_stats = (
+                get_provider_stats(model_config.provider_stats_path)
+                if model_config.provider_stats_path is not None
+                else ProviderStats()
+            )
+
+    def get_provider_preferences(self) -> Optional[dict]:
+        """
+        OpenRouter `provider` routing preferences for the next request.
+
+        Without provider ranking this is the pinned setting from MODEL_PROVIDER_DICT.
+        With it, any provider serving the pinned quantizations is allowed: providers
+        with history are tried fastest first and the rest stay reachable as
+        fallbacks; without history OpenRouter sorts providers itself.
+        """
+        pinned = MODEL_PROVIDER_DICT.get(self.model_name)
+        if self.provider_stats is None:
+            return pinned
+
+        preferences = {}
+        quantizations = get_quantizations(pinned)
+        if quantizations:
+            preferences["quantizations"] = quantizations
+        ranked = self.provider_stats.rank(self.model_name)
+        if ranked:
+            preferences.update(order=ranked, allow_fallbacks=True)
+        else:
+            preferences["sort"] = NO_HISTORY_SORT
+        return preferences
+
+    def _record_provider_error(
+        self, error: Exception, preferences: Optional[dict]
+    ) -> None:
+        if self.provider_stats is None:
+            return
+        # OpenRouter names the failing upstream provider in the error metadata;
+        # otherwise blame the provider that was tried first
+        body = getattr(error, "body", None)
+        metadata = body.get("metadata") if isinstance(body, dict) else None
+        provider = (metadata or {}).get("provider_name")
+        if provider is None and preferences and preferences.get("order"):
+            provider = preferences["order"][0]
+        if provider:
+            self.provider_stats.record_error(self.model_name, provider)
 
     def generate_response(self, system_prompt: str, prompt: str) -> str:
+        return self.generate_responses(system_prompt, prompt, n=1)[0]
+
+    def generate_responses(self, system_prompt: str, prompt: str, n: int) -> List[str]:
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": prompt},
@@ -48,16 +131,60 @@ class OpenRouterModel(BaseModel):
             "model": self.model_name,
             "messages": messages,
         }
+        if n > 1:
+            request_kwargs["n"] = n
+        max_output_tokens = self.get_max_output_tokens()
+        if max_output_tokens is not None:
+            request_kwargs["max_tokens"] = max_output_tokens
+        schema = self.get_response_schema()
+        if schema is not None:
+            request_kwargs["response_format"] = get_json_schema_format(schema)
+
+        # Only add extra_body if there are provider preferences for the model
+        preferences = self.get_provider_preferences()
+        if preferences is not None:
+            request_kwargs["extra_body"] = {"provider": preferences}
+
+        start = time.monotonic()
+        try:
+            completion = self.client.chat.completions.create(**request_kwargs)
+        except Exception as e:
+            self._record_provider_error(e, preferences)
+            raise
+        latency = time.monotonic() - start
+
+        # Upstream provider that served the request, kept for reproducibility
+        provider = getattr(completion, "provider", None)
+        if provider:
+            self.record_call_info(provider=provider)
+            if self.provider_stats is not None:
+                self.provider_stats.record_success(self.model_name, provider, latency)
 
-        # Only add extra_body if the model is defined in the provider dict
-        if self.model_name in MODEL_PROVIDER_DICT:
-            request_kwargs["extra_body"] = {
-                "provider": MODEL_PROVIDER_DICT[self.model_name]
-            }
+        if completion.usage is not None:
+            self.record_usage(
+                completion.usage.prompt_tokens, completion.usage.completion_tokens
+            )
 
-        completion = self.client.chat.completions.create(**request_kwargs)
+        if any(choice.finish_reason == "length" for choice in completion.choices):
+            self.record_call_info(truncated=True)
 
-        return completion.choices[0].message.content
+        responses = [choice.message.content for choice in completion.choices]
+        if len(responses) < n:
+            # Not every upstream provider honours `n`; sample the rest in parallel
+            usage = self.pop_call_info()
+            responses += super().generate_responses(
+                system_prompt, prompt, n - len(responses)
+            )
+            extra_usage = self.pop_call_info()
+            self.record_usage(
+                usage.get("input_tokens", 0) + extra_usage.get("input_tokens", 0),
+                usage.get("output_tokens", 0) + extra_usage.get("output_tokens", 0),
+            )
+            if usage.get("truncated") or extra_usage.get("truncated"):
+                self.record_call_info(truncated=True)
+            if usage.get("provider"):
+                self.record_call_info(provider=usage["provider"])
+        return responses
 
     def get_default_runner_config(self):
         return RunnerConfig()
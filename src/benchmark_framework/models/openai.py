@@ -1,9 +1,12 @@
 import os
+from typing import List, Optional
 from openai import OpenAI
 
 from src.benchmark_framework.configs.runner_config import RunnerConfig
 from src.benchmark_framework.models.base_model import BaseModel
 from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.utils.http_clients import get_http_client
+from src.benchmark_framework.utils.response_schema import get_json_schema_format
 
 
 class OpenAIModel(BaseModel):
@@ -14,26 +17,71 @@ class OpenAIModel(BaseModel):
     Requires OPENAI_API_KEY environment variable to be set.
     """
 
+    api_base_url = "https://api.openai.com/v1"
+
     def __init__(self, model_name: str, model_config: ModelConfig, **kwargs):
         super().__init__(model_name, model_config, **kwargs)
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key:
             raise ValueError("OPENAI_API_KEY environment variable must be set")
 
-        self.client = OpenAI(api_key=api_key)
+        self.client = OpenAI(
+            api_key=api_key,
+            base_url=model_config.base_url,
+            timeout=model_config.request_timeout,
+            http_client=get_http_client(
+                model_config.http_pool_size, model_config.http2
+            ),
+        )
+        self._encoding = None
+
+    def count_tokens(self, system_prompt: str, prompt: str) -> Optional[int]:
+        # tiktoken is optional; without it token counts are estimated
+        if self._encoding is None:
+            try:
+                import tiktoken
+
+                self._encoding = tiktoken.encoding_for_model(self.model_name)
+            except (ImportError, KeyError):
+                self._encoding = False
+        if not self._encoding:
+            return None
+        # Chat formatting adds a few tokens per message
+        return (
+            len(self._encoding.encode(system_prompt))
+            + len(self._encoding.encode(prompt))
+            + 8
+        )
 
     def generate_response(self, system_prompt: str, prompt: str) -> str:
+        return self.generate_responses(system_prompt, prompt, n=1)[0]
+
+    def generate_responses(self, system_prompt: str, prompt: str, n: int) -> List[str]:
         messages = [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": prompt},
         ]
 
-        completion = self.client.chat.completions.create(
-            model=self.model_name,
-            messages=messages,
-        )
+        request_kwargs = {"model": self.model_name, "messages": messages, "n": n}
+        max_output_tokens = self.get_max_output_tokens()
+        if max_output_tokens is not None:
+            request_kwargs["max_completion_tokens"] = max_output_tokens
+        schema = self.get_response_schema()
+        if schema is not None:
+            request_kwargs["response_format"] = get_json_schema_format(schema)
+
+        # The prompt is billed once however many choices are sampled
+        completion = self.client.chat.completions.create(**request_kwargs)
+
+        if completion.usage is not None:
+            self.record_usage(
+                completion.usage.prompt_tokens, completion.usage.completion_tokens
+            )
+
+        if any(choice.finish_reason == "length" for choice in completion.choices):
+            self.record_call_info(truncated=True)
 
-        return completion.choices[0].message.content
+        return [choice.message.content for choice in completion.choices]
 
     def get_default_runner_config(self):
         return RunnerConfig(requests_per_minute=50)
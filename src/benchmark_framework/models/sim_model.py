@@ -0,0 +1,198 @@
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, fields
+from typing import Deque, List, Optional, Tuple
+
+from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.models.base_model import BaseModel
+
+SIM_PREFIX = "sim"
+LATENCY_DISTRIBUTIONS = ("fixed", "lognormal", "heavy_tail")
+# Rough characters per token of the simulated tokenizer
+CHARS_PER_TOKEN = 4
+_INT_FIELDS = ("rpm", "tpm", "output_tokens", "seed")
+_STR_FIELDS = ("latency",)
+# Legal basis given in every simulated answer
+SIM_LEGAL_BASIS = {
+    "legal_basis": "art. 415 k.c.",
+    "legal_basis_content": "Kto z winy swej wyrządził drugiemu szkodę, "
+    "obowiązany jest do jej naprawienia.",
+}
+_PACK_ID_PATTERN = re.compile(r"\[ID: ([^\]]+)\]")
+_CHOICE_PATTERN = re.compile(r"^([A-Z])\) ", re.MULTILINE)
+
+
+@dataclass
+class SimConfig:
+    """
+    Behaviour of a simulated model, parsed from its name.
+    """
+
+    # Latency distribution: fixed (always `median`), lognormal or heavy_tail
+    # (lognormal with a share `tail_prob` of requests slowed by a Pareto factor)
+    latency: str = "lognormal"
+    median: float = 0.5
+    sigma: float = 0.5
+    tail_prob: float = 0.05
+    tail_alpha: float = 1.5
+    # Shares of requests failing with 429 and 503
+    rate_limit_errors: float = 0.0
+    server_errors: float = 0.0
+    # Provider-side limits per minute; exceeding them fails with 429
+    rpm: Optional[int] = None
+    tpm: Optional[int] = None
+    output_tokens: int = 80
+    seed: Optional[int] = None
+
+
+def parse_sim_name(model_name: str) -> SimConfig:
+    """
+    Parse `sim` or `sim/<option>=<value>,...` (options of SimConfig), e.g.
+    `sim/latency=heavy_tail,median=0.2,rate_limit_errors=0.05,rpm=600`.
+    """
+    if model_name == SIM_PREFIX:
+        return SimConfig()
+    if not model_name.startswith(f"{SIM_PREFIX}/"):
+        raise ValueError(
+            f"Simulated model name '{model_name}' must look like "
+            f"'{SIM_PREFIX}/<option>=<value>,...'."
+        )
+
+    names = {field.name for field in fields(SimConfig)}
+    options = {}
+    for option in model_name[len(SIM_PREFIX) + 1 :].split(","):
+        name, _, value = option.partition("=")
+        if name not in names or not value:
+            raise ValueError(
+                f"Unknown simulated model option '{option}', "
+                f"expected one of: {', '.join(sorted(names))}."
+            )
+        if name in _STR_FIELDS:
+            options[name] = value
+        elif name in _INT_FIELDS:
+            options[name] = int(value)
+        else:
+            options[name] = float(value)
+
+    config = SimConfig(**options)
+    if config.latency not in LATENCY_DISTRIBUTIONS:
+        raise ValueError(
+            f"Latency distribution must be one of: {', '.join(LATENCY_DISTRIBUTIONS)}."
+        )
+    return config
+
+
+class SimulatedAPIError(Exception):
+    """
+    Provider error raised by the simulated model (classified by its status code).
+    """
+
+    def __init__(self, status_code: int, message: str):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class SimModel(BaseModel):
+    """
+    Simulated model for tuning the runner without network access or API costs.
+
+    Answers exam, packed exam and judgment prompts with well-formed JSON after
+    a latency drawn from the configured distribution, fails a share of requests
+    with 429/503 and enforces requests-per-minute and tokens-per-minute limits
+    like a provider would. Token usage is estimated from prompt length.
+    """
+
+    def __init__(self, model_name: str, model_config: ModelConfig, **kwargs):
+        super().__init__(model_name, model_config, **kwargs)
+        self.sim_config = parse_sim_name(model_name)
+        self._random = random.Random(self.sim_config.seed)
+        self._lock = threading.Lock()
+        # (time, tokens) of requests accepted in the last minute
+        self._window: Deque[Tuple[float, int]] = deque()
+
+    def _draw(self) -> Tuple[float, float]:
+        """
+        Latency of the next request and a uniform sample deciding its failure.
+        """
+        config = self.sim_config
+        with self._lock:
+            failure = self._random.random()
+            if config.latency == "fixed":
+                return config.median, failure
+            latency = config.median * math.exp(config.sigma * self._random.gauss(0, 1))
+            if (
+                config.latency == "heavy_tail"
+                and self._random.random() < config.tail_prob
+            ):
+                latency *= self._random.paretovariate(config.tail_alpha)
+            return latency, failure
+
+    def _admit(self, tokens: int) -> None:
+        """
+        Enforce the per-minute request and token limits.
+        """
+        config = self.sim_config
+        now = time.monotonic()
+        with self._lock:
+            while self._window and now - self._window[0][0] >= 60:
+                self._window.popleft()
+            if config.rpm is not None and len(self._window) >= config.rpm:
+                raise SimulatedAPIError(429, "Simulated requests-per-minute limit")
+            used_tokens = sum(used for _, used in self._window)
+            if config.tpm is not None and used_tokens + tokens > config.tpm:
+                raise SimulatedAPIError(429, "Simulated tokens-per-minute limit")
+            self._window.append((now, tokens))
+
+    def _answer(self, system_prompt: str, prompt: str) -> dict:
+        if '"answer"' not in system_prompt:
+            return dict(SIM_LEGAL_BASIS)
+        choices = _CHOICE_PATTERN.findall(prompt) or ["A", "B", "C"]
+        with self._lock:
+            answer = self._random.choice(choices)
+        return {"answer": answer, **SIM_LEGAL_BASIS}
+
+    def _respond(self, system_prompt: str, prompt: str) -> Tuple[str, int]:
+        """
+        Response text and its simulated output tokens.
+        """
+        pack_ids = _PACK_ID_PATTERN.findall(prompt)
+        if not pack_ids:
+            answer = self._answer(system_prompt, prompt)
+            return json.dumps(answer, ensure_ascii=False), self.sim_config.output_tokens
+
+        questions = _PACK_ID_PATTERN.split(prompt)[2::2]
+        answers: List[dict] = [
+            {"id": pack_id, **self._answer(system_prompt, question)}
+            for pack_id, question in zip(pack_ids, questions)
+        ]
+        return (
+            json.dumps(answers, ensure_ascii=False),
+            self.sim_config.output_tokens * len(answers),
+        )
+
+    def generate_response(self, system_prompt: str, prompt: str) -> str:
+        config = self.sim_config
+        input_tokens = (len(system_prompt) + len(prompt)) // CHARS_PER_TOKEN
+        latency, failure = self._draw()
+
+        self._admit(input_tokens + config.output_tokens)
+        if failure < config.rate_limit_errors:
+            raise SimulatedAPIError(429, "Simulated rate limit error")
+        time.sleep(latency)
+        if failure < config.rate_limit_errors + config.server_errors:
+            raise SimulatedAPIError(503, "Simulated server error")
+
+        response, output_tokens = self._respond(system_prompt, prompt)
+        max_output_tokens = self.get_max_output_tokens()
+        if max_output_tokens is not None and output_tokens > max_output_tokens:
+            # Cut the response like a provider stopping at the token cap
+            response = response[: max_output_tokens * CHARS_PER_TOKEN]
+            output_tokens = max_output_tokens
+            self.record_call_info(truncated=True)
+        self.record_usage(input_tokens, output_tokens)
+        return response
@@ -0,0 +1,82 @@
+from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.models.base_model import BaseModel
+
+
+class CappedModel(BaseModel):
+    """Echoes the active output cap and reports usage per call."""
+
+    def generate_response(self, system_prompt, prompt):
+        self.record_usage(10, 5)
+        if self.get_max_output_tokens() == 1:
+            self.record_call_info(truncated=True)
+        return str(self.get_max_output_tokens())
+
+
+def test_output_cap_overrides_config_within_block():
+    model = CappedModel("capped", ModelConfig(max_output_tokens=100))
+
+    with model.output_cap(20):
+        assert model.get_max_output_tokens() == 20
+        with model.output_cap(None):
+            assert model.get_max_output_tokens() is None
+        assert model.get_max_output_tokens() == 20
+    assert model.get_max_output_tokens() == 100
+
+
+def test_generate_responses_sums_usage_and_keeps_cap_in_workers():
+    model = CappedModel("capped", ModelConfig())
+
+    with model.output_cap(1):
+        responses = model.generate_responses("system", "prompt", n=3)
+    info = model.pop_call_info()
+
+    assert responses == ["1", "1", "1"]
+    assert info["input_tokens"] == 30
+    assert info["output_tokens"] == 15
+    assert info["truncated"] is True
+
+
+class SchemaModel(BaseModel):
+    """Echoes the active response schema."""
+
+    def generate_response(self, system_prompt, prompt):
+        return str(self.get_response_schema())
+
+
+SCHEMA = {"type": "object"}
+
+
+def test_response_schema_requires_structured_output():
+    model = SchemaModel("schema", ModelConfig())
+
+    with model.structured_output(SCHEMA):
+        assert model.get_response_schema() is None
+
+
+def test_structured_output_applies_within_block_and_in_workers():
+    model = SchemaModel("schema", ModelConfig(structured_output=True))
+
+    with model.structured_output(SCHEMA):
+        assert model.get_response_schema() == SCHEMA
+        assert model.generate_responses("system", "prompt", n=2) == [str(SCHEMA)] * 2
+    assert model.get_response_schema() is None
+
+
+def test_generate_batch_defaults_to_sequential_calls_with_own_call_info():
+    model = CappedModel("capped", ModelConfig())
+
+    with model.output_cap(1):
+        outputs = model.generate_batch([("system", "a"), ("system", "b")])
+
+    assert [response for response, _ in outputs] == ["1", "1"]
+    assert all(info["truncated"] is True for _, info in outputs)
+    assert all(info["input_tokens"] == 10 for _, info in outputs)
+    assert model.pop_call_info() == {}
+
+
+def test_generate_batch_applies_each_request_schema():
+    model = SchemaModel("schema", ModelConfig(structured_output=True))
+
+    outputs = model.generate_batch([("system", "a"), ("system", "b")], [SCHEMA, None])
+
+    assert [response for response, _ in outputs] == [str(SCHEMA), "None"]
@@ -0,0 +1,127 @@
+import pytest
+
+from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.models.base_model import BaseModel
+from src.benchmark_framework.models.cascade_model import (
+    CascadeModel,
+    parse_cascade_name,
+)
+
+EXAM_SYSTEM_PROMPT = 'Odpowiedz w formacie {"answer": ..., "legal_basis": ...}'
+
+
+class ScriptedModel(BaseModel):
+    """Returns queued responses and reports fixed token usage."""
+
+    def __init__(self, model_name, responses):
+        super().__init__(model_name, ModelConfig())
+        self.responses = list(responses)
+        self.calls = 0
+
+    def generate_response(self, system_prompt, prompt):
+        self.calls += 1
+        self.record_usage(100, 10)
+        return self.responses.pop(0)
+
+
+def answer(letter):
+    return f'{{"answer": "{letter}", "legal_basis": "art. 1 k.c."}}'
+
+
+def make_cascade(small_responses, large_responses, **config):
+    small = ScriptedModel("small", small_responses)
+    large = ScriptedModel("large", large_responses)
+    model = CascadeModel(
+        "cascade/small+large",
+        ModelConfig(**config),
+        small_model=small,
+        large_model=large,
+    )
+    return model, small, large
+
+
+def test_parse_cascade_name():
+    assert parse_cascade_name("cascade/mistralai/mistral-nemo+gpt-4o") == (
+        "mistralai/mistral-nemo",
+        "gpt-4o",
+    )
+
+
+@pytest.mark.parametrize("name", ["cascade/gpt-4o", "cascade/+gpt-4o", "gpt-4o+x"])
+def test_parse_cascade_name_invalid(name):
+    with pytest.raises(ValueError):
+        parse_cascade_name(name)
+
+
+def test_small_model_answer_is_kept():
+    model, _, large = make_cascade([answer("A")], [answer("B")])
+
+    response = model.generate_response(EXAM_SYSTEM_PROMPT, "pytanie")
+    info = model.pop_call_info()
+
+    assert response == answer("A")
+    assert large.calls == 0
+    assert info["cascade_tier"] == "small"
+    assert [usage["model_name"] for usage in info["tier_usage"]] == ["small"]
+
+
+def test_malformed_answer_escalates():
+    model, _, _ = make_cascade(['{"answer": ""}'], [answer("B")])
+
+    response = model.generate_response(EXAM_SYSTEM_PROMPT, "pytanie")
+    info = model.pop_call_info()
+
+    assert response == answer("B")
+    assert info["cascade_tier"] == "large"
+    assert info["cascade_escalation_reason"] == "malformed"
+    assert [usage["model_name"] for usage in info["tier_usage"]] == [
+        "small",
+        "large",
+    ]
+
+
+def test_low_agreement_escalates():
+    model, _, _ = make_cascade(
+        [answer("A"), answer("A"), answer("C")],
+        [answer("B")],
+        cascade_samples=3,
+        cascade_min_agreement=1.0,
+    )
+
+    response = model.generate_response(EXAM_SYSTEM_PROMPT, "pytanie")
+    info = model.pop_call_info()
+
+    assert response == answer("B")
+    assert info["cascade_escalation_reason"] == "low_agreement"
+    assert info["cascade_agreement"] == pytest.approx(2 / 3)
+
+
+def test_majority_within_threshold_is_kept():
+    model, _, large = make_cascade(
+        [answer("A"), answer("C"), answer("A")],
+        [answer("B")],
+        cascade_samples=3,
+        cascade_min_agreement=0.6,
+    )
+
+    response = model.generate_response(EXAM_SYSTEM_PROMPT, "pytanie")
+
+    assert response == answer("A")
+    assert large.calls == 0
+    assert model.pop_call_info()["tier_usage"][0]["input_tokens"] == 300
+
+
+def test_sampled_cascade_keeps_usage_of_every_tier_call():
+    model, _, _ = make_cascade(
+        [answer("A"), "nonsense", answer("B")], [answer("C")], cascade_samples=1
+    )
+
+    model.generate_responses(EXAM_SYSTEM_PROMPT, "Pytanie", n=3)
+    info = model.pop_call_info()
+
+    assert sorted(usage["model_name"] for usage in info["tier_usage"]) == [
+        "large",
+        "small",
+        "small",
+        "small",
+    ]
@@ -0,0 +1,172 @@
+import sys
+import threading
+import time
+import types
+
+import pytest
+
+from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.models.gguf_model import GGUFModel
+
+
+class FakeLlama:
+    """
+    Stands in for llama_cpp.Llama: echoes the system prompt with fixed usage
+    after `delay` seconds, checking its stopping criteria once like llama.cpp
+    does after each token.
+    """
+
+    def __init__(self, **kwargs):
+        self.kwargs = kwargs
+        self.cache = None
+        self.calls = []
+        self.finish_reason = "stop"
+        self.delay = 0.0
+
+    def set_cache(self, cache):
+        self.cache = cache
+
+    def tokenize(self, text):
+        return text.split()
+
+    def create_chat_completion(self, messages, max_tokens, **kwargs):
+        self.calls.append({"messages": messages, "max_tokens": max_tokens, **kwargs})
+        time.sleep(self.delay)
+        for criterion in kwargs.get("stopping_criteria", []):
+            criterion(None, None)
+        return {
+            "usage": {"prompt_tokens": 12, "completion_tokens": 3},
+            "choices": [
+                {
+                    "message": {"content": messages[0]["content"]},
+                    "finish_reason": self.finish_reason,
+                }
+            ],
+        }
+
+
+@pytest.fixture
+def llama_cpp(monkeypatch):
+    module = types.SimpleNamespace(
+        Llama=FakeLlama,
+        LlamaRAMCache=lambda capacity_bytes: ("ram cache", capacity_bytes),
+        StoppingCriteriaList=list,
+    )
+    monkeypatch.setitem(sys.modules, "llama_cpp", module)
+    return module
+
+
+def make_model(**config) -> GGUFModel:
+    return GGUFModel("gguf/models/bielik.Q4_K_M.gguf", ModelConfig(**config))
+
+
+def test_loads_memory_mapped_file_with_configured_threads(llama_cpp):
+    model = make_model(threads=4, context_size=8192)
+
+    assert model.llm.kwargs["model_path"] == "models/bielik.Q4_K_M.gguf"
+    assert model.llm.kwargs["use_mmap"] is True
+    assert model.llm.kwargs["n_threads"] == 4
+    assert model.llm.kwargs["n_ctx"] == 8192
+    assert model.llm.cache is not None
+
+
+def test_prompt_cache_can_be_disabled(llama_cpp):
+    model = make_model(prefix_cache=False)
+
+    assert model.llm.cache is None
+    assert model.llm.kwargs["n_ctx"] == 0
+
+
+def test_response_records_usage_and_speed(llama_cpp):
+    model = make_model(max_output_tokens=64, request_timeout=None)
+
+    assert model.generate_response("system", "prompt") == "system"
+    info = model.pop_call_info()
+
+    assert info["input_tokens"] == 12
+    assert info["output_tokens"] == 3
+    assert info["tokens_per_second"] > 0
+    assert "truncated" not in info
+    assert model.llm.calls[0]["max_tokens"] == 64
+    assert "stopping_criteria" not in model.llm.calls[0]
+
+
+def test_length_finish_reason_marks_truncation(llama_cpp):
+    model = make_model()
+    model.llm.finish_reason = "length"
+
+    model.generate_response("system", "prompt")
+
+    assert model.pop_call_info()["truncated"] is True
+    # The default request timeout stops generation at its deadline
+    assert len(model.llm.calls[0]["stopping_criteria"]) == 1
+
+
+def test_response_schema_is_passed_as_response_format(llama_cpp):
+    model = make_model(structured_output=True)
+    schema = {"type": "object", "properties": {"answer": {"type": "string"}}}
+
+    with model.structured_output(schema):
+        model.generate_response("system", "prompt")
+
+    assert model.llm.calls[0]["response_format"] == {
+        "type": "json_object",
+        "schema": schema,
+    }
+
+
+def test_batch_is_grouped_by_system_prompt_and_returned_in_order(llama_cpp):
+    model = make_model()
+    requests = [("b", "1"), ("a", "2"), ("b", "3"), ("a", "4")]
+
+    results = model.generate_batch(requests)
+
+    assert [response for response, _ in results] == ["b", "a", "b", "a"]
+    assert [call["messages"][1]["content"] for call in model.llm.calls] == [
+        "2",
+        "4",
+        "1",
+        "3",
+    ]
+    assert all(info["input_tokens"] == 12 for _, info in results)
+
+
+def test_generation_stopped_at_time_limit_raises_timeout(llama_cpp):
+    model = make_model(request_timeout=0.01)
+    model.llm.delay = 0.05
+
+    with pytest.raises(TimeoutError):
+        model.generate_response("system", "prompt")
+
+    assert model.pop_call_info()["output_tokens"] == 3
+
+
+def test_waiting_for_the_context_does_not_use_up_the_time_limit(llama_cpp):
+    model = make_model(request_timeout=0.1)
+    results = []
+
+    def generate() -> None:
+        response = model.generate_response("system", "prompt")
+        results.append((response, model.pop_call_info()))
+
+    with model._lock:
+        worker = threading.Thread(target=generate)
+        worker.start()
+        # Another request holds the context for longer than the time limit
+        time.sleep(0.2)
+    worker.join()
+
+    ((response, info),) = results
+    assert response == "system"
+    # Only generation counts towards the speed, not the wait for the context
+    assert info["tokens_per_second"] > 3 / 0.2
+
+
+def test_timed_out_request_of_a_batch_is_marked(llama_cpp):
+    model = make_model(request_timeout=0.01)
+    model.llm.delay = 0.05
+
+    results = model.generate_batch([("a", "1"), ("b", "2")])
+
+    assert [response for response, _ in results] == ["", ""]
+    assert all(info["timed_out"] is True for _, info in results)
@@ -0,0 +1,338 @@
+import sys
+import time
+import types
+
+import pytest
+
+torch = pytest.importorskip("torch")
+
+from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.models.local_model import PREFIX_CACHE_SIZE, LocalModel
+
+VOCAB_SIZE = 128
+EOS_ID = 1
+
+
+class CharTokenizer:
+    """
+    One token per ASCII character, with a plain-text chat template. With
+    `merge_system` the template folds the system prompt into the user turn.
+    """
+
+    def __init__(self, merge_system=False):
+        self.merge_system = merge_system
+        self.pad_token_id = None
+        self.eos_token_id = EOS_ID
+        self.padding_side = "right"
+
+    def __len__(self):
+        return VOCAB_SIZE
+
+    def encode(self, text, add_special_tokens=False):
+        return [ord(char) for char in text]
+
+    def decode(self, ids, skip_special_tokens=True):
+        return "".join(chr(int(i)) for i in ids if int(i) > EOS_ID)
+
+    def render_chat(self, messages, add_generation_prompt):
+        if self.merge_system and messages[0]["role"] == "system":
+            system, *rest = messages
+            if rest:
+                user = {
+                    "role": "user",
+                    "content": system["content"] + rest[0]["content"],
+                }
+                messages = [user, *rest[1:]]
+        text = "".join(f"{m['role'][0].upper()}:{m['content']}\n" for m in messages)
+        return text + ("A:" if add_generation_prompt else "")
+
+    def apply_chat_template(self, messages, tokenize=True, add_generation_prompt=True):
+        return self.encode(self.render_chat(messages, add_generation_prompt))
+
+    def save_pretrained(self, path):
+        (path / "tokenizer.json").write_text("{}")
+
+
+class BigramLM(torch.nn.Module):
+    """
+    Causal LM whose next-token logits depend on the current token only, so
+    expected log-probabilities can be computed by hand.
+    """
+
+    def __init__(self):
+        super().__init__()
+        generator = torch.Generator().manual_seed(0)
+        self.table = torch.randn(VOCAB_SIZE, VOCAB_SIZE, generator=generator)
+        self.forward_lengths = []
+        self.generate_calls = []
+
+    @property
+    def device(self):
+        return torch.device("cpu")
+
+    def forward(self, input_ids, logits_to_keep=0, use_cache=False, **kwargs):
+        self.forward_lengths.append(input_ids.shape[-1])
+        logits = self.table[input_ids]
+        if logits_to_keep:
+            logits = logits[:, -logits_to_keep:]
+        return types.SimpleNamespace(logits=logits, past_key_values=["prefix"])
+
+    def generate(self, inputs, max_new_tokens, **kwargs):
+        self.generate_calls.append({"inputs": inputs, **kwargs})
+        reply = torch.tensor([[ord(char) for char in "ok"]])
+        return torch.cat([inputs, reply], dim=-1)
+
+    def next_token_logprob(self, current: int, following: int) -> float:
+        return torch.log_softmax(self.table[current], dim=-1)[following].item()
+
+
+class LinearLM(torch.nn.Module):
+    """Checkpoint with linear layers, for the quantization tests."""
+
+    def __init__(self):
+        super().__init__()
+        self.proj = torch.nn.Linear(8, 8)
+        self.head = torch.nn.Linear(8, VOCAB_SIZE)
+
+    def save_pretrained(self, path, safe_serialization=True):
+        (path / "model.safetensors").write_text("weights")
+
+
+class FakePipeline:
+    """
+    Text-generation pipeline stand-in answering every request with `reply` (or
+    `reply(messages)` when callable), taking `delay` seconds per call.
+    """
+
+    def __init__(self, reply="ok", merge_system=False, model=None, delay=0.0):
+        self.tokenizer = CharTokenizer(merge_system)
+        self.model = model or BigramLM()
+        self.reply = reply
+        self.delay = delay
+        self.calls = []
+
+    def __call__(self, messages, **kwargs):
+        self.calls.append((messages, kwargs))
+        time.sleep(self.delay)
+        if messages and isinstance(messages[0], list):
+            return [[{"generated_text": self.get_reply(chat)}] for chat in messages]
+        return [{"generated_text": self.get_reply(messages)}]
+
+    def get_reply(self, messages):
+        return self.reply(messages) if callable(self.reply) else self.reply
+
+
+@pytest.fixture
+def pipeline_calls(monkeypatch):
+    """Loads through `transformers.pipeline` return a fake pipeline of a LinearLM."""
+    calls = []
+
+    def pipeline(task, model, **kwargs):
+        calls.append({"model": model, **kwargs})
+        return FakePipeline(model=LinearLM())
+
+    module = types.SimpleNamespace(
+        pipeline=pipeline, BitsAndBytesConfig=lambda **kwargs: kwargs
+    )
+    monkeypatch.setitem(sys.modules, "transformers", module)
+    return calls
+
+
+def is_dynamic_int8(module) -> bool:
+    return isinstance(module, torch.ao.nn.quantized.dynamic.Linear)
+
+
+def make_model(monkeypatch, pipe=None, **config) -> LocalModel:
+    pipe = pipe or FakePipeline()
+    monkeypatch.setattr(LocalModel, "_load_pipeline", lambda self, *args: pipe)
+    return LocalModel("local/org/model", ModelConfig(**config))
+
+
+def test_score_continuations_is_mean_logprob_of_continuation_tokens(monkeypatch):
+    model = make_model(monkeypatch)
+    bigram = model.pipe.model
+    tokenizer = model.pipe.tokenizer
+    continuations = ["A", "B) nie", "C) tak"]
+
+    scores = model.score_continuations("system", "prompt", continuations)
+
+    context = tokenizer.apply_chat_template(
+        [
+            {"role": "system", "content": "system"},
+            {"role": "user", "content": "prompt"},
+        ]
+    )
+    for continuation, score in zip(continuations, scores):
+        tokens = context[-1:] + tokenizer.encode(continuation)
+        expected = [
+            bigram.next_token_logprob(current, following)
+            for current, following in zip(tokens, tokens[1:])
+        ]
+        assert score == pytest.approx(sum(expected) / len(expected), abs=1e-5)
+
+
+def test_score_continuations_runs_one_forward_pass_and_records_usage(monkeypatch):
+    model = make_model(monkeypatch)
+
+    model.score_continuations("system", "prompt", ["A", "BB", "CCC"])
+    info = model.pop_call_info()
+
+    assert len(model.pipe.model.forward_lengths) == 1
+    context_tokens = len("S:system\nU:prompt\nA:")
+    assert info["input_tokens"] == 3 * context_tokens + 1 + 2 + 3
+    assert info["output_tokens"] == 0
+
+
+def test_prefix_cache_prefills_only_the_question(monkeypatch):
+    model = make_model(monkeypatch, prefix_cache=True)
+    bigram = model.pipe.model
+
+    assert model.generate_response("system", "first") == "ok"
+    first_info = model.pop_call_info()
+    assert model.generate_response("system", "second") == "ok"
+
+    # The system prompt is run through the model once and reused
+    assert bigram.forward_lengths == [len("S:system\n")]
+    assert first_info["cached_input_tokens"] == len("S:system\n")
+    assert first_info["input_tokens"] == len("S:system\nU:first\nA:")
+    assert first_info["output_tokens"] == 2
+    first_call, second_call = bigram.generate_calls
+    assert first_call["past_key_values"] == ["prefix"]
+    # Each request extends its own copy of the cache
+    assert first_call["past_key_values"] is not second_call["past_key_values"]
+    assert first_call["do_sample"] is False
+    assert model.pipe.calls == []
+
+
+def test_prefix_cache_falls_back_when_template_merges_system_prompt(monkeypatch):
+    pipe = FakePipeline(reply="fallback", merge_system=True)
+    model = make_model(monkeypatch, pipe=pipe, prefix_cache=True)
+
+    assert model.generate_response("system", "prompt") == "fallback"
+
+    assert pipe.model.generate_calls == []
+    assert len(pipe.calls) == 1
+    assert "cached_input_tokens" not in model.pop_call_info()
+
+
+def test_prefix_cache_keeps_most_recent_system_prompts(monkeypatch):
+    model = make_model(monkeypatch, prefix_cache=True)
+    system_prompts = [f"system {i}" for i in range(PREFIX_CACHE_SIZE + 1)]
+
+    for system_prompt in system_prompts:
+        model.generate_response(system_prompt, "prompt")
+
+    assert list(model._prefix_caches) == system_prompts[1:]
+
+
+def test_requests_without_prefix_cache_use_the_pipeline(monkeypatch):
+    model = make_model(monkeypatch, prefix_cache=False)
+
+    assert model.generate_response("system", "prompt") == "ok"
+
+    assert model.pipe.model.forward_lengths == []
+    assert len(model.pipe.calls) == 1
+
+
+def test_int8_loads_float32_on_cpu_and_quantizes_linear_layers(pipeline_calls):
+    model = LocalModel("local/org/model", ModelConfig(quantize="int8"))
+
+    (call,) = pipeline_calls
+    assert call["model"] == "org/model"
+    assert call["device"] == "cpu"
+    assert call["torch_dtype"] is torch.float32
+    assert "device_map" not in call
+    assert "quantization_config" not in call
+    assert is_dynamic_int8(model.pipe.model.proj)
+    assert is_dynamic_int8(model.pipe.model.head)
+
+
+def test_int8_weights_cache_holds_float32_and_is_quantized_on_reload(
+    pipeline_calls, monkeypatch, tmp_path
+):
+    monkeypatch.setenv("HF_HUB_OFFLINE", "1")
+    config = ModelConfig(quantize="int8", weights_cache_dir=tmp_path)
+
+    LocalModel("local/org/model", config)
+    reloaded = LocalModel("local/org/model", config)
+
+    cache_path = tmp_path / "org--model" / "main" / "int8"
+    assert (cache_path / "model.safetensors").exists()
+    assert pipeline_calls[1]["model"] == cache_path
+    assert pipeline_calls[1]["torch_dtype"] is torch.float32
+    assert is_dynamic_int8(reloaded.pipe.model.proj)
+
+
+def test_unknown_quantization_is_rejected(pipeline_calls):
+    with pytest.raises(ValueError):
+        LocalModel("local/org/model", ModelConfig(quantize="int4"))
+
+    assert pipeline_calls == []
+
+
+def test_generation_stopped_by_time_limit_raises_timeout(monkeypatch):
+    pipe = FakePipeline(delay=0.05)
+    model = make_model(monkeypatch, pipe=pipe, prefix_cache=False, request_timeout=0.01)
+
+    with pytest.raises(TimeoutError):
+        model.generate_response("system", "prompt")
+
+    assert pipe.calls[0][1]["max_time"] == 0.01
+    assert model.pop_call_info()["output_tokens"] == 2
+
+
+def test_response_reaching_the_output_cap_is_truncated_not_timed_out(monkeypatch):
+    pipe = FakePipeline(delay=0.05)
+    model = make_model(
+        monkeypatch,
+        pipe=pipe,
+        prefix_cache=False,
+        request_timeout=0.01,
+        max_output_tokens=2,
+    )
+
+    assert model.generate_response("system", "prompt") == "ok"
+    assert model.pop_call_info()["truncated"] is True
+
+
+def test_batch_cut_off_by_time_limit_is_marked_timed_out(monkeypatch):
+    pipe = FakePipeline(delay=0.05)
+    model = make_model(monkeypatch, pipe=pipe, batch_size=2, request_timeout=0.01)
+
+    results = model.generate_batch([("system", "first"), ("system", "second")])
+
+    assert all(info["timed_out"] is True for _, info in results)
+
+
+def test_generation_within_time_limit_is_kept(monkeypatch):
+    model = make_model(monkeypatch, prefix_cache=False, batch_size=2)
+
+    assert model.generate_response("system", "prompt") == "ok"
+    results = model.generate_batch([("system", "first"), ("system", "second")])
+
+    assert not any("timed_out" in info for _, info in results)
+
+
+def echo_prompt(messages):
+    return messages[-1]["content"]
+
+
+def test_batch_is_bucketed_by_length_and_returned_in_request_order(monkeypatch):
+    pipe = FakePipeline(reply=echo_prompt)
+    model = make_model(monkeypatch, pipe=pipe, batch_size=2, max_output_tokens=10)
+    prompts = ["long prompt xxxxx", "a", "medium", "bb", "x" * 20]
+
+    results = model.generate_batch([("system", prompt) for prompt in prompts])
+
+    # Shortest prompts share a batch, so padding within each batch stays small
+    assert [
+        [chat[-1]["content"] for chat in messages] for messages, _ in pipe.calls
+    ] == [["a", "bb"], ["medium", "long prompt xxxxx"], ["x" * 20]]
+    assert [kwargs["batch_size"] for _, kwargs in pipe.calls] == [2, 2, 1]
+    assert [response for response, _ in results] == prompts
+    for prompt, (_, info) in zip(prompts, results):
+        assert info["input_tokens"] == model.count_tokens("system", prompt)
+        assert info["output_tokens"] == len(prompt)
+        assert info["batch_size"] == (1 if prompt == "x" * 20 else 2)
+        assert info.get("truncated", False) is (len(prompt) >= 10)
+    assert model.pipe.tokenizer.padding_side == "left"
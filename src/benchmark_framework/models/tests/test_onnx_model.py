@@ -0,0 +1,111 @@
+import sys
+import types
+
+import pytest
+
+from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.models import onnx_model
+from src.benchmark_framework.models.onnx_model import ONNXModel, get_export_path
+
+
+def test_export_path_is_keyed_by_model_and_revision(tmp_path, monkeypatch):
+    monkeypatch.setattr(onnx_model, "ONNX_CACHE_DIR", tmp_path)
+
+    path = get_export_path("speakleash/Bielik-1.5B-v3.0-Instruct", "abc123")
+
+    assert path == tmp_path / "speakleash--Bielik-1.5B-v3.0-Instruct" / "abc123"
+    assert get_export_path("speakleash/Bielik-1.5B-v3.0-Instruct", "def456") != path
+
+
+def test_model_path_strips_onnx_prefix():
+    assert ONNXModel.get_model_path("onnx/speakleash/Bielik") == "speakleash/Bielik"
+
+
+class FakeTokenizer:
+    pad_token_id = None
+    eos_token_id = 1
+    padding_side = "right"
+
+    @classmethod
+    def from_pretrained(cls, path, **kwargs):
+        return cls()
+
+    def save_pretrained(self, path):
+        (path / "tokenizer.json").write_text("{}")
+
+
+class FakeORTModel:
+    """Stands in for ORTModelForCausalLM, recording every load and save."""
+
+    loads = []
+    saves = []
+
+    @classmethod
+    def from_pretrained(cls, path, **kwargs):
+        cls.loads.append({"path": path, **kwargs})
+        return cls()
+
+    def save_pretrained(self, path):
+        self.saves.append(path)
+        (path / "model.onnx").write_text("graph")
+
+
+@pytest.fixture
+def onnx_runtime(monkeypatch, tmp_path):
+    """Stubbed optimum.onnxruntime and transformers, with the export cache in tmp_path."""
+    monkeypatch.setattr(FakeORTModel, "loads", [])
+    monkeypatch.setattr(FakeORTModel, "saves", [])
+    optimum = types.ModuleType("optimum")
+    optimum.onnxruntime = types.SimpleNamespace(ORTModelForCausalLM=FakeORTModel)
+    transformers = types.SimpleNamespace(
+        AutoTokenizer=FakeTokenizer,
+        pipeline=lambda task, model, tokenizer: types.SimpleNamespace(
+            model=model, tokenizer=tokenizer
+        ),
+    )
+    monkeypatch.setitem(sys.modules, "optimum", optimum)
+    monkeypatch.setitem(sys.modules, "optimum.onnxruntime", optimum.onnxruntime)
+    monkeypatch.setitem(sys.modules, "transformers", transformers)
+    monkeypatch.setattr(onnx_model, "ONNX_CACHE_DIR", tmp_path)
+    monkeypatch.setenv("HF_HUB_OFFLINE", "1")
+    return FakeORTModel
+
+
+def test_first_load_exports_into_the_cache(onnx_runtime, tmp_path):
+    ONNXModel("onnx/org/model", ModelConfig())
+
+    export_path = get_export_path("org/model", "main")
+    export, load = onnx_runtime.loads
+    assert export["path"] == "org/model"
+    assert export["export"] is True
+    # Written to a staging directory and renamed into place
+    (staging_path,) = onnx_runtime.saves
+    assert staging_path.parent == export_path.parent
+    assert staging_path.name.startswith(".staging-")
+    assert (export_path / "model.onnx").exists()
+    assert (export_path / "tokenizer.json").exists()
+    assert not staging_path.exists()
+    assert load["path"] == export_path
+    assert load["use_cache"] is True
+    assert load["use_io_binding"] is True
+    assert load["provider"] == "CPUExecutionProvider"
+
+
+def test_cached_export_is_reused(onnx_runtime):
+    ONNXModel("onnx/org/model", ModelConfig())
+    model = ONNXModel("onnx/org/model", ModelConfig())
+
+    assert [load.get("export", False) for load in onnx_runtime.loads] == [
+        True,
+        False,
+        False,
+    ]
+    assert len(onnx_runtime.saves) == 1
+    assert model.pipe.tokenizer.padding_side == "left"
+
+
+def test_quantization_is_rejected(onnx_runtime):
+    with pytest.raises(ValueError):
+        ONNXModel("onnx/org/model", ModelConfig(quantize="int8"))
+
+    assert onnx_runtime.loads == []
@@ -0,0 +1,94 @@
+from types import SimpleNamespace
+
+import pytest
+
+from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.models.open_router import (
+    NO_HISTORY_SORT,
+    OpenRouterModel,
+    get_quantizations,
+)
+
+
+class FakeCompletions:
+    def __init__(self, provider=None, error=None):
+        self.provider = provider
+        self.error = error
+        self.requests = []
+
+    def create(self, **kwargs):
+        self.requests.append(kwargs)
+        if self.error is not None:
+            raise self.error
+        return SimpleNamespace(
+            provider=self.provider,
+            usage=SimpleNamespace(prompt_tokens=10, completion_tokens=5),
+            choices=[
+                SimpleNamespace(
+                    finish_reason="stop", message=SimpleNamespace(content="{}")
+                )
+            ],
+        )
+
+
+def make_model(model_name, completions, **config):
+    model = OpenRouterModel(model_name, ModelConfig(**config))
+    model.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    return model
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setenv("OPENROUTER_API_KEY", "test")
+
+
+def test_quantizations_from_pinned_settings():
+    assert get_quantizations({"order": ["novita/bf16"]}) == ["bf16"]
+    assert get_quantizations({"quantizations": ["fp8"]}) == ["fp8"]
+    assert get_quantizations(None) == []
+
+
+def test_pinned_provider_without_ranking():
+    completions = FakeCompletions(provider="Novita")
+    model = make_model("meta-llama/llama-3.3-70b-instruct", completions)
+
+    model.generate_response("system", "prompt")
+
+    provider = completions.requests[0]["extra_body"]["provider"]
+    assert provider == {"order": ["novita/bf16"], "allow_fallbacks": False}
+    assert model.pop_call_info()["provider"] == "Novita"
+
+
+def test_ranking_sorts_without_history_then_orders_by_history():
+    completions = FakeCompletions(provider="DeepInfra")
+    model = make_model(
+        "meta-llama/llama-3.3-70b-instruct", completions, rank_providers=True
+    )
+
+    model.generate_response("system", "prompt")
+    model.generate_response("system", "prompt")
+
+    first, second = (
+        request["extra_body"]["provider"] for request in completions.requests
+    )
+    assert first == {"quantizations": ["bf16"], "sort": NO_HISTORY_SORT}
+    assert second == {
+        "quantizations": ["bf16"],
+        "order": ["deepinfra"],
+        "allow_fallbacks": True,
+    }
+
+
+def test_errors_count_against_the_reported_provider():
+    error = RuntimeError("upstream error")
+    error.body = {"metadata": {"provider_name": "Together"}}
+    model = make_model(
+        "deepseek/deepseek-v3.2", FakeCompletions(error=error), rank_providers=True
+    )
+
+    with pytest.raises(RuntimeError):
+        model.generate_response("system", "prompt")
+
+    assert model.provider_stats.stats["deepseek/deepseek-v3.2"]["together"][
+        "errors"
+    ] == [1]
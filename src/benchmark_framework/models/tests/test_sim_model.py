@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.models.sim_model import (
+    SimModel,
+    SimulatedAPIError,
+    parse_sim_name,
+)
+from src.benchmark_framework.utils.errors import RATE_LIMIT, classify_error
+
+EXAM_SYSTEM_PROMPT = 'Pola JSON:\n"answer": "A" lub "B" lub "C"'
+EXAM_PROMPT = "Pytanie: ...\n\nOdpowiedzi:\nA) tak\nB) nie\n"
+
+
+def make_model(options: str) -> SimModel:
+    return SimModel(f"sim/latency=fixed,median=0,{options}", ModelConfig())
+
+
+def test_parse_sim_name():
+    config = parse_sim_name("sim/latency=heavy_tail,median=0.2,rpm=600")
+
+    assert config.latency == "heavy_tail"
+    assert config.median == 0.2
+    assert config.rpm == 600
+    assert parse_sim_name("sim").latency == "lognormal"
+
+
+@pytest.mark.parametrize("name", ["sim/unknown=1", "sim/latency=uniform", "simx"])
+def test_parse_sim_name_rejects_invalid_options(name):
+    with pytest.raises(ValueError):
+        parse_sim_name(name)
+
+
+def test_exam_answer_is_one_of_the_choices():
+    model = make_model("seed=1")
+
+    response = json.loads(model.generate_response(EXAM_SYSTEM_PROMPT, EXAM_PROMPT))
+
+    assert response["answer"] in ("A", "B")
+    assert response["legal_basis"]
+    assert model.pop_call_info()["output_tokens"] == 80
+
+
+def test_judgment_response_has_no_answer_field():
+    model = make_model("seed=1")
+
+    response = json.loads(model.generate_response("", "<ART_MASK>"))
+
+    assert set(response) == {"legal_basis", "legal_basis_content"}
+
+
+def test_packed_prompt_is_answered_per_id():
+    model = make_model("seed=1")
+    prompt = f"[ID: 3]\n{EXAM_PROMPT}\n[ID: 7]\n{EXAM_PROMPT}"
+
+    response = json.loads(model.generate_response(EXAM_SYSTEM_PROMPT, prompt))
+
+    assert [answer["id"] for answer in response] == ["3", "7"]
+
+
+def test_requests_per_minute_limit_raises_rate_limit_error():
+    model = make_model("rpm=2")
+    model.generate_response(EXAM_SYSTEM_PROMPT, EXAM_PROMPT)
+    model.generate_response(EXAM_SYSTEM_PROMPT, EXAM_PROMPT)
+
+    with pytest.raises(SimulatedAPIError) as error:
+        model.generate_response(EXAM_SYSTEM_PROMPT, EXAM_PROMPT)
+    assert classify_error(error.value) == RATE_LIMIT
+
+
+def test_output_cap_truncates_response():
+    model = make_model("output_tokens=200")
+
+    with model.output_cap(5):
+        model.generate_response(EXAM_SYSTEM_PROMPT, EXAM_PROMPT)
+    info = model.pop_call_info()
+
+    assert info["truncated"] is True
+    assert info["output_tokens"] == 5
@@ -1,7 +1,52 @@
+import threading
 import time
+from datetime import datetime, timedelta
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
 from pathlib import Path
+from typing import Dict, Hashable, List, Optional, Set, Tuple, Union
 from tqdm import tqdm
+from src.benchmark_framework.configs.context_limits import get_context_limit
+from src.benchmark_framework.configs.pricing import ModelPrice, MODEL_PRICES
+from src.benchmark_framework.configs.runner_config import RunnerConfig
 from src.benchmark_framework.managers.base_manager import BaseManager
+from src.benchmark_framework.models.base_model import BaseModel
+from src.benchmark_framework.utils.concurrency import AIMDLimiter
+from src.benchmark_framework.utils.cost_tracker import CostTracker
+from src.benchmark_framework.utils.deadline import DeadlineTracker
+from src.benchmark_framework.utils.http_clients import connection_stats
+from src.benchmark_framework.utils.irt import AdaptiveTester, ItemParameters
+from src.benchmark_framework.utils.output_caps import (
+    OUTPUT_CAP_MARGIN,
+    OUTPUT_CAP_PERCENTILE,
+    derive_output_cap,
+)
+from src.benchmark_framework.utils.errors import (
+    TIMEOUT,
+    classify_error,
+    is_overload_error,
+    is_retryable_error,
+)
+from src.benchmark_framework.utils.scheduling import (
+    estimate_makespan,
+    interleave_by_group,
+    order_longest_first,
+)
+from src.benchmark_framework.utils.telemetry import RunTelemetry
+from src.benchmark_framework.utils.token_counter import TokenCounter
+from src.common.domain.task import Task
+from src.constants import MAX_NEW_TOKENS
+
+# Completed tasks to observe before predicting how many more fit before a deadline
+DEADLINE_FIT_SAMPLE = 5
+# Daily spend across all runs writing to the same results directory
+COST_LEDGER_FILENAME = ".cost_ledger.json"
+# Adaptive testing session (answered items and ability estimates) in the results root
+ADAPTIVE_STATE_FILENAME = "adaptive.json"
+# Token counts and estimator calibration in the results root
+TOKEN_COUNTS_FILENAME = ".token_counts.json"
+TRUNCATION_MARKER = "\n[... tekst skrócony ...]"
+# Call info consumed by cost tracking rather than stored with each result
+USAGE_INFO_KEYS = ("model_name", "input_tokens", "output_tokens", "tier_usage")
 
 
 def rate_limit_wait(requests_per_minute):
@@ -10,43 +55,596 @@ def rate_limit_wait(requests_per_minute):
 
 
 class BenchmarkRunner:
-    def __init__(self, manager: BaseManager, output_path: Path):
+    def __init__(
+        self,
+        manager: BaseManager,
+        output_path: Path,
+        runner_config: Optional[RunnerConfig] = None,
+        price_table: Optional[Dict[str, ModelPrice]] = None,
+        item_parameters: Optional[ItemParameters] = None,
+        fallback_model: Optional[BaseModel] = None,
+    ):
+        if item_parameters is not None and not manager.adaptive:
+            raise ValueError(
+                "Adaptive testing needs a manager storing its results as an "
+                "adaptive track (adaptive=True)."
+            )
         self.manager = manager
+        self.item_parameters = item_parameters
         self.model = manager.model
+        self.fallback_model = fallback_model
         self.output_path = output_path
+        self.runner_config = runner_config or self.model.get_default_runner_config()
+        self.telemetry = RunTelemetry()
+        self.deadline_tracker: Optional[DeadlineTracker] = None
+        if self.runner_config.deadline is not None:
+            self.deadline_tracker = DeadlineTracker(self.runner_config.deadline)
+        self.cost_tracker = CostTracker(
+            price_table if price_table is not None else MODEL_PRICES,
+            max_run_cost=self.runner_config.max_run_cost,
+            max_daily_cost=self.runner_config.max_daily_cost,
+            ledger_path=(
+                output_path / COST_LEDGER_FILENAME
+                if self.runner_config.track_daily_cost
+                else None
+            ),
+        )
+        self.token_counter = TokenCounter(
+            self.model,
+            manager.get_results_root(output_path) / TOKEN_COUNTS_FILENAME,
+        )
+        # Pre-flight decisions for tasks that exceed the context window, keyed by id(task)
+        # Output token cap derived from stored response lengths (see auto_output_cap)
+        self.output_cap: Optional[int] = None
+        # Whether pre-flight counting is active, so reported usage calibrates it
+        self._counting_tokens = False
+        self._truncated_prompts: Dict[int, str] = {}
+        self._routed_tasks: Set[int] = set()
+        self._save_lock = threading.Lock()
 
-    def _run_iterative(self) -> None:
-        runner_config = self.model.get_default_runner_config()
+    def _get_pending_tasks(self) -> List[Task]:
+        pending = [
+            task
+            for task in self.manager.tasks
+            if not self.manager.is_task_processed(task, self.output_path)
+        ]
+        pending = self._preflight(pending)
+        if self.deadline_tracker is not None:
+            # Spread a run that may be cut short evenly across years and exam types
+            pending = interleave_by_group(pending, self.manager.get_task_group)
+        elif self.runner_config.max_concurrency > 1:
+            pending = self._order_longest_first(pending)
+        return pending
 
-        total_processed = 0
-        tasks = self.manager.tasks
+    def _order_longest_first(self, pending: List[Task]) -> List[Task]:
+        workers = self.runner_config.max_concurrency
+        costs = [self.manager.estimate_task_cost(task) for task in pending]
+        file_order_makespan = estimate_makespan(costs, workers)
+        lpt_makespan = estimate_makespan(sorted(costs, reverse=True), workers)
+
+        if file_order_makespan > 0:
+            improvement = 1 - lpt_makespan / file_order_makespan
+            print(
+                f"[INFO] LPT scheduling on {workers} workers: estimated makespan "
+                f"{lpt_makespan:.0f} vs {file_order_makespan:.0f} in file order "
+                f"(prompt characters, {improvement:.1%} shorter)."
+            )
+        return order_longest_first(pending, self.manager.estimate_task_cost)
+
+    def _preflight(self, pending: List[Task]) -> List[Task]:
+        """
+        Count input tokens of every pending task and skip, truncate or route to the
+        fallback model (per `context_policy`) those that exceed the context window.
+        """
+        policy = self.runner_config.context_policy
+        if policy is None:
+            return pending
+        limit = self.runner_config.context_limit or get_context_limit(
+            self.model.model_name
+        )
+        if limit is None:
+            print(
+                f"[WARNING] Unknown context window of {self.model.model_name}; "
+                f"pre-flight token counting is disabled (set --context-limit)."
+            )
+            return pending
 
-        with tqdm(total=len(tasks), desc="Processing tasks", unit="task") as pbar:
-            for task in tasks:
+        self._counting_tokens = True
+        # Leave room for the response
+        budget = limit - MAX_NEW_TOKENS
+        kept = []
+        oversized = 0
+        untruncatable = 0
+        for task in pending:
+            system_prompt = self.manager.get_system_prompt(task)
+            prompt = self.manager.get_prompt(task)
+            tokens = self.token_counter.count(system_prompt, prompt)
+            if tokens <= budget:
+                kept.append(task)
+                continue
 
-                if self.manager.is_task_processed(task, self.output_path):
-                    pbar.update(1)
+            oversized += 1
+            if policy == "truncate":
+                truncated = self._truncate_prompt(system_prompt, prompt, tokens, budget)
+                if truncated is None:
+                    untruncatable += 1
                     continue
+                self._truncated_prompts[id(task)] = truncated
+            elif policy == "fallback":
+                self._routed_tasks.add(id(task))
+            if policy != "skip":
+                kept.append(task)
+        self.token_counter.save()
 
-                if runner_config.requests_per_minute is not None:
-                    rate_limit_wait(runner_config.requests_per_minute)
+        if oversized:
+            print(
+                f"[INFO] Pre-flight: {oversized}/{len(pending)} tasks exceed the "
+                f"{limit}-token context of {self.model.model_name} ({policy})."
+            )
+        if untruncatable:
+            print(
+                f"[WARNING] Pre-flight: {untruncatable} tasks do not fit even with "
+                f"the question truncated away and are skipped."
+            )
+        return kept
+
+    def _truncate_prompt(
+        self, system_prompt: str, prompt: str, tokens: int, budget: int
+    ) -> Optional[str]:
+        """
+        Prompt cut to fit `budget` tokens with the system prompt, or None if
+        nothing of it fits.
+        """
+        keep = len(prompt)
+        truncated = prompt
+        while tokens > budget and keep > 0:
+            # Shrink proportionally, with some slack for uneven token density
+            keep = int(keep * max(budget, 0) / tokens * 0.95)
+            truncated = prompt[:keep] + TRUNCATION_MARKER
+            tokens = self.token_counter.count(system_prompt, truncated)
+        if keep <= 0 or tokens > budget:
+            return None
+        return truncated
+
+    def _deadline_allows_start(self) -> bool:
+        if self.deadline_tracker is None or self.deadline_tracker.can_start():
+            return True
+        print("\n[WARNING] Deadline reached: no new tasks will be started.")
+        return False
+
+    def _budget_allows_start(self) -> bool:
+        if self.cost_tracker.run_budget_exceeded():
+            print(
+                f"\n[WARNING] Run budget reached: ${self.cost_tracker.run_cost:.4f} spent."
+            )
+            return False
+
+        if self.cost_tracker.daily_budget_exceeded():
+            if not self.runner_config.pause_on_budget:
+                print(
+                    f"\n[WARNING] Daily budget reached: ${self.cost_tracker.daily_cost:.4f} spent today."
+                )
+                return False
+
+            tomorrow = datetime.combine(
+                datetime.now().date() + timedelta(days=1), datetime.min.time()
+            )
+            print(f"\n[INFO] Daily budget reached, pausing until {tomorrow}.")
+            time.sleep((tomorrow - datetime.now()).total_seconds())
+        return True
+
+    def _record_usage(
+        self, model: Optional[BaseModel] = None
+    ) -> Tuple[Optional[dict], dict]:
+        """
+        Price the calling thread's last call. Returns its usage (None if the
+        provider reported none) and the remaining call info to store with the result.
+        """
+        return self._price_call_info((model or self.model).pop_call_info())
+
+    def _price_call_info(self, info: dict) -> Tuple[Optional[dict], dict]:
+        call_info = {k: v for k, v in info.items() if k not in USAGE_INFO_KEYS}
+        # Composite models (e.g. cascades) report usage for each underlying model
+        usages = info.get("tier_usage", [info] if "input_tokens" in info else [])
+        if not usages:
+            return None, call_info
+
+        usage = {"input_tokens": 0, "output_tokens": 0, "cost": 0.0}
+        for tier in usages:
+            usage["input_tokens"] += tier["input_tokens"]
+            usage["output_tokens"] += tier["output_tokens"]
+            usage["cost"] += self.cost_tracker.record(
+                tier["model_name"], tier["input_tokens"], tier["output_tokens"]
+            )
+        return usage, call_info
+
+    def _report_deadline_fit(self, completed: int, pending: int) -> None:
+        if self.deadline_tracker is None or completed != DEADLINE_FIT_SAMPLE:
+            return
+        fit = self.deadline_tracker.predict_fit(
+            pending, self.telemetry.concurrency_limit or 1
+        )
+        print(
+            f"\n[INFO] Estimated {fit}/{pending} remaining requests fit before the deadline."
+        )
+
+    def _call_model(
+        self,
+        system_prompt: str,
+        prompt: str,
+        label: str,
+        limiter: Optional[AIMDLimiter] = None,
+        samples: int = 1,
+        model: Optional[BaseModel] = None,
+    ) -> Optional[Tuple[Union[str, List[str]], float, Optional[dict], dict]]:
+        """
+        Send one request with retries. Returns the response (a list of responses
+        when `samples` > 1), its latency, usage and call info, or None if the
+        request failed.
+        """
+        model = model or self.model
+        for attempt in range(self.runner_config.max_retries + 1):
+            start = time.monotonic()
+            try:
+                if samples > 1:
+                    resp = model.generate_responses(system_prompt, prompt, samples)
+                else:
+                    resp = model.generate_response(system_prompt, prompt)
+                break
+            except Exception as e:
+                self._record_usage(model)
+                kind = classify_error(e)
+                self.telemetry.record_error(kind)
+                if limiter is not None and is_overload_error(kind):
+                    limiter.on_overload()
+                if (
+                    is_retryable_error(kind)
+                    and attempt < self.runner_config.max_retries
+                ):
+                    self.telemetry.record_retry()
+                    time.sleep(self.runner_config.retry_backoff * 2**attempt)
+                    continue
+                print(f"\n[ERROR] Failed to process {label}: {e}")
+                return None
+
+        latency = time.monotonic() - start
+        self.telemetry.record_success(latency)
+        if limiter is not None:
+            limiter.on_success(latency)
+        return (resp, latency, *self._record_usage(model))
+
+    def _get_output_cap(self, model: BaseModel) -> Optional[int]:
+        """
+        Output token cap of the run (derived from stored responses) or of the model.
+        """
+        if self.output_cap is not None:
+            return self.output_cap
+        return model.get_max_output_tokens()
 
-                system_prompt = self.manager.get_system_prompt(task)
+    def _call_model_capped(
+        self,
+        system_prompt: str,
+        prompt: str,
+        label: str,
+        limiter: Optional[AIMDLimiter] = None,
+        samples: int = 1,
+        model: Optional[BaseModel] = None,
+        cap_scale: int = 1,
+        response_schema: Optional[dict] = None,
+    ) -> Optional[Tuple[Union[str, List[str]], float, Optional[dict], dict]]:
+        """
+        `_call_model` under the run's output token cap (scaled for packed requests)
+        and the task's response schema. Truncated responses are retried with a
+        doubled cap up to MAX_NEW_TOKENS. Latency covers all attempts; usage is the
+        final attempt's (the request that produced the response), and after retries
+        the call info adds `total_usage` summed over all attempts.
+        """
+        model = model or self.model
+        cap = self._get_output_cap(model)
+        if cap is not None:
+            cap *= cap_scale
 
-                try:
-                    resp = self.model.generate_response(
-                        system_prompt,
-                        task.get_prompt(),
+        total_latency = 0.0
+        total_usage = None
+        attempts = 0
+        while True:
+            with model.output_cap(cap), model.structured_output(response_schema):
+                response = self._call_model(
+                    system_prompt, prompt, label, limiter, samples, model
+                )
+            if response is None:
+                return None
+
+            resp, latency, usage, call_info = response
+            attempts += 1
+            total_latency += latency
+            if usage is not None:
+                total_usage = {
+                    key: value + (total_usage or {}).get(key, 0)
+                    for key, value in usage.items()
+                }
+            if cap is None or not call_info.get("truncated") or cap >= MAX_NEW_TOKENS:
+                break
+            self.telemetry.record_truncation_retry()
+            cap = min(cap * 2, MAX_NEW_TOKENS)
+
+        if cap is not None:
+            call_info = {**call_info, "output_cap": cap}
+        if attempts > 1 and total_usage is not None:
+            call_info = {**call_info, "total_usage": total_usage}
+        return resp, total_latency, usage, call_info
+
+    def _save(
+        self,
+        task: Task,
+        resp: Union[str, List[str]],
+        latency: float,
+        usage: Optional[dict],
+        call_info: Optional[dict] = None,
+        pack_size: int = 1,
+    ) -> Optional[dict]:
+        try:
+            if isinstance(resp, list):
+                result = self.manager.get_sampled_result(task, resp)
+            else:
+                result = self.manager.get_result(task, resp)
+            result.update(call_info or {})
+            result["latency"] = latency
+            if usage is not None:
+                result["usage"] = usage
+            if pack_size > 1:
+                result["pack_size"] = pack_size
+            with self._save_lock:
+                self.manager.save_result(task, result, self.output_path)
+        except Exception as e:
+            print(f"\n[ERROR] Failed to process task {task.id}: {e}")
+            return None
+        return result
+
+    def _score_task(self, task: Task) -> int:
+        """
+        Answer a task by the log-likelihood of each of its answers.
+        """
+        system_prompt, prompt, continuations = self.manager.get_scoring_request(task)
+        start = time.monotonic()
+        try:
+            logprobs = self.model.score_continuations(
+                system_prompt, prompt, list(continuations.values())
+            )
+        except Exception as e:
+            self.telemetry.record_error(classify_error(e))
+            print(f"\n[ERROR] Failed to score task {task.id}: {e}")
+            return 0
+        latency = time.monotonic() - start
+        self.telemetry.record_success(latency)
+
+        scores = dict(zip(continuations, logprobs))
+        usage, call_info = self._price_call_info(self.model.pop_call_info())
+        call_info = {
+            **call_info,
+            "scoring": self.manager.scoring,
+            "choice_logprobs": scores,
+        }
+        response = self.manager.get_scored_response(task, scores)
+        return int(self._save(task, response, latency, usage, call_info) is not None)
+
+    def _process_task(
+        self, task: Task, limiter: Optional[AIMDLimiter] = None, cap_scale: int = 1
+    ) -> int:
+        if self.manager.scoring is not None:
+            return self._score_task(task)
+        system_prompt = self.manager.get_system_prompt(task)
+        prompt = self._truncated_prompts.get(id(task)) or self.manager.get_prompt(task)
+        routed = id(task) in self._routed_tasks
+        response = self._call_model_capped(
+            system_prompt,
+            prompt,
+            f"task {task.id}",
+            limiter,
+            self.runner_config.samples,
+            self.fallback_model if routed else None,
+            cap_scale=cap_scale,
+            response_schema=self.manager.get_response_schema(task),
+        )
+        if response is None:
+            return 0
+
+        resp, latency, usage, call_info = response
+        if id(task) in self._truncated_prompts:
+            call_info = {**call_info, "context_action": "truncated"}
+        elif routed:
+            call_info = {
+                **call_info,
+                "context_action": "routed",
+                "answered_by": self.fallback_model.model_name,
+            }
+        elif (
+            usage is not None
+            and self.runner_config.samples == 1
+            and self._counting_tokens
+            # Usage of composite models sums requests to several underlying models
+            and not self.model.composite
+        ):
+            self.token_counter.calibrate(
+                len(system_prompt) + len(prompt), usage["input_tokens"]
+            )
+        return int(self._save(task, resp, latency, usage, call_info) is not None)
+
+    def _process_pack(
+        self, tasks: List[Task], limiter: Optional[AIMDLimiter] = None
+    ) -> int:
+        """
+        Answer several tasks in one request; tasks missing from the parsed response
+        fall back to single-task requests.
+        """
+        response = self._call_model_capped(
+            self.manager.get_packed_system_prompt(tasks),
+            self.manager.get_packed_prompt(tasks),
+            f"pack of tasks {[task.id for task in tasks]}",
+            limiter,
+            cap_scale=len(tasks),
+        )
+        responses = {}
+        if response is not None:
+            resp, latency, usage, call_info = response
+            responses = self.manager.split_packed_response(tasks, resp)
+            # Attribute the shared request evenly to the questions it answered
+            share = 1 / len(tasks)
+            latency *= share
+            if usage is not None:
+                usage = {key: value * share for key, value in usage.items()}
+            if "total_usage" in call_info:
+                call_info = {
+                    **call_info,
+                    "total_usage": {
+                        key: value * share
+                        for key, value in call_info["total_usage"].items()
+                    },
+                }
+
+        processed = 0
+        fallbacks = [task for task in tasks if str(task.id) not in responses]
+        self.telemetry.record_pack(len(tasks), len(fallbacks))
+        for task in tasks:
+            if str(task.id) in responses:
+                result = self._save(
+                    task,
+                    responses[str(task.id)],
+                    latency,
+                    usage,
+                    call_info,
+                    len(tasks),
+                )
+                processed += result is not None
+        for task in fallbacks:
+            processed += self._process_task(task, limiter)
+        return processed
+
+    def _process_batch(self, tasks: List[Task]) -> int:
+        """
+        Generate responses for several tasks in one batched model call. Tasks routed
+        to the fallback model, truncated responses that can be retried with a
+        higher output cap, responses cut off by the time limit (`timed_out`) and
+        all tasks of a failed batch (e.g. out of memory) go through single-task
+        requests.
+        """
+        singles = [task for task in tasks if id(task) in self._routed_tasks]
+        batch = [task for task in tasks if id(task) not in self._routed_tasks]
+        requests = [
+            (
+                self.manager.get_system_prompt(task),
+                self._truncated_prompts.get(id(task)) or self.manager.get_prompt(task),
+            )
+            for task in batch
+        ]
+
+        cap = self._get_output_cap(self.model)
+        failed: List[Task] = []
+        start = time.monotonic()
+        try:
+            with self.model.output_cap(cap):
+                outputs = (
+                    self.model.generate_batch(
+                        requests,
+                        [self.manager.get_response_schema(task) for task in batch],
                     )
+                    if batch
+                    else []
+                )
+        except Exception as e:
+            self.telemetry.record_error(classify_error(e))
+            print(
+                f"\n[ERROR] Failed to process batch of tasks {[t.id for t in batch]}: "
+                f"{e}; retrying them one by one."
+            )
+            outputs = []
+            failed = batch
+        if outputs:
+            self.telemetry.record_batch(len(outputs))
+        # Attribute the batch's time evenly to its tasks
+        latency = (time.monotonic() - start) / max(len(outputs), 1)
 
-                    result = self.manager.get_result(task, resp)
-                    self.manager.save_result(task, result, self.output_path)
+        processed = 0
+        retries = []
+        for task, (resp, info) in zip(batch, outputs):
+            if info.get("timed_out"):
+                self.telemetry.record_error(TIMEOUT)
+                failed.append(task)
+                continue
+            self.telemetry.record_success(latency)
+            usage, call_info = self._price_call_info(info)
+            if info.get("truncated") and cap is not None and cap < MAX_NEW_TOKENS:
+                self.telemetry.record_truncation_retry()
+                retries.append(task)
+                continue
+            if id(task) in self._truncated_prompts:
+                call_info = {**call_info, "context_action": "truncated"}
+            if cap is not None:
+                call_info = {**call_info, "output_cap": cap}
+            processed += self._save(task, resp, latency, usage, call_info) is not None
+        for task in singles + failed:
+            processed += self._process_task(task)
+        for task in retries:
+            processed += self._process_task(task, cap_scale=2)
+        return processed
 
-                    total_processed += 1
-                except Exception as e:
-                    print(f"\n[ERROR] Failed to process task {task.id}: {e}")
+    def _process_unit(
+        self, unit: List[Task], limiter: Optional[AIMDLimiter] = None
+    ) -> int:
+        if len(unit) == 1:
+            return self._process_task(unit[0], limiter)
+        return self._process_pack(unit, limiter)
 
-                pbar.update(1)
+    def _get_work_units(self, pending: List[Task]) -> List[List[Task]]:
+        """
+        Split pending tasks into requests: single tasks, or packs of up to
+        `pack_size` tasks sharing a pack key when packing is enabled.
+        """
+        pack_size = self.runner_config.pack_size
+        if pack_size <= 1:
+            return [[task] for task in pending]
+
+        open_packs: Dict[Hashable, List[Task]] = {}
+        units = []
+        for task in pending:
+            key = self.manager.get_pack_key(task)
+            pack = open_packs.setdefault(key, [])
+            if not pack:
+                units.append(pack)
+            pack.append(task)
+            if len(pack) == pack_size:
+                open_packs[key] = []
+        return units
+
+    def _run_iterative(self) -> None:
+        runner_config = self.runner_config
+
+        total_processed = 0
+        tasks = self.manager.tasks
+        pending = self._get_pending_tasks()
+        units = self._get_work_units(pending)
+
+        with tqdm(
+            total=len(tasks),
+            initial=len(tasks) - len(pending),
+            desc="Processing tasks",
+            unit="task",
+        ) as pbar:
+            for i, unit in enumerate(units):
+                if not self._deadline_allows_start() or not self._budget_allows_start():
+                    break
+
+                start = time.monotonic()
+                if runner_config.requests_per_minute is not None:
+                    rate_limit_wait(runner_config.requests_per_minute)
+
+                total_processed += self._process_unit(unit)
+
+                if self.deadline_tracker is not None:
+                    self.deadline_tracker.record_completion(time.monotonic() - start)
+                    self._report_deadline_fit(i + 1, len(units) - i - 1)
+
+                pbar.update(len(unit))
 
                 if (
                     runner_config.daily_limit is not None
@@ -57,5 +655,238 @@ class BenchmarkRunner:
                     )
                     break
 
+    def _uses_batching(self) -> bool:
+        return (
+            self.model.supports_batching
+            and (self.model.model_config.batch_size or 1) > 1
+            and self.runner_config.samples == 1
+            and self.runner_config.pack_size == 1
+            and self.manager.scoring is None
+        )
+
+    def _run_batched(self) -> None:
+        """
+        Hand the model chunks of `ModelConfig.chunk_size` pending tasks (at least
+        one batch) for batched generation.
+        """
+        model_config = self.model.model_config
+        chunk_size = max(model_config.chunk_size, model_config.batch_size)
+        tasks = self.manager.tasks
+        pending = self._get_pending_tasks()
+        total_processed = 0
+
+        with tqdm(
+            total=len(tasks),
+            initial=len(tasks) - len(pending),
+            desc="Processing tasks",
+            unit="task",
+        ) as pbar:
+            for start in range(0, len(pending), chunk_size):
+                if not self._deadline_allows_start() or not self._budget_allows_start():
+                    break
+                chunk = pending[start : start + chunk_size]
+                chunk_start = time.monotonic()
+                total_processed += self._process_batch(chunk)
+                if self.deadline_tracker is not None:
+                    # Per-task time, so predictions count tasks as units
+                    elapsed = (time.monotonic() - chunk_start) / len(chunk)
+                    for _ in chunk:
+                        self.deadline_tracker.record_completion(elapsed)
+                pbar.update(len(chunk))
+
+                daily_limit = self.runner_config.daily_limit
+                if daily_limit is not None and total_processed >= daily_limit:
+                    print(
+                        f"\n[WARNING] Daily limit reached: {total_processed}/{len(tasks)} tasks processed."
+                    )
+                    break
+
+    def _run_concurrent(self) -> None:
+        runner_config = self.runner_config
+        limiter = AIMDLimiter(
+            runner_config.min_concurrency, runner_config.max_concurrency
+        )
+        self.telemetry.record_concurrency_limit(limiter.limit)
+
+        total_processed = 0
+        total_finished = 0
+        tasks = self.manager.tasks
+        pending = self._get_pending_tasks()
+        units = self._get_work_units(pending)
+
+        def run_unit(unit: List[Task]) -> int:
+            start = time.monotonic()
+            try:
+                return self._process_unit(unit, limiter)
+            finally:
+                limiter.release()
+                self.telemetry.record_concurrency_limit(limiter.limit)
+                if self.deadline_tracker is not None:
+                    self.deadline_tracker.record_completion(time.monotonic() - start)
+
+        with tqdm(
+            total=len(tasks),
+            initial=len(tasks) - len(pending),
+            desc="Processing tasks",
+            unit="task",
+        ) as pbar, ThreadPoolExecutor(
+            max_workers=runner_config.max_concurrency
+        ) as executor:
+            in_flight = {}
+
+            def collect(return_when=ALL_COMPLETED, timeout=None) -> None:
+                nonlocal total_processed, total_finished
+                done, _ = wait(in_flight, timeout=timeout, return_when=return_when)
+                for future in done:
+                    unit = in_flight.pop(future)
+                    total_processed += future.result()
+                    total_finished += 1
+                    pbar.update(len(unit))
+                    self._report_deadline_fit(
+                        total_finished, len(units) - total_finished
+                    )
+                pbar.set_postfix(limit=limiter.limit)
+
+            def in_flight_tasks() -> int:
+                return sum(len(unit) for unit in in_flight.values())
+
+            for unit in units:
+                if runner_config.daily_limit is not None:
+                    while (
+                        in_flight
+                        and total_processed + in_flight_tasks()
+                        >= runner_config.daily_limit
+                    ):
+                        collect(FIRST_COMPLETED)
+                    if total_processed >= runner_config.daily_limit:
+                        print(
+                            f"\n[WARNING] Daily limit reached: {total_processed}/{len(tasks)} tasks processed."
+                        )
+                        break
+
+                if runner_config.requests_per_minute is not None:
+                    rate_limit_wait(runner_config.requests_per_minute)
+
+                limiter.acquire()
+                if not self._deadline_allows_start() or not self._budget_allows_start():
+                    limiter.release()
+                    break
+                in_flight[executor.submit(run_unit, unit)] = unit
+                collect(timeout=0)
+
+            collect()
+
+    def _run_adaptive(self) -> None:
+        """
+        Ask the most informative calibrated question next until the ability
+        estimate is precise enough (see AdaptiveTester).
+        """
+        runner_config = self.runner_config
+        tester = AdaptiveTester(
+            self.item_parameters,
+            runner_config.adaptive_target_se,
+            runner_config.adaptive_max_items,
+        )
+        state_path = (
+            self.manager.get_results_root(self.output_path) / ADAPTIVE_STATE_FILENAME
+        )
+        if state_path.exists():
+            tester.load(state_path)
+
+        tasks = {self.manager.get_item_key(task): task for task in self.manager.tasks}
+        available = [
+            key
+            for key, task in tasks.items()
+            if not self.manager.is_task_processed(task, self.output_path)
+        ]
+        print(
+            f"[INFO] Adaptive testing on {len(available)} calibrated candidates "
+            f"(target standard error {tester.target_se})."
+        )
+
+        with tqdm(desc="Adaptive testing", unit="task") as pbar:
+            while not tester.done:
+                key = tester.next_item(available)
+                if key is None:
+                    print("\n[WARNING] No calibrated questions left to ask.")
+                    break
+                if not self._deadline_allows_start() or not self._budget_allows_start():
+                    break
+                if runner_config.requests_per_minute is not None:
+                    rate_limit_wait(runner_config.requests_per_minute)
+
+                available.remove(key)
+                task = tasks[key]
+                response = self._call_model_capped(
+                    self.manager.get_system_prompt(task),
+                    self.manager.get_prompt(task),
+                    f"task {task.id}",
+                    response_schema=self.manager.get_response_schema(task),
+                )
+                result = self._save(task, *response) if response is not None else None
+                if result is None:
+                    continue
+
+                tester.record(key, self.manager.score_result(result))
+                tester.save(state_path)
+                pbar.update(1)
+                pbar.set_postfix(theta=f"{tester.theta:.2f}", se=f"{tester.se:.2f}")
+
+        summary = tester.summary()
+        print(
+            f"\n=== Adaptive estimate ===\n"
+            f"  Ability: {summary['theta']:.3f} (standard error {summary['se']:.3f})\n"
+            f"  Expected accuracy on all {summary['items_total']} calibrated questions: "
+            f"{summary['expected_accuracy']:.4f}\n"
+            f"  Questions asked: {summary['items_answered']}\n"
+            f"Saved adaptive session to {state_path}"
+        )
+
+    def _derive_output_cap(self) -> None:
+        results_root = self.manager.get_results_root(self.output_path)
+        self.output_cap = derive_output_cap(results_root)
+        if self.output_cap is None:
+            print(
+                f"[INFO] Too few stored responses in {results_root} to derive an "
+                f"output cap; using the model default."
+            )
+        else:
+            print(
+                f"[INFO] Output cap: {self.output_cap} tokens "
+                f"(p{OUTPUT_CAP_PERCENTILE} of stored response lengths "
+                f"+ {OUTPUT_CAP_MARGIN - 1:.0%})."
+            )
+
     def run(self) -> None:
-        return self._run_iterative()
+        if self.runner_config.auto_output_cap:
+            self._derive_output_cap()
+        start = time.monotonic()
+        if self.item_parameters is not None:
+            self._run_adaptive()
+        elif self._uses_batching():
+            self._run_batched()
+        elif self.runner_config.max_concurrency > 1:
+            self._run_concurrent()
+        else:
+            self._run_iterative()
+        self.telemetry.wall_time = time.monotonic() - start
+
+        if self.deadline_tracker is not None:
+            self.manager.save_coverage(self.output_path)
+        if self._counting_tokens:
+            self.token_counter.save()
+        self.telemetry.print_summary()
+        if connection_stats.requests:
+            connection_stats.print_summary()
+        self._save_costs()
+
+    def _save_costs(self) -> None:
+        if not self.cost_tracker.breakdown()["models"]:
+            return
+        self.cost_tracker.print_breakdown()
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+        costs_path = (
+            self.manager.get_results_root(self.output_path) / f"costs_{timestamp}.json"
+        )
+        self.cost_tracker.save(costs_path)
+        print(f"Saved cost breakdown to {costs_path}")
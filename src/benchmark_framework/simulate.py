@@ -0,0 +1,109 @@
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import List, Optional
+
+import typer
+
+from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.getters.get_manager import get_manager
+from src.benchmark_framework.models.sim_model import SIM_PREFIX, SimModel
+from src.benchmark_framework.runner import BenchmarkRunner
+
+# Sequential or adaptive concurrency, each with and without packing
+EXECUTION_MODES = ("iterative", "concurrent", "packed", "concurrent-packed")
+
+app = typer.Typer(
+    help="Benchmark BenchmarkRunner execution modes against a simulated model."
+)
+
+
+@app.command()
+def run(
+    task_type: str = typer.Argument(..., help="Dataset name (e.g., exams)"),
+    input_path: Path = typer.Argument(
+        "data/tasks", help="Path to the input tasks directory"
+    ),
+    model_name: str = typer.Option(
+        f"{SIM_PREFIX}/median=0.2",
+        "--model",
+        "-m",
+        help="Simulated model, e.g. sim/latency=heavy_tail,median=0.2,rpm=600,rate_limit_errors=0.02",
+    ),
+    modes: Optional[List[str]] = typer.Option(
+        None,
+        "--mode",
+        help=f"Execution mode to benchmark (repeatable): {', '.join(EXECUTION_MODES)}. Defaults to all.",
+    ),
+    limit: Optional[int] = typer.Option(
+        100, "--limit", help="Number of tasks answered in each mode."
+    ),
+    max_concurrency: int = typer.Option(
+        16, "--max-concurrency", help="Concurrency ceiling of the concurrent modes."
+    ),
+    pack_size: int = typer.Option(
+        5, "--pack-size", help="Questions per request in the packed modes."
+    ),
+    retry_backoff: float = typer.Option(
+        0.1, "--retry-backoff", help="Base retry backoff in seconds."
+    ),
+    year: Optional[int] = typer.Option(None, "--year", "-y"),
+):
+    for mode in modes or EXECUTION_MODES:
+        if mode not in EXECUTION_MODES:
+            raise typer.BadParameter(
+                f"--mode must be one of: {', '.join(EXECUTION_MODES)}."
+            )
+
+    report = []
+    for mode in modes or EXECUTION_MODES:
+        # A fresh model per mode so rate limit windows do not carry over
+        model = SimModel(model_name, ModelConfig())
+        manager = get_manager(task_type, model, input_path, year)
+        manager.tasks = manager.tasks[:limit]
+        if "packed" in mode and not manager.supports_packing:
+            typer.echo(f"Skipping {mode}: task type '{task_type}' cannot be packed.")
+            continue
+
+        runner_config = replace(
+            model.get_default_runner_config(),
+            max_concurrency=max_concurrency if "concurrent" in mode else 1,
+            pack_size=pack_size if "packed" in mode else 1,
+            retry_backoff=retry_backoff,
+        )
+        with tempfile.TemporaryDirectory() as output_dir:
+            runner = BenchmarkRunner(manager, Path(output_dir), runner_config)
+            start = time.monotonic()
+            runner.run()
+            makespan = time.monotonic() - start
+            completed = sum(
+                manager.is_task_processed(task, Path(output_dir))
+                for task in manager.tasks
+            )
+        summary = runner.telemetry.summary()
+        report.append(
+            (
+                mode,
+                completed,
+                makespan,
+                completed / makespan if makespan else 0.0,
+                summary["requests"],
+                sum(summary["errors"].values()),
+            )
+        )
+
+    typer.echo(f"\n=== Runner benchmark: {model_name} ===")
+    typer.echo(
+        f"  {'mode':<18} {'tasks':>6} {'makespan':>10} {'tasks/s':>8} "
+        f"{'requests':>9} {'errors':>7}"
+    )
+    for mode, completed, makespan, throughput, requests, errors in report:
+        typer.echo(
+            f"  {mode:<18} {completed:>6} {makespan:>9.2f}s {throughput:>8.2f} "
+            f"{requests:>9} {errors:>7}"
+        )
+
+
+if __name__ == "__main__":
+    app()
@@ -1,8 +1,50 @@
+import re
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from collections import defaultdict
 
 from src.common.file_operations import FileOperations
+from src.benchmark_framework.utils.coverage import load_coverage
+
+# Per-question rates averaged over files when aggregating
+RATE_KEYS = ("agreement_rate", "escalation_rate")
+# Judgment results: all.jsonl for whole justifications, all_window<N>.jsonl per window
+JUDGMENT_RESULTS_PATTERN = re.compile(r"all(?:_window(\d+))?\.jsonl")
+
+
+def is_windowed_results(file_path: Path) -> bool:
+    match = JUDGMENT_RESULTS_PATTERN.fullmatch(file_path.name)
+    return match is not None and match.group(1) is not None
+
+
+def _get_efficiency_values(data: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Per-question token usage, cost and latency recorded by the runner, if present.
+    """
+    values = {}
+    usage = data.get("usage") or {}
+    for key in ("input_tokens", "output_tokens"):
+        if key in usage:
+            values[key] = usage[key]
+    # Truncation retries are paid for too
+    cost = (data.get("total_usage") or usage).get("cost")
+    if cost is not None:
+        values["cost"] = cost
+    if data.get("latency") is not None:
+        values["latency"] = data["latency"]
+    return values
+
+
+def _get_rate_values(data: Dict[str, Any]) -> Dict[str, float]:
+    """
+    Per-question rates of optional run modes (self-consistency, cascades), if present.
+    """
+    values = {}
+    if "agreement_rate" in data:
+        values["agreement_rate"] = data["agreement_rate"]
+    if "cascade_tier" in data:
+        values["escalation_rate"] = float(data["cascade_tier"] == "large")
+    return values
 
 
 def calculate_stats(file_path: Path) -> Dict[str, Any]:
@@ -21,6 +63,10 @@ def calculate_stats(file_path: Path) -> Dict[str, Any]:
     correct_legal_basis = 0
     malformed_responses_count = 0
     text_metrics_sum = defaultdict(float)
+    efficiency_sum = defaultdict(float)
+    efficiency_count = defaultdict(int)
+    rate_sum = defaultdict(float)
+    rate_count = defaultdict(int)
 
     for data in dataset:
         accuracy_metrics = data.get("accuracy_metrics", {})
@@ -42,6 +88,14 @@ def calculate_stats(file_path: Path) -> Dict[str, Any]:
             assert isinstance(metric_value, (int, float))
             text_metrics_sum[metric_name] += metric_value
 
+        for metric_name, metric_value in _get_efficiency_values(data).items():
+            efficiency_sum[metric_name] += metric_value
+            efficiency_count[metric_name] += 1
+
+        for rate_name, rate_value in _get_rate_values(data).items():
+            rate_sum[rate_name] += rate_value
+            rate_count[rate_name] += 1
+
     accuracy = correct_count / total_count
     legal_basis = correct_legal_basis / total_count
     malformed_response_rate = malformed_responses_count / total_count
@@ -51,12 +105,26 @@ def calculate_stats(file_path: Path) -> Dict[str, Any]:
         for metric_name, total_sum in text_metrics_sum.items()
     }
 
-    return {
+    stats = {
         "accuracy_metrics": {"answer": accuracy, "legal_basis": legal_basis},
         "text_metrics": avg_text_metrics,
         "malformed_response_rate": malformed_response_rate,
         "questions_count": total_count,
     }
+    if efficiency_sum:
+        stats["efficiency_metrics"] = {
+            metric_name: total_sum / efficiency_count[metric_name]
+            for metric_name, total_sum in efficiency_sum.items()
+        }
+    for rate_name, total_sum in rate_sum.items():
+        stats[rate_name] = total_sum / rate_count[rate_name]
+
+    coverage = load_coverage(file_path)
+    if coverage is not None:
+        stats["tasks_total"] = coverage["tasks_total"]
+        stats["coverage"] = total_count / coverage["tasks_total"]
+
+    return stats
 
 
 def aggregate_results(results_list: List[Dict[str, Any]]) -> Dict[str, Any]:
@@ -70,7 +138,13 @@ def aggregate_results(results_list: List[Dict[str, Any]]) -> Dict[str, Any]:
     correct_legal_basis_sum = 0.0
     malformed_sum = 0.0
     total_questions_count = 0
+    total_tasks_count = 0
+    has_coverage = False
     text_metrics_sums = defaultdict(float)
+    efficiency_sums = defaultdict(float)
+    efficiency_counts = defaultdict(int)
+    rate_sums = defaultdict(float)
+    rate_counts = defaultdict(int)
 
     for res in results_list:
         questions_count = res.get("questions_count", 0)
@@ -78,6 +152,8 @@ def aggregate_results(results_list: List[Dict[str, Any]]) -> Dict[str, Any]:
             continue
 
         total_questions_count += questions_count
+        total_tasks_count += res.get("tasks_total", questions_count)
+        has_coverage = has_coverage or "coverage" in res
         correct_answers_sum += (
             res["accuracy_metrics"].get("answer", 0.0) * questions_count
         )
@@ -89,6 +165,15 @@ def aggregate_results(results_list: List[Dict[str, Any]]) -> Dict[str, Any]:
         for k, v in res.get("text_metrics", {}).items():
             text_metrics_sums[k] += v * questions_count
 
+        for k, v in res.get("efficiency_metrics", {}).items():
+            efficiency_sums[k] += v * questions_count
+            efficiency_counts[k] += questions_count
+
+        for k in RATE_KEYS:
+            if k in res:
+                rate_sums[k] += res[k] * questions_count
+                rate_counts[k] += questions_count
+
     if total_questions_count == 0:
         raise ValueError("Total questions count is zero; cannot aggregate results.")
 
@@ -101,11 +186,23 @@ def aggregate_results(results_list: List[Dict[str, Any]]) -> Dict[str, Any]:
     for k, total_val in text_metrics_sums.items():
         avg_text_metrics[k] = total_val / total_questions_count
 
-    return {
+    aggregated = {
         "accuracy_metrics": avg_accuracy,
         "text_metrics": avg_text_metrics,
         "malformed_response_rate": avg_malformed,
     }
+    if efficiency_sums:
+        aggregated["efficiency_metrics"] = {
+            k: total_val / efficiency_counts[k]
+            for k, total_val in efficiency_sums.items()
+        }
+    for k, total_val in rate_sums.items():
+        aggregated[k] = total_val / rate_counts[k]
+    if has_coverage:
+        aggregated["tasks_total"] = total_tasks_count
+        aggregated["coverage"] = total_questions_count / total_tasks_count
+
+    return aggregated
 
 
 def collect_yearly_stats(base_path: Path) -> Dict[str, Dict[str, Any]]:
@@ -150,7 +247,12 @@ def calculate_stats_for_path(input_path: Path) -> Dict[str, Any]:
     target_files: List[Path] = []
 
     if input_path.is_dir():
-        target_files = list(input_path.rglob("*.jsonl"))
+        # Windowed judgment runs are compared with `stats windows`, not merged
+        target_files = [
+            file
+            for file in input_path.rglob("*.jsonl")
+            if not is_windowed_results(file)
+        ]
         if not target_files:
             raise ValueError(f"No .jsonl files found in directory '{input_path}'.")
         print(f"Found {len(target_files)} files. Processing...")
@@ -213,3 +315,34 @@ def get_model_aggregated_stats(input_path: Path) -> Dict[str, Any]:
             print(f"Warning: Failed to process model '{model_name}'. Error: {e}")
 
     return all_model_stats
+
+
+def calculate_window_stats(judgments_dir: Path) -> Dict[Optional[int], Dict[str, Any]]:
+    """
+    Statistics of judgment runs with different context windows, keyed by window
+    size in tokens (None for the whole justification).
+    """
+    if not judgments_dir.is_dir():
+        raise ValueError(f"Path '{judgments_dir}' is not a directory.")
+
+    window_stats = {}
+    for file in judgments_dir.glob("all*.jsonl"):
+        match = JUDGMENT_RESULTS_PATTERN.fullmatch(file.name)
+        if not match:
+            continue
+        window = int(match.group(1)) if match.group(1) else None
+        try:
+            window_stats[window] = calculate_stats(file)
+        except Exception as e:
+            print(f"Warning: Failed to process {file}. Error: {e}")
+
+    if not window_stats:
+        raise ValueError(f"No judgment results found in '{judgments_dir}'.")
+
+    # Smallest window first, whole justification last
+    return dict(
+        sorted(
+            window_stats.items(),
+            key=lambda item: float("inf") if item[0] is None else item[0],
+        )
+    )
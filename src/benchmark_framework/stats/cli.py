@@ -7,11 +7,16 @@ from src.benchmark_framework.stats.calculate_stats import (
     calculate_exam_stats_for_all_models,
 )
 from src.benchmark_framework.stats.calculate_stats import get_model_aggregated_stats
+from src.benchmark_framework.stats.calculate_stats import calculate_window_stats
 from src.benchmark_framework.stats.plotting import (
     plot_metric_over_years,
     plot_metric_for_model_parameters,
 )
-from src.benchmark_framework.stats.utils import print_stats
+from src.benchmark_framework.stats.utils import (
+    print_comparison,
+    print_stats,
+    print_window_report,
+)
 
 app = typer.Typer(
     help="Calculate statistics and create plots from benchmark results.",
@@ -40,6 +45,56 @@ def stats(
         raise typer.Exit(1)
 
 
+@app.command()
+def compare(
+    baseline_path: Annotated[
+        Path,
+        typer.Argument(
+            help="Results of the reference run (file or directory).", exists=True
+        ),
+    ],
+    candidate_path: Annotated[
+        Path,
+        typer.Argument(
+            help="Results of the run to compare (file or directory).", exists=True
+        ),
+    ],
+):
+    """
+    Compare accuracy against token usage and latency per question for two runs
+    (e.g. single-question vs packed requests).
+    """
+    try:
+        baseline = calculate_stats_for_path(baseline_path)
+        candidate = calculate_stats_for_path(candidate_path)
+        print_comparison(baseline, candidate)
+    except Exception as e:
+        typer.secho(f"Error: {e}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(1)
+
+
+@app.command()
+def windows(
+    judgments_dir: Annotated[
+        Path,
+        typer.Argument(
+            help="Judgments results directory of one model (e.g. data/results_with_metrics/<model>/judgments).",
+            exists=True,
+            dir_okay=True,
+            file_okay=False,
+        ),
+    ],
+):
+    """
+    Compare accuracy, input tokens and latency across judgment context window sizes.
+    """
+    try:
+        print_window_report(calculate_window_stats(judgments_dir))
+    except Exception as e:
+        typer.secho(f"Error: {e}", fg=typer.colors.RED, err=True)
+        raise typer.Exit(1)
+
+
 @app.command()
 def plot(
     input_path: Annotated[
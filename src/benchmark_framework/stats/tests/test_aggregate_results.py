@@ -135,3 +135,42 @@ class TestAggregateResults:
         assert result["text_metrics"]["rouge_1"] == pytest.approx(0.6)
         # rouge_2: (0 * 10 + 0.5 * 10) / 20 = 0.25 (only in second result)
         assert result["text_metrics"]["rouge_2"] == pytest.approx(0.25)
+
+    def test_aggregates_coverage_over_scheduled_tasks(self):
+        """Test that coverage is aggregated over all scheduled tasks."""
+        results = [
+            {
+                "accuracy_metrics": {"answer": 1.0, "legal_basis": 1.0},
+                "text_metrics": {},
+                "malformed_response_rate": 0.0,
+                "questions_count": 10,
+                "tasks_total": 20,
+                "coverage": 0.5,
+            },
+            {
+                "accuracy_metrics": {"answer": 0.0, "legal_basis": 0.0},
+                "text_metrics": {},
+                "malformed_response_rate": 0.0,
+                "questions_count": 10,  # Complete file without sidecar
+            },
+        ]
+
+        result = aggregate_results(results)
+
+        assert result["tasks_total"] == 30
+        assert result["coverage"] == pytest.approx(20 / 30)
+
+    def test_no_coverage_when_no_result_has_it(self):
+        """Test that coverage is omitted for complete runs."""
+        results = [
+            {
+                "accuracy_metrics": {"answer": 1.0, "legal_basis": 1.0},
+                "text_metrics": {},
+                "malformed_response_rate": 0.0,
+                "questions_count": 10,
+            }
+        ]
+
+        result = aggregate_results(results)
+
+        assert "coverage" not in result
@@ -1,3 +1,5 @@
+import json
+
 import pytest
 
 from src.benchmark_framework.stats.calculate_stats import calculate_stats
@@ -182,3 +184,139 @@ class TestCalculateStats:
 
         assert result["accuracy_metrics"]["answer"] == 0.0
         assert result["accuracy_metrics"]["legal_basis"] == 0.0
+
+    def test_coverage_reported_from_sidecar(self, tmp_path):
+        """Test that a coverage sidecar adds coverage next to accuracy."""
+        entries = [
+            {
+                "accuracy_metrics": {"answer": 1.0, "legal_basis": 1.0},
+                "model_legal_basis_content": "content",
+                "model_legal_basis": "basis",
+                "model_answer": "answer",
+            },
+        ]
+        file_path = create_temp_jsonl(entries, tmp_path, "notarialny.jsonl")
+        (tmp_path / "notarialny.coverage.json").write_text(
+            json.dumps({"tasks_total": 4, "tasks_completed": 1, "partial": True})
+        )
+
+        result = calculate_stats(file_path)
+
+        assert result["coverage"] == pytest.approx(0.25)
+        assert result["tasks_total"] == 4
+
+    def test_no_coverage_without_sidecar(self, tmp_path):
+        """Test that complete runs without a sidecar report no coverage."""
+        entries = [
+            {
+                "accuracy_metrics": {"answer": 1.0, "legal_basis": 1.0},
+                "model_legal_basis_content": "content",
+                "model_legal_basis": "basis",
+                "model_answer": "answer",
+            },
+        ]
+        file_path = create_temp_jsonl(entries, tmp_path)
+
+        result = calculate_stats(file_path)
+
+        assert "coverage" not in result
+
+    def test_efficiency_metrics_from_usage_and_latency(self, tmp_path):
+        """Test that token usage and latency are averaged per question."""
+        entries = [
+            {
+                "accuracy_metrics": {"answer": 1.0, "legal_basis": 1.0},
+                "model_answer": "A",
+                "usage": {"input_tokens": 100, "output_tokens": 20},
+                "latency": 1.0,
+            },
+            {
+                "accuracy_metrics": {"answer": 0.0, "legal_basis": 1.0},
+                "model_answer": "B",
+                "usage": {"input_tokens": 300, "output_tokens": 40},
+                "latency": 3.0,
+            },
+        ]
+        file_path = create_temp_jsonl(entries, tmp_path)
+
+        result = calculate_stats(file_path)
+
+        assert result["efficiency_metrics"] == pytest.approx(
+            {"input_tokens": 200.0, "output_tokens": 30.0, "latency": 2.0}
+        )
+
+    def test_cost_includes_truncation_retries(self, tmp_path):
+        """Test that cost comes from total_usage while tokens stay per final request."""
+        entries = [
+            {
+                "accuracy_metrics": {"answer": 1.0, "legal_basis": 1.0},
+                "model_answer": "A",
+                "usage": {"input_tokens": 100, "output_tokens": 80, "cost": 0.01},
+                "total_usage": {
+                    "input_tokens": 300,
+                    "output_tokens": 140,
+                    "cost": 0.03,
+                },
+            },
+        ]
+        file_path = create_temp_jsonl(entries, tmp_path)
+
+        result = calculate_stats(file_path)
+
+        assert result["efficiency_metrics"] == pytest.approx(
+            {"input_tokens": 100.0, "output_tokens": 80.0, "cost": 0.03}
+        )
+
+    def test_no_efficiency_metrics_without_usage(self, tmp_path):
+        """Test that results without usage or latency report no efficiency metrics."""
+        entries = [
+            {
+                "accuracy_metrics": {"answer": 1.0, "legal_basis": 1.0},
+                "model_answer": "A",
+            },
+        ]
+        file_path = create_temp_jsonl(entries, tmp_path)
+
+        result = calculate_stats(file_path)
+
+        assert "efficiency_metrics" not in result
+
+    def test_agreement_rate_averaged(self, tmp_path):
+        """Test that self-consistency agreement is averaged per question."""
+        entries = [
+            {
+                "accuracy_metrics": {"answer": 1.0, "legal_basis": 1.0},
+                "model_answer": "A",
+                "agreement_rate": 1.0,
+            },
+            {
+                "accuracy_metrics": {"answer": 0.0, "legal_basis": 0.0},
+                "model_answer": "B",
+                "agreement_rate": 0.6,
+            },
+        ]
+        file_path = create_temp_jsonl(entries, tmp_path)
+
+        result = calculate_stats(file_path)
+
+        assert result["agreement_rate"] == pytest.approx(0.8)
+
+    def test_escalation_rate_from_cascade_tier(self, tmp_path):
+        """Test that the share of questions answered by the large cascade tier is reported."""
+        entries = [
+            {
+                "accuracy_metrics": {"answer": 1.0, "legal_basis": 1.0},
+                "model_answer": "A",
+                "cascade_tier": "small",
+            },
+            {
+                "accuracy_metrics": {"answer": 1.0, "legal_basis": 1.0},
+                "model_answer": "B",
+                "cascade_tier": "large",
+            },
+        ]
+        file_path = create_temp_jsonl(entries, tmp_path)
+
+        result = calculate_stats(file_path)
+
+        assert result["escalation_rate"] == pytest.approx(0.5)
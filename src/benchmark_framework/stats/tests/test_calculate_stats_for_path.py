@@ -119,3 +119,15 @@ class TestCalculateStatsForPath:
 
         with pytest.raises(ValueError, match="No valid results computed"):
             calculate_stats_for_path(tmp_path)
+
+    def test_windowed_judgment_runs_are_not_merged(self, tmp_path):
+        """Test that all_window<N>.jsonl files stay out of the full-context score."""
+        full = [{"accuracy_metrics": {"answer": 1.0, "legal_basis": 1.0}}]
+        windowed = [{"accuracy_metrics": {"answer": 0.0, "legal_basis": 0.0}}]
+        create_temp_jsonl(full, tmp_path, "all.jsonl")
+        create_temp_jsonl(windowed, tmp_path, "all_window64.jsonl")
+
+        result = calculate_stats_for_path(tmp_path)
+
+        assert result["accuracy_metrics"]["legal_basis"] == 1.0
+        assert result["questions_count"] == 1
@@ -0,0 +1,34 @@
+import pytest
+
+from src.benchmark_framework.stats.calculate_stats import calculate_window_stats
+from src.benchmark_framework.stats.tests.conftest import create_temp_jsonl
+
+
+def judgment_entry(legal_basis: float, input_tokens: int) -> dict:
+    return {
+        "accuracy_metrics": {"legal_basis": legal_basis},
+        "text_metrics": {"rouge_n": legal_basis},
+        "usage": {"input_tokens": input_tokens, "output_tokens": 10},
+    }
+
+
+class TestCalculateWindowStats:
+    """Tests for the calculate_window_stats function."""
+
+    def test_groups_files_by_window_size(self, tmp_path):
+        """Test that each window file is reported, smallest window first and full text last."""
+        create_temp_jsonl([judgment_entry(1.0, 9000)], tmp_path, "all.jsonl")
+        create_temp_jsonl([judgment_entry(0.0, 500)], tmp_path, "all_window64.jsonl")
+        create_temp_jsonl([judgment_entry(1.0, 1200)], tmp_path, "all_window256.jsonl")
+        create_temp_jsonl([judgment_entry(1.0, 1)], tmp_path, "other.jsonl")
+
+        result = calculate_window_stats(tmp_path)
+
+        assert list(result) == [64, 256, None]
+        assert result[64]["accuracy_metrics"]["legal_basis"] == 0.0
+        assert result[256]["efficiency_metrics"]["input_tokens"] == pytest.approx(1200)
+
+    def test_no_results_raises_error(self, tmp_path):
+        """Test that a directory without judgment results raises ValueError."""
+        with pytest.raises(ValueError):
+            calculate_window_stats(tmp_path)
@@ -1,4 +1,4 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 
 
 def print_stats(stats: Dict[str, Any]):
@@ -14,4 +14,79 @@ def print_stats(stats: Dict[str, Any]):
     for metric_name, metric_value in sorted(stats["text_metrics"].items()):
         print(f"  {metric_name}: {metric_value:.4f}")
 
+    if "efficiency_metrics" in stats:
+        print("\nEfficiency Metrics (per question):")
+        for metric_name, metric_value in sorted(stats["efficiency_metrics"].items()):
+            print(f"  {metric_name}: {metric_value:.4f}")
+
     print(f"\nMalformed Response Rate: {stats['malformed_response_rate']:.4f}")
+
+    if "agreement_rate" in stats:
+        print(f"Self-consistency agreement: {stats['agreement_rate']:.4f}")
+    if "escalation_rate" in stats:
+        print(f"Cascade escalation rate: {stats['escalation_rate']:.4f}")
+
+    if "coverage" in stats:
+        print(
+            f"Coverage: {stats['coverage']:.4f} ({stats['tasks_total']} tasks scheduled)"
+        )
+
+
+def _flatten_stats(stats: Dict[str, Any]) -> Dict[str, float]:
+    flat = {}
+    for group in ("accuracy_metrics", "text_metrics", "efficiency_metrics"):
+        for metric_name, metric_value in stats.get(group, {}).items():
+            flat[f"{group}.{metric_name}"] = metric_value
+    flat["malformed_response_rate"] = stats["malformed_response_rate"]
+    for key in ("agreement_rate", "escalation_rate", "coverage"):
+        if key in stats:
+            flat[key] = stats[key]
+    return flat
+
+
+def print_comparison(
+    baseline: Dict[str, Any],
+    candidate: Dict[str, Any],
+    baseline_label: str = "baseline",
+    candidate_label: str = "candidate",
+):
+    """
+    Print two statistics dictionaries side by side with the relative change.
+    """
+    baseline_flat = _flatten_stats(baseline)
+    candidate_flat = _flatten_stats(candidate)
+
+    print("\n=== Comparison ===")
+    print(f"  {'metric':<40} {baseline_label:>12} {candidate_label:>12} {'change':>9}")
+    for metric_name in sorted(baseline_flat.keys() | candidate_flat.keys()):
+        base = baseline_flat.get(metric_name)
+        cand = candidate_flat.get(metric_name)
+        base_str = f"{base:.4f}" if base is not None else "-"
+        cand_str = f"{cand:.4f}" if cand is not None else "-"
+        change = f"{(cand - base) / base:+.1%}" if base and cand is not None else "-"
+        print(f"  {metric_name:<40} {base_str:>12} {cand_str:>12} {change:>9}")
+
+
+def print_window_report(window_stats: Dict[Optional[int], Dict[str, Any]]):
+    """
+    Print accuracy against input tokens and latency for each context window size.
+    """
+    text_metric_names = sorted(
+        {name for stats in window_stats.values() for name in stats["text_metrics"]}
+    )
+    columns = ["legal_basis", *text_metric_names, "input_tokens", "latency"]
+
+    print("\n=== Context window report ===")
+    print(f"  {'window':>8} " + " ".join(f"{column:>14}" for column in columns))
+    for window, stats in window_stats.items():
+        values = {
+            "legal_basis": stats["accuracy_metrics"]["legal_basis"],
+            **stats["text_metrics"],
+            **stats.get("efficiency_metrics", {}),
+        }
+        cells = [
+            f"{values[column]:>14.4f}" if column in values else f"{'-':>14}"
+            for column in columns
+        ]
+        label = "full" if window is None else str(window)
+        print(f"  {label:>8} " + " ".join(cells))
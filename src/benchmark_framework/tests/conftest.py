@@ -0,0 +1,33 @@
+import json
+from pathlib import Path
+
+import pytest
+
+EXAM_TYPES = ("notarialny", "radcowski")
+QUESTIONS_PER_EXAM = 6
+
+
+def write_exam_tasks(tasks_path: Path, year: int = 2024) -> Path:
+    """Write a small exam set (a few questions of each exam type) under tasks_path."""
+    for exam_type in EXAM_TYPES:
+        file_path = tasks_path / "exams" / "sample" / str(year) / f"{exam_type}.jsonl"
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(file_path, "w", encoding="utf-8") as f:
+            for i in range(QUESTIONS_PER_EXAM):
+                task = {
+                    "id": i + 1,
+                    "year": year,
+                    "exam_type": exam_type,
+                    "question": f"Pytanie {i + 1} " + "treść " * (i * 20),
+                    "choices": {"A": "tak", "B": "nie", "C": "nie wiadomo"},
+                    "answer": "A",
+                    "legal_basis": "art. 415 k.c.",
+                    "legal_basis_content": "Kto z winy swej wyrządził drugiemu szkodę",
+                }
+                f.write(json.dumps(task, ensure_ascii=False) + "\n")
+    return tasks_path
+
+
+@pytest.fixture
+def exam_tasks_path(tmp_path: Path) -> Path:
+    return write_exam_tasks(tmp_path / "tasks")
@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.managers.exam_manager import ExamManager
+from src.benchmark_framework.models.sim_model import SimModel
+
+SIM_NAME = "sim/latency=fixed,median=0,seed=1"
+
+
+def make_manager(tasks_path, **kwargs) -> ExamManager:
+    return ExamManager(SimModel(SIM_NAME, ModelConfig()), tasks_path, **kwargs)
+
+
+def test_letter_scoring_asks_for_the_choice_letter(exam_tasks_path):
+    manager = make_manager(exam_tasks_path, scoring="letter")
+    task = manager.tasks[0]
+
+    system_prompt, prompt, continuations = manager.get_scoring_request(task)
+
+    assert system_prompt.endswith("Podaj tylko literę poprawnej odpowiedzi.")
+    assert prompt == task.get_prompt()
+    assert continuations == {"A": "A", "B": "B", "C": "C"}
+
+
+def test_text_scoring_continues_with_the_full_option(exam_tasks_path):
+    manager = make_manager(exam_tasks_path, scoring="text")
+    task = manager.tasks[0]
+
+    system_prompt, prompt, continuations = manager.get_scoring_request(task)
+
+    assert system_prompt.endswith("Przepisz poprawną odpowiedź.")
+    assert prompt == task.get_prompt()
+    assert continuations == {"A": "A) tak", "B": "B) nie", "C": "C) nie wiadomo"}
+
+
+def test_scored_response_answers_with_the_most_likely_choice(exam_tasks_path):
+    manager = make_manager(exam_tasks_path, scoring="letter")
+    task = manager.tasks[0]
+
+    response = manager.get_scored_response(task, {"A": -2.5, "B": -0.1, "C": -4.0})
+
+    assert json.loads(response) == {"answer": "B"}
+    assert manager.get_result(task, response)["model_answer"] == "B"
+
+
+@pytest.mark.parametrize("scoring", ["letter", "text"])
+def test_scored_results_are_a_separate_model_track(exam_tasks_path, tmp_path, scoring):
+    manager = make_manager(exam_tasks_path, scoring=scoring)
+    task = manager.tasks[0]
+    model_dir = "sim-latency=fixed,median=0,seed=1"
+
+    assert manager.get_results_root(tmp_path) == (
+        tmp_path / f"{model_dir}-loglik-{scoring}" / "exams"
+    )
+    assert manager.get_output_path(task, tmp_path) == (
+        manager.get_results_root(tmp_path) / "2024" / f"{task.exam_type}.jsonl"
+    )
+    assert make_manager(exam_tasks_path).get_results_root(tmp_path) == (
+        tmp_path / model_dir / "exams"
+    )
+
+
+def test_adaptive_results_are_a_separate_model_track(exam_tasks_path, tmp_path):
+    manager = make_manager(exam_tasks_path, adaptive=True)
+
+    assert manager.get_results_root(tmp_path) == (
+        tmp_path / "sim-latency=fixed,median=0,seed=1-adaptive" / "exams"
+    )
+
+
+def test_scoring_cannot_be_adaptive(exam_tasks_path):
+    with pytest.raises(ValueError):
+        make_manager(exam_tasks_path, scoring="letter", adaptive=True)
+
+
+def test_unknown_scoring_mode_is_rejected(exam_tasks_path):
+    with pytest.raises(ValueError):
+        make_manager(exam_tasks_path, scoring="tokens")
@@ -0,0 +1,433 @@
+import json
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.configs.pricing import ModelPrice
+from src.benchmark_framework.configs.runner_config import RunnerConfig
+from src.benchmark_framework.managers.exam_manager import ExamManager
+from src.benchmark_framework.models.cascade_model import CascadeModel
+from src.benchmark_framework.models.sim_model import SimModel
+from src.benchmark_framework.runner import (
+    ADAPTIVE_STATE_FILENAME,
+    COST_LEDGER_FILENAME,
+    TOKEN_COUNTS_FILENAME,
+    BenchmarkRunner,
+)
+from src.benchmark_framework.utils.output_caps import load_output_lengths
+from src.benchmark_framework.utils.provider_stats import PROVIDER_STATS_FILENAME
+from src.benchmark_framework.utils.errors import TIMEOUT
+from src.benchmark_framework.utils.irt import ItemParameters
+from src.benchmark_framework.utils.token_counter import DEFAULT_CHARS_PER_TOKEN
+from src.common.file_operations import FileOperations
+from src.constants import MAX_NEW_TOKENS
+
+SIM_NAME = "sim/latency=fixed,median=0,seed=1"
+# Pre-flight token counting (and calibration) without skipping any task
+PREFLIGHT = dict(context_policy="skip", context_limit=100_000)
+
+
+class BatchingSimModel(SimModel):
+    """Simulated model answering batches one request at a time."""
+
+    supports_batching = True
+
+
+class FailingBatchModel(BatchingSimModel):
+    """Simulated model whose batched generation runs out of memory."""
+
+    def generate_batch(self, requests, response_schemas=None):
+        raise RuntimeError("CUDA out of memory")
+
+
+class TimedOutBatchModel(BatchingSimModel):
+    """Simulated model whose batches are all cut off by the time limit."""
+
+    def generate_batch(self, requests, response_schemas=None):
+        return [
+            (response, {**info, "timed_out": True})
+            for response, info in super().generate_batch(requests, response_schemas)
+        ]
+
+
+class ScoringSimModel(SimModel):
+    """Simulated model ranking the first continuation as the most likely."""
+
+    supports_scoring = True
+
+    def score_continuations(self, system_prompt, prompt, continuations):
+        self.record_usage(10 * len(continuations), 0)
+        return [-float(i) for i in range(len(continuations))]
+
+
+class FailingScoringModel(ScoringSimModel):
+    """Simulated model whose scoring forward pass always fails."""
+
+    def score_continuations(self, system_prompt, prompt, continuations):
+        raise RuntimeError("CUDA out of memory")
+
+
+def load_results(manager: ExamManager, output_path: Path) -> List[dict]:
+    results_root = manager.get_results_root(output_path)
+    return [
+        row
+        for file_path in sorted(results_root.rglob("*.jsonl"))
+        for row in FileOperations.load_jsonl(file_path)
+    ]
+
+
+def make_runner(
+    tasks_path: Path,
+    output_path: Path,
+    runner_config: RunnerConfig = None,
+    model_config: ModelConfig = None,
+    model_name: str = SIM_NAME,
+) -> BenchmarkRunner:
+    model = SimModel(model_name, model_config or ModelConfig())
+    manager = ExamManager(model, tasks_path)
+    return BenchmarkRunner(manager, output_path, runner_config or RunnerConfig())
+
+
+def test_cli_shaped_model_config_is_saved_with_results(exam_tasks_path, tmp_path):
+    output_path = tmp_path / "results"
+    model_config = ModelConfig(
+        rank_providers=True,
+        provider_stats_path=output_path / PROVIDER_STATS_FILENAME,
+        base_url="http://127.0.0.1:8000/v1",
+    )
+    runner = make_runner(exam_tasks_path, output_path, model_config=model_config)
+
+    runner.run()
+
+    results = load_results(runner.manager, output_path)
+    assert len(results) == len(runner.manager.tasks)
+    stored_config = json.loads(results[0]["model_config"])
+    assert stored_config["rank_providers"] is True
+    assert "provider_stats_path" not in stored_config
+    assert "base_url" not in stored_config
+
+
+def test_weights_cache_dir_is_not_stored_with_results(exam_tasks_path, tmp_path):
+    output_path = tmp_path / "results"
+    model_config = ModelConfig(weights_cache_dir=tmp_path / "weights")
+    runner = make_runner(exam_tasks_path, output_path, model_config=model_config)
+
+    runner.run()
+
+    results = load_results(runner.manager, output_path)
+    assert len(results) == len(runner.manager.tasks)
+    assert "weights_cache_dir" not in json.loads(results[0]["model_config"])
+
+
+def test_truncation_retries_keep_final_usage_and_total_cost(exam_tasks_path, tmp_path):
+    output_path = tmp_path / "results"
+    runner = make_runner(
+        exam_tasks_path,
+        output_path,
+        RunnerConfig(**PREFLIGHT),
+        model_config=ModelConfig(max_output_tokens=20),
+        model_name=f"{SIM_NAME},output_tokens=80",
+    )
+
+    runner.run()
+
+    results = load_results(runner.manager, output_path)
+    assert len(results) == len(runner.manager.tasks)
+    for result in results:
+        assert result["output_cap"] == 80
+        assert result["usage"]["output_tokens"] == 80
+        assert result["total_usage"]["output_tokens"] == 20 + 40 + 80
+        assert (
+            result["total_usage"]["input_tokens"] == 3 * result["usage"]["input_tokens"]
+        )
+    assert load_output_lengths(runner.manager.get_results_root(output_path)) == [
+        80
+    ] * len(results)
+    # The simulated tokenizer has 4 characters per token; calibration moves towards it
+    assert runner.token_counter.chars_per_token > DEFAULT_CHARS_PER_TOKEN
+
+
+def test_composite_model_usage_does_not_calibrate_token_counts(
+    exam_tasks_path, tmp_path
+):
+    small, large = SimModel(SIM_NAME, ModelConfig()), SimModel(SIM_NAME, ModelConfig())
+    model = CascadeModel(
+        f"cascade/{SIM_NAME}+{SIM_NAME}",
+        ModelConfig(),
+        small_model=small,
+        large_model=large,
+    )
+    runner = BenchmarkRunner(
+        ExamManager(model, exam_tasks_path),
+        tmp_path / "results",
+        RunnerConfig(**PREFLIGHT),
+    )
+
+    runner.run()
+
+    assert len(load_results(runner.manager, tmp_path / "results")) == 12
+    assert runner.token_counter.chars_per_token == DEFAULT_CHARS_PER_TOKEN
+
+
+def test_sampled_cascade_results_are_priced(exam_tasks_path, tmp_path):
+    model = CascadeModel(
+        f"cascade/{SIM_NAME}+{SIM_NAME}",
+        ModelConfig(),
+        small_model=SimModel(SIM_NAME, ModelConfig()),
+        large_model=SimModel(SIM_NAME, ModelConfig()),
+    )
+    runner = BenchmarkRunner(
+        ExamManager(model, exam_tasks_path),
+        tmp_path / "results",
+        RunnerConfig(samples=3),
+        price_table={SIM_NAME: ModelPrice(1.0, 2.0)},
+    )
+
+    runner.run()
+
+    results = load_results(runner.manager, tmp_path / "results")
+    assert len(results) == 12
+    assert all(result["usage"]["output_tokens"] == 3 * 80 for result in results)
+    assert runner.cost_tracker.breakdown()["models"][SIM_NAME]["requests"] == 3 * 12
+
+
+def test_preflight_skips_tasks_that_cannot_be_truncated_to_fit(
+    exam_tasks_path, tmp_path
+):
+    output_path = tmp_path / "results"
+    runner = make_runner(
+        exam_tasks_path,
+        output_path,
+        RunnerConfig(context_policy="truncate", context_limit=150),
+    )
+
+    runner.run()
+
+    assert load_results(runner.manager, output_path) == []
+    assert runner.telemetry.successes == 0
+
+
+def test_preflight_truncates_long_questions_only(exam_tasks_path, tmp_path):
+    output_path = tmp_path / "results"
+    runner = make_runner(exam_tasks_path, output_path)
+    task = runner.manager.tasks[0]
+    system_tokens = runner.token_counter.estimate(
+        runner.manager.get_system_prompt(task)
+    )
+    runner.runner_config = RunnerConfig(
+        context_policy="truncate", context_limit=MAX_NEW_TOKENS + system_tokens + 60
+    )
+
+    runner.run()
+
+    results = load_results(runner.manager, output_path)
+    assert len(results) == len(runner.manager.tasks)
+    truncated = [r for r in results if r.get("context_action") == "truncated"]
+    assert 0 < len(truncated) < len(results)
+
+
+def test_token_counts_are_saved_only_with_preflight(exam_tasks_path, tmp_path):
+    output_path = tmp_path / "results"
+    runner = make_runner(exam_tasks_path, output_path)
+
+    runner.run()
+
+    results_root = runner.manager.get_results_root(output_path)
+    assert not (results_root / TOKEN_COUNTS_FILENAME).exists()
+    assert runner.token_counter.chars_per_token == DEFAULT_CHARS_PER_TOKEN
+
+
+def test_untracked_daily_cost_leaves_the_ledger_alone(exam_tasks_path, tmp_path):
+    output_path = tmp_path / "results"
+    runner = BenchmarkRunner(
+        ExamManager(SimModel(SIM_NAME, ModelConfig()), exam_tasks_path),
+        output_path,
+        RunnerConfig(track_daily_cost=False),
+        price_table={SIM_NAME: ModelPrice(1.0, 2.0)},
+    )
+
+    runner.run()
+
+    assert runner.cost_tracker.run_cost > 0
+    assert not (output_path / COST_LEDGER_FILENAME).exists()
+
+
+def test_failed_batch_falls_back_to_single_requests(exam_tasks_path, tmp_path):
+    output_path = tmp_path / "results"
+    model = FailingBatchModel(SIM_NAME, ModelConfig(batch_size=4))
+    runner = BenchmarkRunner(ExamManager(model, exam_tasks_path), output_path)
+
+    runner.run()
+
+    assert len(load_results(runner.manager, output_path)) == 12
+    assert runner.telemetry.batches == 0
+
+
+def test_scored_tasks_save_choice_logprobs_under_the_loglik_track(
+    exam_tasks_path, tmp_path
+):
+    output_path = tmp_path / "results"
+    model = ScoringSimModel(SIM_NAME, ModelConfig())
+    runner = BenchmarkRunner(
+        ExamManager(model, exam_tasks_path, scoring="text"), output_path
+    )
+
+    runner.run()
+
+    results_root = runner.manager.get_results_root(output_path)
+    assert results_root.parent.name.endswith("-loglik-text")
+    results = load_results(runner.manager, output_path)
+    assert len(results) == 12
+    for result in results:
+        assert result["scoring"] == "text"
+        assert result["choice_logprobs"] == {"A": 0.0, "B": -1.0, "C": -2.0}
+        assert result["model_answer"] == "A"
+        assert result["usage"]["input_tokens"] == 30
+        assert result["usage"]["output_tokens"] == 0
+    assert runner.telemetry.successes == 12
+
+
+def test_failed_scoring_is_recorded_without_saving(exam_tasks_path, tmp_path):
+    output_path = tmp_path / "results"
+    model = FailingScoringModel(SIM_NAME, ModelConfig())
+    runner = BenchmarkRunner(
+        ExamManager(model, exam_tasks_path, scoring="letter"), output_path
+    )
+
+    runner.run()
+
+    assert load_results(runner.manager, output_path) == []
+    assert runner.telemetry.successes == 0
+
+
+def test_concurrent_run_saves_every_task_once(exam_tasks_path, tmp_path):
+    output_path = tmp_path / "results"
+    runner = make_runner(exam_tasks_path, output_path, RunnerConfig(max_concurrency=4))
+
+    runner.run()
+
+    results = load_results(runner.manager, output_path)
+    assert len(results) == 12
+    assert len({(r["exam_type"], r["id"]) for r in results}) == 12
+    assert runner.telemetry.successes == 12
+
+
+def test_packed_tasks_are_split_into_their_own_results(exam_tasks_path, tmp_path):
+    output_path = tmp_path / "results"
+    runner = make_runner(exam_tasks_path, output_path, RunnerConfig(pack_size=3))
+
+    runner.run()
+
+    results = load_results(runner.manager, output_path)
+    assert len(results) == 12
+    assert all(result["pack_size"] == 3 for result in results)
+    assert all(result["model_answer"] in ("A", "B", "C") for result in results)
+    # Two exam types of six questions make four packs, all split without fallback
+    assert runner.telemetry.successes == 4
+    assert runner.telemetry.packed_tasks == 12
+    assert runner.telemetry.pack_fallbacks == 0
+
+
+def test_sampled_answers_are_majority_voted(exam_tasks_path, tmp_path):
+    output_path = tmp_path / "results"
+    runner = make_runner(exam_tasks_path, output_path, RunnerConfig(samples=3))
+
+    runner.run()
+
+    results = load_results(runner.manager, output_path)
+    assert len(results) == 12
+    for result in results:
+        answers = result["sampled_answers"]
+        assert len(answers) == 3
+        assert answers.count(result["model_answer"]) == max(map(answers.count, answers))
+        assert result["agreement_rate"] == pytest.approx(
+            answers.count(result["model_answer"]) / 3
+        )
+        assert result["usage"]["output_tokens"] == 3 * 80
+
+
+def test_batched_run_groups_tasks_into_model_batches(exam_tasks_path, tmp_path):
+    output_path = tmp_path / "results"
+    model = BatchingSimModel(SIM_NAME, ModelConfig(batch_size=4, chunk_size=4))
+    runner = BenchmarkRunner(ExamManager(model, exam_tasks_path), output_path)
+
+    runner.run()
+
+    assert len(load_results(runner.manager, output_path)) == 12
+    assert runner.telemetry.batches == 3
+    assert runner.telemetry.batched_tasks == 12
+
+
+def make_item_parameters(manager: ExamManager) -> ItemParameters:
+    item_keys = [manager.get_item_key(task) for task in manager.tasks]
+    return ItemParameters(
+        item_keys,
+        discrimination=np.full(len(item_keys), 1.5),
+        difficulty=np.linspace(-2.0, 2.0, len(item_keys)),
+    )
+
+
+def test_adaptive_run_stops_after_max_items(exam_tasks_path, tmp_path):
+    output_path = tmp_path / "results"
+    manager = ExamManager(
+        SimModel(SIM_NAME, ModelConfig()), exam_tasks_path, adaptive=True
+    )
+    runner = BenchmarkRunner(
+        manager,
+        output_path,
+        RunnerConfig(adaptive_max_items=3),
+        item_parameters=make_item_parameters(manager),
+    )
+
+    runner.run()
+
+    assert len(load_results(manager, output_path)) == 3
+    state_path = manager.get_results_root(output_path) / ADAPTIVE_STATE_FILENAME
+    assert json.loads(state_path.read_text())["items_answered"] == 3
+
+
+def test_adaptive_results_are_kept_out_of_the_full_run(exam_tasks_path, tmp_path):
+    output_path = tmp_path / "results"
+    manager = ExamManager(
+        SimModel(SIM_NAME, ModelConfig()), exam_tasks_path, adaptive=True
+    )
+    runner = BenchmarkRunner(
+        manager,
+        output_path,
+        RunnerConfig(adaptive_max_items=3),
+        item_parameters=make_item_parameters(manager),
+    )
+
+    runner.run()
+
+    full_run = ExamManager(SimModel(SIM_NAME, ModelConfig()), exam_tasks_path)
+    assert load_results(full_run, output_path) == []
+    assert manager.get_results_root(output_path).parent.name.endswith("-adaptive")
+    # A full run afterwards still answers every question
+    full_runner = BenchmarkRunner(full_run, output_path)
+    full_runner.run()
+    assert len(load_results(full_run, output_path)) == 12
+
+
+def test_adaptive_testing_needs_an_adaptive_manager(exam_tasks_path, tmp_path):
+    manager = ExamManager(SimModel(SIM_NAME, ModelConfig()), exam_tasks_path)
+
+    with pytest.raises(ValueError):
+        BenchmarkRunner(
+            manager, tmp_path, item_parameters=make_item_parameters(manager)
+        )
+
+
+def test_timed_out_batch_responses_are_retried_one_by_one(exam_tasks_path, tmp_path):
+    output_path = tmp_path / "results"
+    model = TimedOutBatchModel(SIM_NAME, ModelConfig(batch_size=4))
+    runner = BenchmarkRunner(ExamManager(model, exam_tasks_path), output_path)
+
+    runner.run()
+
+    assert len(load_results(runner.manager, output_path)) == 12
+    assert runner.telemetry.errors[TIMEOUT] == 12
+    assert runner.telemetry.successes == 12
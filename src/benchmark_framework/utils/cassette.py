@@ -0,0 +1,235 @@
+import hashlib
+import json
+import random
+import threading
+import time
+from collections import defaultdict
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import httpx
+
+from src.constants import ENCODING
+
+# Query parameters holding credentials are not part of the request key
+CREDENTIAL_PARAMS = ("key", "api_key")
+# Request headers not forwarded upstream when recording
+HOP_HEADERS = ("host", "content-length", "connection", "accept-encoding")
+# Response headers kept in the cassette
+KEPT_HEADERS = ("content-type", "retry-after")
+DEFAULT_ERROR_STATUSES = (429, 503)
+
+
+def get_request_key(method: str, path: str, body: bytes) -> str:
+    """
+    Hash identifying a request independently of credentials and JSON key order.
+    """
+    url = urlsplit(path)
+    query = urlencode(
+        [
+            (name, value)
+            for name, value in sorted(parse_qsl(url.query))
+            if name not in CREDENTIAL_PARAMS
+        ]
+    )
+    try:
+        body = json.dumps(json.loads(body), sort_keys=True).encode(ENCODING)
+    except ValueError:
+        pass
+    content = b"\0".join((method.encode(), url.path.encode(), query.encode(), body))
+    return hashlib.sha256(content).hexdigest()[:16]
+
+
+@dataclass
+class Exchange:
+    """
+    A recorded response to a request, identified by its request key.
+    """
+
+    key: str
+    method: str
+    path: str
+    status: int
+    headers: Dict[str, str]
+    body: str
+    latency: float
+
+
+class Cassette:
+    """
+    Recorded HTTP exchanges stored as JSONL, one exchange per line.
+
+    Requests recorded several times (e.g. repeated samples) are replayed in the
+    recorded order, cycling once all of them were served.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._exchanges: Dict[str, List[Exchange]] = defaultdict(list)
+        self._served: Dict[str, int] = defaultdict(int)
+        if path.exists():
+            with open(path, "r", encoding=ENCODING) as f:
+                for line in f:
+                    if line.strip():
+                        exchange = Exchange(**json.loads(line))
+                        self._exchanges[exchange.key].append(exchange)
+
+    def __len__(self) -> int:
+        return sum(len(exchanges) for exchanges in self._exchanges.values())
+
+    def record(self, exchange: Exchange) -> None:
+        with self._lock:
+            self._exchanges[exchange.key].append(exchange)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.path, "a", encoding=ENCODING) as f:
+                f.write(json.dumps(asdict(exchange), ensure_ascii=False) + "\n")
+
+    def next(self, key: str) -> Optional[Exchange]:
+        with self._lock:
+            exchanges = self._exchanges.get(key)
+            if not exchanges:
+                return None
+            exchange = exchanges[self._served[key] % len(exchanges)]
+            self._served[key] += 1
+            return exchange
+
+
+class _CassetteHandler(BaseHTTPRequestHandler):
+    # Keep connections alive like the real APIs
+    protocol_version = "HTTP/1.1"
+    server: "CassetteServer"
+
+    def _handle(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+        key = get_request_key(self.command, self.path, body)
+
+        if self.server.record_mode:
+            exchange = self.server.forward(self, key, body)
+        else:
+            error = self.server.injected_error()
+            if error is not None:
+                self._respond(error, {"content-type": "application/json"}, "")
+                return
+            exchange = self.server.cassette.next(key)
+            if exchange is None:
+                message = f"No recorded response for {self.command} {self.path}"
+                self._respond(
+                    404,
+                    {"content-type": "application/json"},
+                    json.dumps({"error": {"message": message}}),
+                )
+                return
+            time.sleep(exchange.latency * self.server.latency_scale)
+        self._respond(exchange.status, exchange.headers, exchange.body)
+
+    def _respond(self, status: int, headers: Dict[str, str], body: str) -> None:
+        if not body and status >= 400:
+            body = json.dumps({"error": {"message": "Injected error", "code": status}})
+        payload = body.encode(ENCODING)
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _handle
+
+    def log_message(self, *args) -> None:
+        pass
+
+
+class CassetteServer(ThreadingHTTPServer):
+    """
+    Local stand-in for a provider API.
+
+    In record mode every request is forwarded to `upstream` and successful
+    responses are appended to the cassette. In replay mode responses come from
+    the cassette only, delayed by their recorded latency times `latency_scale`,
+    and a share `error_rate` of requests fails with one of `error_statuses`.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        cassette_path: Path,
+        upstream: str,
+        record_mode: bool = False,
+        latency_scale: float = 1.0,
+        error_rate: float = 0.0,
+        error_statuses: Sequence[int] = DEFAULT_ERROR_STATUSES,
+        seed: Optional[int] = None,
+    ):
+        super().__init__(("127.0.0.1", 0), _CassetteHandler)
+        self.cassette = Cassette(cassette_path)
+        self.upstream = urlsplit(upstream)
+        self.record_mode = record_mode
+        self.latency_scale = latency_scale
+        self.error_rate = error_rate
+        self.error_statuses = tuple(error_statuses)
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._client = httpx.Client(timeout=None) if record_mode else None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """
+        Replacement for the upstream URL: same path on the local server.
+        """
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}{self.upstream.path}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self.base_url
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+        if self._client is not None:
+            self._client.close()
+
+    def injected_error(self) -> Optional[int]:
+        with self._random_lock:
+            if self.error_rate and self._random.random() < self.error_rate:
+                return self._random.choice(self.error_statuses)
+        return None
+
+    def forward(
+        self, handler: BaseHTTPRequestHandler, key: str, body: bytes
+    ) -> Exchange:
+        headers = {
+            name: value
+            for name, value in handler.headers.items()
+            if name.lower() not in HOP_HEADERS
+        }
+        url = f"{self.upstream.scheme}://{self.upstream.netloc}{handler.path}"
+        start = time.monotonic()
+        response = self._client.request(
+            handler.command, url, headers=headers, content=body
+        )
+        exchange = Exchange(
+            key=key,
+            method=handler.command,
+            path=urlsplit(handler.path).path,
+            status=response.status_code,
+            headers={
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() in KEPT_HEADERS
+            },
+            body=response.text,
+            latency=time.monotonic() - start,
+        )
+        # Upstream failures are passed through but not replayed; use error injection
+        if response.status_code < 400:
+            self.cassette.record(exchange)
+        return exchange
@@ -0,0 +1,112 @@
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+
+
+class AIMDLimiter:
+    """
+    Adaptive in-flight request limit using additive-increase/multiplicative-decrease.
+
+    The limit grows by roughly one slot per window of successful requests and is
+    multiplied by `decrease_factor` on overload signals (429/5xx) or when latency
+    is inflated: the smoothed latency (exponentially weighted by `smoothing`)
+    exceeds `latency_tolerance` times the baseline, the median of the last
+    `latency_window` latencies. Smoothing both sides keeps the ordinary spread
+    of latencies (jitter, prompts of different lengths) from counting as
+    overload, so only sustained inflation shrinks the limit.
+    """
+
+    def __init__(
+        self,
+        min_limit: int,
+        max_limit: int,
+        initial_limit: Optional[int] = None,
+        decrease_factor: float = 0.5,
+        latency_tolerance: float = 2.0,
+        cooldown: float = 1.0,
+        latency_window: int = 50,
+        smoothing: float = 0.2,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if min_limit < 1:
+            raise ValueError("min_limit must be >= 1")
+        if max_limit < min_limit:
+            raise ValueError("max_limit must be >= min_limit")
+        if not 0 < decrease_factor < 1:
+            raise ValueError("decrease_factor must be in (0, 1)")
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be in (0, 1]")
+
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self.smoothing = smoothing
+        self._clock = clock
+
+        self._limit = float(initial_limit if initial_limit is not None else min_limit)
+        self._limit = min(max(self._limit, min_limit), max_limit)
+        self._in_flight = 0
+        self._latencies: "deque[float]" = deque(maxlen=latency_window)
+        self._smoothed_latency: Optional[float] = None
+        self._last_decrease: Optional[float] = None
+        self._cond = threading.Condition()
+
+    @property
+    def limit(self) -> int:
+        return int(self._limit)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self) -> None:
+        """Block until a slot below the current limit is available."""
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+
+    def release(self) -> None:
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self, latency: float) -> None:
+        with self._cond:
+            if self._smoothed_latency is None:
+                self._smoothed_latency = latency
+            else:
+                self._smoothed_latency += self.smoothing * (
+                    latency - self._smoothed_latency
+                )
+            baseline = statistics.median(self._latencies) if self._latencies else None
+            self._latencies.append(latency)
+
+            if (
+                baseline is not None
+                and self._smoothed_latency > baseline * self.latency_tolerance
+            ):
+                self._decrease()
+            else:
+                self._limit = min(self._limit + 1.0 / self._limit, self.max_limit)
+            self._cond.notify_all()
+
+    def on_overload(self) -> None:
+        with self._cond:
+            self._decrease()
+
+    def _decrease(self) -> None:
+        # Requests already in flight when the provider started rejecting fail together;
+        # react to the burst once rather than collapsing straight to the floor.
+        now = self._clock()
+        if (
+            self._last_decrease is not None
+            and now - self._last_decrease < self.cooldown
+        ):
+            return
+        self._last_decrease = now
+        self._limit = max(self._limit * self.decrease_factor, self.min_limit)
@@ -0,0 +1,203 @@
+import json
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+# Text decoded before each token so that leading spaces of tokens are kept
+_TOKEN_TEXT_PREFIX = "a"
+
+
+def get_token_texts(tokenizer: Any) -> List[str]:
+    """
+    Text of every token id of a Hugging Face tokenizer as it appears inside
+    generated text; special tokens map to empty strings.
+    """
+    prefix_ids = tokenizer.encode(_TOKEN_TEXT_PREFIX, add_special_tokens=False)
+    prefix = tokenizer.decode(prefix_ids)
+    texts = []
+    for token_id in range(len(tokenizer)):
+        text = tokenizer.decode(prefix_ids + [token_id], skip_special_tokens=True)
+        texts.append(text[len(prefix) :] if text.startswith(prefix) else "")
+    return texts
+
+
+def _is_string_content(text: str) -> bool:
+    """
+    Whether text can appear inside a JSON string as is. Escapes are not
+    generated, so quotes and backslashes end or break the string.
+    """
+    return all(char not in '"\\' and ord(char) >= 32 for char in text)
+
+
+class TokenIndex:
+    """
+    Token texts of a tokenizer indexed for constrained decoding. Shared by all
+    constraints of a model.
+    """
+
+    def __init__(self, token_texts: Sequence[str], eos_token_id: int):
+        self.token_texts = token_texts
+        self.eos_token_id = eos_token_id
+        self.ids_by_text: Dict[str, List[int]] = defaultdict(list)
+        for token_id, text in enumerate(token_texts):
+            if text:
+                self.ids_by_text[text].append(token_id)
+        self.max_token_length = max(map(len, self.ids_by_text), default=0)
+        # Tokens that may continue an open JSON string
+        self.string_ids = [
+            token_id
+            for token_id, text in enumerate(token_texts)
+            if text and _is_string_content(text)
+        ]
+        self._string_ids_until: Dict[Tuple[str, ...], List[int]] = {}
+
+    def prefix_ids(self, alternatives: Sequence[str]) -> List[int]:
+        """
+        Tokens whose text is a non-empty prefix of one of the alternatives.
+        """
+        ids = set()
+        for alternative in alternatives:
+            for end in range(1, min(len(alternative), self.max_token_length) + 1):
+                ids.update(self.ids_by_text.get(alternative[:end], ()))
+        return sorted(ids)
+
+    def string_ids_until(self, alternatives: Tuple[str, ...]) -> List[int]:
+        """
+        Tokens continuing an open string, or ending it and continuing into one of
+        the alternatives that follow it (each starting with the closing quote).
+        """
+        if alternatives not in self._string_ids_until:
+            ids = list(self.string_ids)
+            for token_id, text in enumerate(self.token_texts):
+                quote = text.find('"')
+                if (
+                    quote >= 0
+                    and _is_string_content(text[:quote])
+                    and any(alt.startswith(text[quote:]) for alt in alternatives)
+                ):
+                    ids.append(token_id)
+            self._string_ids_until[alternatives] = ids
+        return self._string_ids_until[alternatives]
+
+
+def get_schema_segments(schema: dict) -> List[Optional[Tuple[str, ...]]]:
+    """
+    Split the JSON text of a flat object schema with string fields into fixed
+    parts (tuples of alternative texts, one per enum combination) and free string
+    values (None). Free strings are always followed by a part starting with the
+    closing quote.
+    """
+    segments: List[Optional[Tuple[str, ...]]] = []
+    pending = ["{"]
+    for i, name in enumerate(schema["properties"]):
+        field = schema["properties"][name]
+        if field.get("type") != "string":
+            raise ValueError(f"Field '{name}' must be a string to constrain decoding.")
+        key = f'{", " if i else ""}{json.dumps(name, ensure_ascii=False)}: "'
+        pending = [text + key for text in pending]
+        if "enum" in field:
+            pending = [
+                f'{text}{json.dumps(value, ensure_ascii=False)[1:-1]}"'
+                for text in pending
+                for value in field["enum"]
+            ]
+        else:
+            segments.append(tuple(pending))
+            segments.append(None)
+            pending = ['"']
+    segments.append(tuple(text + "}" for text in pending))
+    return segments
+
+
+class SchemaConstraint:
+    """
+    Allowed next tokens of a response following a flat JSON object schema of
+    string fields: keys, punctuation and enum values (e.g. the answer letter)
+    are forced, free strings accept any text without quotes or escapes, and the
+    end of sequence token is forced after the closing brace.
+    """
+
+    def __init__(self, schema: dict, index: TokenIndex):
+        self.index = index
+        self.segments = get_schema_segments(schema)
+        self.position = 0
+        # Remaining alternatives of the current fixed part
+        self.remaining: Tuple[str, ...] = self.segments[0]
+
+    @property
+    def done(self) -> bool:
+        return self.position >= len(self.segments)
+
+    def allowed_tokens(self) -> List[int]:
+        if self.done:
+            return [self.index.eos_token_id]
+        if self.segments[self.position] is None:
+            return self.index.string_ids_until(self.segments[self.position + 1])
+        return self.index.prefix_ids(self.remaining)
+
+    def _enter(self, position: int, consumed: str = "") -> None:
+        self.position = position
+        if self.done:
+            return
+        segment = self.segments[position]
+        if segment is None:
+            return
+        self.remaining = tuple(
+            alt[len(consumed) :] for alt in segment if alt.startswith(consumed)
+        )
+        if "" in self.remaining:
+            self._enter(position + 1)
+
+    def advance(self, token_id: int) -> None:
+        if self.done:
+            return
+        text = self.index.token_texts[token_id]
+        if self.segments[self.position] is None:
+            quote = text.find('"')
+            if quote >= 0:
+                self._enter(self.position + 1, text[quote:])
+            return
+        self.remaining = tuple(
+            alt[len(text) :] for alt in self.remaining if alt.startswith(text)
+        )
+        if "" in self.remaining:
+            self._enter(self.position + 1)
+
+
+class SchemaLogitsProcessor:
+    """
+    `transformers` logits processor applying one SchemaConstraint per sequence
+    of a (left-padded) batch; sequences without a constraint are left as is.
+    """
+
+    def __init__(self, constraints: Sequence[Optional[SchemaConstraint]]):
+        self.constraints = constraints
+        self._started = False
+        # id of an allowed-token list -> (the list, its index tensor); keeping the
+        # list alive keeps its id unique
+        self._indices: Dict[int, Tuple[List[int], Any]] = {}
+
+    def _get_indices(self, allowed: List[int], input_ids: Any, vocab_size: int) -> Any:
+        cached = self._indices.get(id(allowed))
+        if cached is None:
+            indices = input_ids.new_tensor([i for i in allowed if i < vocab_size])
+            cached = self._indices[id(allowed)] = (allowed, indices)
+        return cached[1]
+
+    def __call__(self, input_ids: Any, scores: Any) -> Any:
+        if self._started:
+            for row, constraint in enumerate(self.constraints):
+                if constraint is not None:
+                    constraint.advance(int(input_ids[row, -1]))
+        self._started = True
+
+        mask = scores.new_zeros(scores.shape)
+        vocab_size = scores.shape[-1]
+        for row, constraint in enumerate(self.constraints):
+            if constraint is None:
+                continue
+            allowed = self._get_indices(
+                constraint.allowed_tokens(), input_ids, vocab_size
+            )
+            mask[row] = float("-inf")
+            mask[row, allowed] = 0
+        return scores + mask
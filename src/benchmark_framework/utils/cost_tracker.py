@@ -0,0 +1,142 @@
+import json
+import os
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import date
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+from src.benchmark_framework.configs.pricing import ModelPrice
+from src.constants import ENCODING
+
+try:
+    import fcntl
+except ImportError:  # Windows: runs in other processes may race on the ledger
+    fcntl = None
+
+
+class CostTracker:
+    """
+    Accumulates token usage and spend per model and enforces run and daily budgets.
+
+    Daily spend is persisted in a ledger file so that it carries over between runs.
+    The ledger is written after every request: under a file lock, the file is
+    re-read and this run's unsaved spend is added, so a crash loses nothing and
+    concurrent runs sharing the ledger do not overwrite each other.
+    """
+
+    def __init__(
+        self,
+        price_table: Dict[str, ModelPrice],
+        max_run_cost: Optional[float] = None,
+        max_daily_cost: Optional[float] = None,
+        ledger_path: Optional[Path] = None,
+    ):
+        self.price_table = price_table
+        self.max_run_cost = max_run_cost
+        self.max_daily_cost = max_daily_cost
+        self.ledger_path = ledger_path
+        self._usage: Dict[str, Dict[str, float]] = defaultdict(
+            lambda: {"requests": 0, "input_tokens": 0, "output_tokens": 0, "cost": 0.0}
+        )
+        self._unpriced_models = set()
+        self._lock = threading.Lock()
+        self._ledger = self._load_ledger()
+
+    def _load_ledger(self) -> Dict[str, float]:
+        if self.ledger_path is None or not self.ledger_path.exists():
+            return {}
+        with open(self.ledger_path, "r", encoding=ENCODING) as f:
+            return json.load(f)
+
+    @contextmanager
+    def _ledger_file_lock(self) -> Iterator[None]:
+        """
+        Hold an exclusive lock on the ledger across processes (where supported).
+        """
+        lock_path = self.ledger_path.with_name(self.ledger_path.name + ".lock")
+        with open(lock_path, "w") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _add_to_ledger(self, day: str, cost: float) -> None:
+        """
+        Add spend to the persisted ledger, merged with other runs' spend.
+        Called with `_lock` held.
+        """
+        if self.ledger_path is None:
+            self._ledger[day] = self._ledger.get(day, 0.0) + cost
+            return
+        self.ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._ledger_file_lock():
+            ledger = self._load_ledger()
+            ledger[day] = ledger.get(day, 0.0) + cost
+            # Replace the file at once so that readers never see a partial ledger
+            staging_path = self.ledger_path.with_name(self.ledger_path.name + ".tmp")
+            with open(staging_path, "w", encoding=ENCODING) as f:
+                json.dump(ledger, f, indent=2)
+            os.replace(staging_path, self.ledger_path)
+        self._ledger = ledger
+
+    @property
+    def run_cost(self) -> float:
+        return sum(usage["cost"] for usage in self._usage.values())
+
+    @property
+    def daily_cost(self) -> float:
+        return self._ledger.get(date.today().isoformat(), 0.0)
+
+    def record(self, model_name: str, input_tokens: int, output_tokens: int) -> float:
+        """Record one request and return its cost."""
+        price = self.price_table.get(model_name)
+        cost = price.cost(input_tokens, output_tokens) if price else 0.0
+
+        with self._lock:
+            if price is None and model_name not in self._unpriced_models:
+                self._unpriced_models.add(model_name)
+                print(
+                    f"\n[WARNING] No price for model '{model_name}', its cost is counted as 0."
+                )
+            usage = self._usage[model_name]
+            usage["requests"] += 1
+            usage["input_tokens"] += input_tokens
+            usage["output_tokens"] += output_tokens
+            usage["cost"] += cost
+
+            self._add_to_ledger(date.today().isoformat(), cost)
+        return cost
+
+    def run_budget_exceeded(self) -> bool:
+        return self.max_run_cost is not None and self.run_cost >= self.max_run_cost
+
+    def daily_budget_exceeded(self) -> bool:
+        return (
+            self.max_daily_cost is not None and self.daily_cost >= self.max_daily_cost
+        )
+
+    def breakdown(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "models": {name: dict(usage) for name, usage in self._usage.items()},
+                "total_cost": self.run_cost,
+                "max_run_cost": self.max_run_cost,
+                "max_daily_cost": self.max_daily_cost,
+            }
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding=ENCODING) as f:
+            json.dump(self.breakdown(), f, ensure_ascii=False, indent=2)
+
+    def print_breakdown(self) -> None:
+        breakdown = self.breakdown()
+        print("\n=== Cost breakdown ===")
+        for model_name, usage in sorted(breakdown["models"].items()):
+            print(
+                f"  {model_name}: {usage['requests']} requests, "
+                f"{usage['input_tokens']} input / {usage['output_tokens']} output tokens, "
+                f"${usage['cost']:.4f}"
+            )
+        print(f"  Total: ${breakdown['total_cost']:.4f}")
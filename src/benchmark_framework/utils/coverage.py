@@ -0,0 +1,35 @@
+import json
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from src.constants import ENCODING
+
+COVERAGE_SUFFIX = ".coverage.json"
+
+
+def get_coverage_path(results_path: Path) -> Path:
+    """Sidecar file next to a results JSONL file (e.g. notarialny.coverage.json)."""
+    return results_path.with_suffix(COVERAGE_SUFFIX)
+
+
+def save_coverage(results_path: Path, total: int, completed: int) -> None:
+    coverage_path = get_coverage_path(results_path)
+    coverage_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(coverage_path, "w", encoding=ENCODING) as f:
+        json.dump(
+            {
+                "tasks_total": total,
+                "tasks_completed": completed,
+                "partial": completed < total,
+            },
+            f,
+            indent=2,
+        )
+
+
+def load_coverage(results_path: Path) -> Optional[Dict[str, Any]]:
+    coverage_path = get_coverage_path(results_path)
+    if not coverage_path.exists():
+        return None
+    with open(coverage_path, "r", encoding=ENCODING) as f:
+        return json.load(f)
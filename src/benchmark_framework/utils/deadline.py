@@ -0,0 +1,71 @@
+import re
+import time
+from datetime import datetime
+from typing import Callable, Optional
+
+_DURATION_PATTERN = re.compile(r"(\d+(?:\.\d+)?)([hms])")
+_DURATION_UNITS = {"h": 3600, "m": 60, "s": 1}
+
+
+def parse_deadline(value: str, now: Optional[float] = None) -> float:
+    """
+    Parse a deadline given either as a duration from now (e.g. "90m", "1h30m", "45s")
+    or as an ISO datetime (e.g. "2025-03-17T09:00"). Returns a Unix timestamp.
+    """
+    now = time.time() if now is None else now
+    text = value.strip().lower()
+
+    if text and _DURATION_PATTERN.sub("", text) == "":
+        seconds = sum(
+            float(amount) * _DURATION_UNITS[unit]
+            for amount, unit in _DURATION_PATTERN.findall(text)
+        )
+        return now + seconds
+
+    try:
+        return datetime.fromisoformat(value.strip()).timestamp()
+    except ValueError:
+        raise ValueError(
+            f"Invalid deadline '{value}'. Use a duration (e.g. '8h', '90m') or an ISO datetime."
+        )
+
+
+class DeadlineTracker:
+    """
+    Predicts from observed throughput whether more tasks fit before a deadline.
+    """
+
+    def __init__(
+        self,
+        deadline: float,
+        smoothing: float = 0.2,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.deadline = deadline
+        self.smoothing = smoothing
+        self._clock = clock
+        self.seconds_per_task: Optional[float] = None
+        self.reached = False
+
+    def remaining(self) -> float:
+        return max(self.deadline - self._clock(), 0.0)
+
+    def record_completion(self, duration: float) -> None:
+        if self.seconds_per_task is None:
+            self.seconds_per_task = duration
+        else:
+            self.seconds_per_task += self.smoothing * (duration - self.seconds_per_task)
+
+    def can_start(self) -> bool:
+        """A task may start if it is expected to finish before the deadline."""
+        estimate = self.seconds_per_task or 0.0
+        if self._clock() + estimate > self.deadline:
+            self.reached = True
+        return not self.reached
+
+    def predict_fit(self, pending: int, concurrency: int = 1) -> int:
+        """Number of pending tasks expected to finish before the deadline."""
+        if not self.seconds_per_task:
+            return pending
+        fit = int(self.remaining() / self.seconds_per_task * concurrency)
+        return min(fit, pending)
@@ -0,0 +1,63 @@
+from typing import Optional
+
+RATE_LIMIT = "rate_limit"
+SERVER_ERROR = "server_error"
+TIMEOUT = "timeout"
+OTHER = "other"
+
+RETRYABLE_ERRORS = (RATE_LIMIT, SERVER_ERROR, TIMEOUT)
+
+
+def get_status_code(exc: BaseException) -> Optional[int]:
+    """
+    Extract an HTTP status code from a provider SDK or `requests` exception.
+    """
+    for attr in ("status_code", "code", "status"):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+
+    response = getattr(exc, "response", None)
+    if response is not None:
+        value = getattr(response, "status_code", None)
+        if isinstance(value, int):
+            return value
+
+    return None
+
+
+def is_timeout(exc: BaseException) -> bool:
+    """
+    Timeouts from any provider SDK or HTTP library (openai/anthropic APITimeoutError,
+    httpx.TimeoutException, requests.Timeout, builtin TimeoutError).
+    """
+    if isinstance(exc, TimeoutError):
+        return True
+    return any("Timeout" in cls.__name__ for cls in type(exc).__mro__)
+
+
+def classify_error(exc: BaseException) -> str:
+    """
+    Classify a failed request as timeout, rate limited (429), server error (5xx) or other.
+    """
+    if is_timeout(exc):
+        return TIMEOUT
+
+    status_code = get_status_code(exc)
+    if status_code == 429:
+        return RATE_LIMIT
+    if status_code is not None and 500 <= status_code < 600:
+        return SERVER_ERROR
+    return OTHER
+
+
+def is_overload_error(kind: str) -> bool:
+    """
+    Errors that signal the provider is overloaded and concurrency should back off
+    (a timeout is the extreme case of latency inflation).
+    """
+    return kind in (RATE_LIMIT, SERVER_ERROR, TIMEOUT)
+
+
+def is_retryable_error(kind: str) -> bool:
+    return kind in RETRYABLE_ERRORS
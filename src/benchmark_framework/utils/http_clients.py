@@ -0,0 +1,110 @@
+import importlib.util
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, Tuple
+
+import httpx
+from openai import DefaultHttpxClient
+
+# Seconds an idle connection is kept open for reuse
+KEEPALIVE_EXPIRY = 60.0
+
+
+@dataclass
+class ConnectionStats:
+    """
+    Thread-safe counters of requests and the connections opened to serve them.
+    """
+
+    requests: int = 0
+    http2_requests: int = 0
+    connections: int = 0
+    tls_handshakes: int = 0
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def trace(self, event_name: str, info: Dict[str, Any]) -> None:
+        """
+        httpcore trace callback; counts new connections and TLS handshakes.
+        """
+        if event_name == "connection.connect_tcp.complete":
+            with self._lock:
+                self.connections += 1
+        elif event_name == "connection.start_tls.complete":
+            with self._lock:
+                self.tls_handshakes += 1
+
+    def on_request(self, request: httpx.Request) -> None:
+        request.extensions["trace"] = self.trace
+
+    def on_response(self, response: httpx.Response) -> None:
+        with self._lock:
+            self.requests += 1
+            if response.http_version == "HTTP/2":
+                self.http2_requests += 1
+
+    def event_hooks(self) -> Dict[str, list]:
+        return {"request": [self.on_request], "response": [self.on_response]}
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            per_1000 = 1000 / self.requests if self.requests else 0.0
+            return {
+                "requests": self.requests,
+                "http2_requests": self.http2_requests,
+                "connections": self.connections,
+                "tls_handshakes": self.tls_handshakes,
+                "connections_per_1000_requests": self.connections * per_1000,
+                "tls_handshakes_per_1000_requests": self.tls_handshakes * per_1000,
+            }
+
+    def print_summary(self) -> None:
+        summary = self.summary()
+        print("\n=== HTTP connections ===")
+        print(
+            f"  Requests: {summary['requests']} "
+            f"({summary['http2_requests']} over HTTP/2)"
+        )
+        print(
+            f"  New connections: {summary['connections']} "
+            f"({summary['connections_per_1000_requests']:.1f} per 1000 requests)"
+        )
+        print(
+            f"  TLS handshakes: {summary['tls_handshakes']} "
+            f"({summary['tls_handshakes_per_1000_requests']:.1f} per 1000 requests)"
+        )
+
+
+# Shared by every client handed out below
+connection_stats = ConnectionStats()
+
+_clients: Dict[Tuple[int, bool], httpx.Client] = {}
+_clients_lock = threading.Lock()
+
+
+def get_http_client(pool_size: int, http2: bool = False) -> httpx.Client:
+    """
+    httpx client shared by all OpenAI-SDK adapters with the same pool settings,
+    so concurrent workers and models reuse kept-alive connections.
+
+    HTTP/2 needs the optional `h2` package; without it the client falls back to
+    HTTP/1.1.
+    """
+    if http2 and importlib.util.find_spec("h2") is None:
+        print("[WARNING] HTTP/2 needs the 'h2' package (httpx[http2]); using HTTP/1.1.")
+        http2 = False
+
+    key = (pool_size, http2)
+    with _clients_lock:
+        if key not in _clients:
+            _clients[key] = DefaultHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=pool_size,
+                    max_keepalive_connections=pool_size,
+                    keepalive_expiry=KEEPALIVE_EXPIRY,
+                ),
+                http2=http2,
+                event_hooks=connection_stats.event_hooks(),
+            )
+        return _clients[key]
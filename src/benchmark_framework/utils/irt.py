@@ -0,0 +1,251 @@
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.common.file_operations import FileOperations
+from src.constants import ENCODING
+
+# Ability grid used for expected a posteriori (EAP) estimates, N(0, 1) prior
+THETA_GRID = np.linspace(-4.0, 4.0, 161)
+THETA_PRIOR = np.exp(-0.5 * THETA_GRID**2)
+
+
+def get_item_key(year: int, exam_type: str, item_id: int) -> str:
+    """
+    Identifier of an exam question across years and exam types.
+    """
+    return f"{year}/{exam_type}/{item_id}"
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+def load_response_matrix(
+    metrics_dir: Path, exclude_models: Iterable[str] = ()
+) -> Tuple[List[str], List[str], np.ndarray]:
+    """
+    Load answer correctness of every model in `metrics_dir` (results with metrics).
+
+    Returns item keys, model names and a models x items matrix of 0/1 scores with
+    NaN where a model has no result for an item.
+    """
+    exclude = set(exclude_models)
+    scores: Dict[str, Dict[str, float]] = {}
+    for model_dir in sorted(d for d in metrics_dir.iterdir() if d.is_dir()):
+        if model_dir.name in exclude:
+            continue
+        model_scores = {}
+        for file_path in sorted((model_dir / "exams").glob("*/*.jsonl")):
+            for row in FileOperations.load_jsonl(file_path):
+                answer = row.get("accuracy_metrics", {}).get("answer")
+                if answer is None:
+                    continue
+                key = get_item_key(row["year"], row["exam_type"], row["id"])
+                model_scores[key] = float(answer)
+        if model_scores:
+            scores[model_dir.name] = model_scores
+
+    model_names = list(scores)
+    item_keys = sorted(
+        {key for model_scores in scores.values() for key in model_scores}
+    )
+    item_index = {key: i for i, key in enumerate(item_keys)}
+    matrix = np.full((len(model_names), len(item_keys)), np.nan)
+    for row, model_name in enumerate(model_names):
+        for key, score in scores[model_name].items():
+            matrix[row, item_index[key]] = score
+    return item_keys, model_names, matrix
+
+
+def fit_2pl(
+    responses: np.ndarray,
+    n_iter: int = 2000,
+    learning_rate: float = 0.5,
+    difficulty_prior_sd: float = 2.0,
+    log_discrimination_prior_sd: float = 0.5,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Fit a two-parameter logistic IRT model by penalised joint maximum likelihood.
+
+    `responses` is a models x items matrix of 0/1 scores (NaN for missing).
+    Normal priors on abilities, difficulties and log-discriminations keep the
+    estimates finite for items every model answered the same way.
+    Returns (discrimination, difficulty, ability).
+    """
+    observed = ~np.isnan(responses)
+    scores = np.where(observed, responses, 0.0)
+    n_models, n_items = responses.shape
+    per_model = np.maximum(observed.sum(axis=1), 1)
+    per_item = np.maximum(observed.sum(axis=0), 1)
+
+    theta = np.zeros(n_models)
+    log_a = np.zeros(n_items)
+    b = np.zeros(n_items)
+    for _ in range(n_iter):
+        a = np.exp(log_a)
+        p = _sigmoid(a * (theta[:, None] - b))
+        residual = observed * (scores - p)
+
+        grad_theta = residual @ a - theta
+        grad_log_a = (
+            a * (residual * (theta[:, None] - b)).sum(axis=0)
+            - log_a / log_discrimination_prior_sd**2
+        )
+        grad_b = -a * residual.sum(axis=0) - b / difficulty_prior_sd**2
+
+        theta += learning_rate * grad_theta / per_model
+        log_a += learning_rate * grad_log_a / per_item
+        b += learning_rate * grad_b / per_item
+
+    return np.exp(log_a), b, theta
+
+
+def item_information(
+    discrimination: np.ndarray, difficulty: np.ndarray, theta: float
+) -> np.ndarray:
+    """
+    Fisher information of each item at ability `theta`.
+    """
+    p = _sigmoid(discrimination * (theta - difficulty))
+    return discrimination**2 * p * (1 - p)
+
+
+def estimate_ability(
+    discrimination: np.ndarray, difficulty: np.ndarray, scores: np.ndarray
+) -> Tuple[float, float]:
+    """
+    EAP ability estimate and its standard error (posterior standard deviation)
+    from 0/1 scores on the given items.
+    """
+    p = _sigmoid(discrimination * (THETA_GRID[:, None] - difficulty))
+    log_likelihood = (
+        scores * np.log(p + 1e-12) + (1 - scores) * np.log(1 - p + 1e-12)
+    ).sum(axis=1)
+    posterior = THETA_PRIOR * np.exp(log_likelihood - log_likelihood.max())
+    posterior /= posterior.sum()
+
+    theta = float((THETA_GRID * posterior).sum())
+    se = float(np.sqrt(((THETA_GRID - theta) ** 2 * posterior).sum()))
+    return theta, se
+
+
+@dataclass
+class ItemParameters:
+    """
+    Calibrated 2PL parameters of an item bank.
+    """
+
+    item_keys: List[str]
+    discrimination: np.ndarray
+    difficulty: np.ndarray
+    calibration_models: List[str] = field(default_factory=list)
+
+    @classmethod
+    def fit(
+        cls, metrics_dir: Path, exclude_models: Iterable[str] = ()
+    ) -> "ItemParameters":
+        item_keys, model_names, matrix = load_response_matrix(
+            metrics_dir, exclude_models
+        )
+        if len(model_names) < 2:
+            raise ValueError(
+                f"Need results of at least 2 models in '{metrics_dir}' to calibrate items, "
+                f"found {len(model_names)}."
+            )
+        discrimination, difficulty, _ = fit_2pl(matrix)
+        return cls(item_keys, discrimination, difficulty, model_names)
+
+    def index(self) -> Dict[str, int]:
+        return {key: i for i, key in enumerate(self.item_keys)}
+
+    def expected_accuracy(self, theta: float) -> float:
+        """
+        Expected share of correct answers on the whole item bank at ability `theta`.
+        """
+        return float(_sigmoid(self.discrimination * (theta - self.difficulty)).mean())
+
+
+class AdaptiveTester:
+    """
+    Computerised adaptive test over a calibrated item bank.
+
+    Each next item is the one with maximum Fisher information at the current
+    ability estimate; testing stops once the standard error of the estimate
+    drops to `target_se` or `max_items` have been answered.
+    """
+
+    def __init__(
+        self,
+        item_parameters: ItemParameters,
+        target_se: float,
+        max_items: Optional[int] = None,
+    ):
+        self.item_parameters = item_parameters
+        self.target_se = target_se
+        self.max_items = max_items
+        self._index = item_parameters.index()
+        self.answered: List[str] = []
+        self.scores: List[float] = []
+        self.history: List[dict] = []
+        self.theta, self.se = estimate_ability(np.empty(0), np.empty(0), np.empty(0))
+
+    @property
+    def done(self) -> bool:
+        if self.max_items is not None and len(self.answered) >= self.max_items:
+            return True
+        return bool(self.answered) and self.se <= self.target_se
+
+    def next_item(self, available: Sequence[str]) -> Optional[str]:
+        candidates = [key for key in available if key in self._index]
+        if not candidates:
+            return None
+        indices = np.array([self._index[key] for key in candidates])
+        information = item_information(
+            self.item_parameters.discrimination[indices],
+            self.item_parameters.difficulty[indices],
+            self.theta,
+        )
+        return candidates[int(np.argmax(information))]
+
+    def record(self, item_key: str, score: float) -> None:
+        self.answered.append(item_key)
+        self.scores.append(score)
+
+        indices = np.array([self._index[key] for key in self.answered])
+        self.theta, self.se = estimate_ability(
+            self.item_parameters.discrimination[indices],
+            self.item_parameters.difficulty[indices],
+            np.array(self.scores),
+        )
+        self.history.append(
+            {"item": item_key, "score": score, "theta": self.theta, "se": self.se}
+        )
+
+    def summary(self) -> dict:
+        return {
+            "theta": self.theta,
+            "se": self.se,
+            "expected_accuracy": self.item_parameters.expected_accuracy(self.theta),
+            "items_answered": len(self.answered),
+            "items_total": len(self.item_parameters.item_keys),
+            "target_se": self.target_se,
+            "calibration_models": self.item_parameters.calibration_models,
+            "history": self.history,
+        }
+
+    def save(self, path: Path) -> None:
+        FileOperations.save_json(self.summary(), path)
+
+    def load(self, path: Path) -> None:
+        """
+        Replay answers from a saved session so an interrupted run resumes.
+        """
+        with open(path, "r", encoding=ENCODING) as f:
+            history = json.load(f).get("history", [])
+        for step in history:
+            if step["item"] in self._index:
+                self.record(step["item"], step["score"])
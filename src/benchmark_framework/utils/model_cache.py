@@ -0,0 +1,99 @@
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Callable, Optional, Sequence
+
+# Revision key of models loaded from a local directory
+LOCAL_REVISION = "local"
+
+
+def is_hub_offline() -> bool:
+    """
+    Whether the Hugging Face Hub must not be contacted (`HF_HUB_OFFLINE`).
+    """
+    return os.getenv("HF_HUB_OFFLINE", "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def get_newest_cached_revision(
+    cache_dir: Path, model_path: str, keys: Sequence[str] = ()
+) -> Optional[str]:
+    """
+    Most recently written revision of a model in a cache that holds the
+    conversion under `keys`, or None if there is none.
+    """
+    model_dir = get_cache_path(cache_dir, model_path)
+    if not model_dir.is_dir():
+        return None
+    entries = [
+        entry
+        for entry in model_dir.iterdir()
+        if entry.joinpath(*keys).is_dir() and not entry.name.startswith(".")
+    ]
+    if not entries:
+        return None
+    return max(entries, key=lambda entry: entry.joinpath(*keys).stat().st_mtime).name
+
+
+def resolve_revision(
+    model_path: str,
+    revision: Optional[str],
+    cache_dir: Optional[Path] = None,
+    keys: Sequence[str] = (),
+) -> str:
+    """
+    Commit hash of a Hub model's revision, so that moving branches invalidate
+    cached conversions. Local directories fall back to the given revision name.
+
+    Offline (`HF_HUB_OFFLINE`, or Hub metadata unreachable) the newest conversion
+    in `cache_dir` holding `keys` is reused, unless the given revision is cached
+    itself; without one, the given revision name is returned.
+    """
+    if Path(model_path).is_dir():
+        return revision or LOCAL_REVISION
+    if not is_hub_offline():
+        try:
+            from huggingface_hub import model_info
+
+            return model_info(model_path, revision=revision).sha
+        except Exception as e:
+            print(f"[WARNING] Could not resolve revision of '{model_path}': {e}")
+
+    if cache_dir is not None:
+        if (
+            revision is not None
+            and get_cache_path(cache_dir, model_path, revision, *keys).is_dir()
+        ):
+            return revision
+        cached = get_newest_cached_revision(cache_dir, model_path, keys)
+        if cached is not None:
+            print(f"[INFO] Offline: using cached revision {cached} of '{model_path}'.")
+            return cached
+    return revision or "main"
+
+
+def get_cache_path(cache_dir: Path, model_path: str, *keys: str) -> Path:
+    """
+    Directory of a cached conversion of a model, one level per key.
+    """
+    return cache_dir.joinpath(model_path.strip("/").replace("/", "--"), *keys)
+
+
+def save_atomically(path: Path, save: Callable[[Path], None]) -> None:
+    """
+    Write a cache directory through `save` into a staging directory next to it
+    and rename it into place, so an interrupted save is never picked up. If
+    another process renamed its copy into place first, that copy is kept.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Hidden, so that cache lookups never mistake it for a finished entry
+    staging_path = Path(tempfile.mkdtemp(prefix=".staging-", dir=path.parent))
+    try:
+        save(staging_path)
+        try:
+            staging_path.rename(path)
+        except OSError:
+            if not path.is_dir():
+                raise
+    finally:
+        shutil.rmtree(staging_path, ignore_errors=True)
@@ -0,0 +1,51 @@
+import math
+from pathlib import Path
+from typing import List, Optional
+
+import numpy as np
+
+from src.common.file_operations import FileOperations
+
+OUTPUT_CAP_PERCENTILE = 99
+# Headroom over the observed percentile
+OUTPUT_CAP_MARGIN = 1.25
+# Stored responses needed before a cap is derived
+MIN_OUTPUT_SAMPLES = 20
+
+
+def load_output_lengths(results_root: Path) -> List[int]:
+    """
+    Output tokens of stored single-question responses that were not truncated.
+    Packed and sampled results are skipped as their usage covers several answers.
+    """
+    lengths = []
+    for file_path in results_root.rglob("*.jsonl"):
+        for row in FileOperations.load_jsonl(file_path):
+            usage = row.get("usage")
+            if (
+                not usage
+                or row.get("truncated")
+                or row.get("pack_size", 1) > 1
+                or "sampled_responses" in row
+            ):
+                continue
+            lengths.append(usage["output_tokens"])
+    return lengths
+
+
+def derive_output_cap(
+    results_root: Path,
+    percentile: float = OUTPUT_CAP_PERCENTILE,
+    margin: float = OUTPUT_CAP_MARGIN,
+    min_samples: int = MIN_OUTPUT_SAMPLES,
+) -> Optional[int]:
+    """
+    Output token cap from the stored response lengths of one model and task type:
+    the given percentile plus a margin, or None with too few stored responses.
+    """
+    if not results_root.is_dir():
+        return None
+    lengths = load_output_lengths(results_root)
+    if len(lengths) < min_samples:
+        return None
+    return math.ceil(np.percentile(lengths, percentile) * margin)
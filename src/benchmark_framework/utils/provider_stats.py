@@ -0,0 +1,100 @@
+import json
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from src.common.file_operations import FileOperations
+from src.constants import ENCODING
+
+# Statistics file in the results directory, shared by all models
+PROVIDER_STATS_FILENAME = ".provider_stats.json"
+# Requests per provider kept for ranking; older ones are forgotten
+RECENT_REQUESTS = 50
+# Floor of the success rate so that failing providers rank last but stay finite
+MIN_SUCCESS_RATE = 0.05
+
+
+def get_provider_slug(provider_name: str) -> str:
+    """
+    OpenRouter provider slug from the name reported in responses ("Google AI Studio"
+    -> "google-ai-studio").
+    """
+    return provider_name.strip().lower().replace(" ", "-")
+
+
+class ProviderStats:
+    """
+    Latency and error rate of recent requests per model and upstream provider.
+
+    Providers are ranked by expected seconds per successful request: the mean
+    latency of recent successes divided by the recent success rate. Statistics
+    are saved to a JSON file after every update so they carry over to later runs.
+    """
+
+    def __init__(self, path: Optional[Path] = None):
+        self.path = path
+        self._lock = threading.Lock()
+        # model name -> provider slug -> {"latencies": [...], "errors": [0/1, ...]}
+        self.stats: Dict[str, Dict[str, Dict[str, List[float]]]] = {}
+        if path is not None and path.exists():
+            with open(path, "r", encoding=ENCODING) as f:
+                self.stats = json.load(f)
+
+    def _provider(self, model_name: str, provider: str) -> Dict[str, List[float]]:
+        providers = self.stats.setdefault(model_name, {})
+        return providers.setdefault(
+            get_provider_slug(provider), {"latencies": [], "errors": []}
+        )
+
+    def record_success(self, model_name: str, provider: str, latency: float) -> None:
+        with self._lock:
+            record = self._provider(model_name, provider)
+            record["latencies"] = (record["latencies"] + [latency])[-RECENT_REQUESTS:]
+            record["errors"] = (record["errors"] + [0])[-RECENT_REQUESTS:]
+            self._save()
+
+    def record_error(self, model_name: str, provider: str) -> None:
+        with self._lock:
+            record = self._provider(model_name, provider)
+            record["errors"] = (record["errors"] + [1])[-RECENT_REQUESTS:]
+            self._save()
+
+    def score(self, model_name: str, provider: str) -> float:
+        """
+        Expected seconds per successful request (lower is better).
+        """
+        record = self.stats.get(model_name, {}).get(get_provider_slug(provider))
+        if not record or not record["latencies"]:
+            return float("inf")
+        mean_latency = sum(record["latencies"]) / len(record["latencies"])
+        success_rate = 1 - sum(record["errors"]) / len(record["errors"])
+        return mean_latency / max(success_rate, MIN_SUCCESS_RATE)
+
+    def rank(self, model_name: str) -> List[str]:
+        """
+        Provider slugs with history for the model, fastest first.
+        """
+        with self._lock:
+            providers = list(self.stats.get(model_name, {}))
+            return sorted(
+                providers, key=lambda provider: self.score(model_name, provider)
+            )
+
+    def _save(self) -> None:
+        if self.path is not None:
+            FileOperations.save_json(self.stats, self.path)
+
+
+_shared_stats: Dict[Path, ProviderStats] = {}
+_shared_stats_lock = threading.Lock()
+
+
+def get_provider_stats(path: Path) -> ProviderStats:
+    """
+    Statistics backed by `path`, shared by all models of the process so that they
+    do not overwrite each other's updates.
+    """
+    with _shared_stats_lock:
+        if path not in _shared_stats:
+            _shared_stats[path] = ProviderStats(path)
+        return _shared_stats[path]
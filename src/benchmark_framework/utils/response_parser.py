@@ -16,6 +16,33 @@ def strip_markdown_code_blocks(text: str) -> str:
     return text
 
 
+def extract_json_objects(response_text: str) -> list[dict]:
+    """
+    Extract JSON objects from a response that should contain a JSON array of objects.
+    Falls back to parsing each flat {...} object separately when the array is invalid.
+    """
+    text = strip_markdown_code_blocks(response_text)
+
+    try:
+        parsed = json.loads(text)
+        if isinstance(parsed, list):
+            return [item for item in parsed if isinstance(item, dict)]
+        if isinstance(parsed, dict):
+            return [parsed]
+    except json.JSONDecodeError:
+        pass
+
+    objects = []
+    for match in re.finditer(r"\{[^{}]*\}", text, re.DOTALL):
+        try:
+            parsed = json.loads(match.group(0))
+        except json.JSONDecodeError:
+            continue
+        if isinstance(parsed, dict):
+            objects.append(parsed)
+    return objects
+
+
 def extract_json_field(response_text: str, field_name: str, default: str = "") -> str:
     text = strip_markdown_code_blocks(response_text)
 
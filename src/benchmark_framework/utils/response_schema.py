@@ -0,0 +1,36 @@
+from typing import Dict, Sequence
+
+# Name of the schema (and of the forced tool for providers without JSON schemas)
+RESPONSE_SCHEMA_NAME = "answer"
+
+
+def string_field(description: str, enum: Sequence[str] = ()) -> dict:
+    field = {"type": "string", "description": description}
+    if enum:
+        field["enum"] = list(enum)
+    return field
+
+
+def build_response_schema(fields: Dict[str, dict]) -> dict:
+    """
+    JSON schema of a response object with exactly the given fields, all required.
+
+    `additionalProperties` is disabled so the schema is accepted by strict
+    structured-output modes (OpenAI).
+    """
+    return {
+        "type": "object",
+        "properties": fields,
+        "required": list(fields),
+        "additionalProperties": False,
+    }
+
+
+def get_json_schema_format(schema: dict) -> dict:
+    """
+    `response_format` of OpenAI-compatible chat completions for a strict JSON schema.
+    """
+    return {
+        "type": "json_schema",
+        "json_schema": {"name": RESPONSE_SCHEMA_NAME, "schema": schema, "strict": True},
+    }
@@ -0,0 +1,44 @@
+import heapq
+from collections import defaultdict
+from typing import Callable, Hashable, List, Sequence, TypeVar
+
+T = TypeVar("T")
+
+
+def interleave_by_group(items: List[T], key: Callable[[T], Hashable]) -> List[T]:
+    """
+    Reorder items round-robin across groups so that any prefix of the result
+    covers all groups as evenly as possible. Order within a group is preserved.
+    """
+    groups = defaultdict(list)
+    for item in items:
+        groups[key(item)].append(item)
+
+    ordered_groups = [groups[k] for k in sorted(groups, key=str)]
+    result = []
+    for i in range(max((len(g) for g in ordered_groups), default=0)):
+        for group in ordered_groups:
+            if i < len(group):
+                result.append(group[i])
+    return result
+
+
+def order_longest_first(items: List[T], cost: Callable[[T], float]) -> List[T]:
+    """
+    Longest-processing-time-first (LPT) order: the most expensive items start first,
+    so the cheap ones fill the gaps at the end instead of one huge item finishing alone.
+    """
+    return sorted(items, key=cost, reverse=True)
+
+
+def estimate_makespan(costs: Sequence[float], workers: int) -> float:
+    """
+    Makespan of greedy list scheduling: each item in order goes to the worker that
+    becomes free first.
+    """
+    if workers < 1:
+        raise ValueError("workers must be >= 1")
+    finish_times = [0.0] * min(workers, max(len(costs), 1))
+    for cost in costs:
+        heapq.heappush(finish_times, heapq.heappop(finish_times) + cost)
+    return max(finish_times)
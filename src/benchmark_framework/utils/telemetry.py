@@ -0,0 +1,117 @@
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class RunTelemetry:
+    """
+    Thread-safe counters describing a single benchmark run.
+    """
+
+    requests: int = 0
+    successes: int = 0
+    errors: Counter = field(default_factory=Counter)
+    retries: int = 0
+    packed_requests: int = 0
+    packed_tasks: int = 0
+    pack_fallbacks: int = 0
+    batches: int = 0
+    batched_tasks: int = 0
+    truncation_retries: int = 0
+    total_latency: float = 0.0
+    wall_time: float = 0.0
+    concurrency_limit: Optional[int] = None
+    max_concurrency_limit: Optional[int] = None
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )
+
+    def record_success(self, latency: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.successes += 1
+            self.total_latency += latency
+
+    def record_error(self, kind: str) -> None:
+        with self._lock:
+            self.requests += 1
+            self.errors[kind] += 1
+
+    def record_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def record_truncation_retry(self) -> None:
+        with self._lock:
+            self.truncation_retries += 1
+
+    def record_pack(self, size: int, fallbacks: int) -> None:
+        with self._lock:
+            self.packed_requests += 1
+            self.packed_tasks += size
+            self.pack_fallbacks += fallbacks
+
+    def record_batch(self, size: int) -> None:
+        with self._lock:
+            self.batches += 1
+            self.batched_tasks += size
+
+    def record_concurrency_limit(self, limit: int) -> None:
+        with self._lock:
+            self.concurrency_limit = limit
+            if self.max_concurrency_limit is None or limit > self.max_concurrency_limit:
+                self.max_concurrency_limit = limit
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "successes": self.successes,
+                "errors": dict(self.errors),
+                "retries": self.retries,
+                "packed_requests": self.packed_requests,
+                "packed_tasks": self.packed_tasks,
+                "pack_fallbacks": self.pack_fallbacks,
+                "batches": self.batches,
+                "batched_tasks": self.batched_tasks,
+                "truncation_retries": self.truncation_retries,
+                "wall_time": self.wall_time,
+                "avg_latency": (
+                    self.total_latency / self.successes if self.successes else 0.0
+                ),
+                "concurrency_limit": self.concurrency_limit,
+                "max_concurrency_limit": self.max_concurrency_limit,
+            }
+
+    def print_summary(self) -> None:
+        summary = self.summary()
+        print("\n=== Run telemetry ===")
+        print(f"  Requests: {summary['requests']} ({summary['successes']} succeeded)")
+        for kind, count in sorted(summary["errors"].items()):
+            print(f"  Errors ({kind}): {count}")
+        print(f"  Retries: {summary['retries']}")
+        print(f"  Average latency: {summary['avg_latency']:.2f}s")
+        if summary["packed_requests"]:
+            print(
+                f"  Packed requests: {summary['packed_requests']} for "
+                f"{summary['packed_tasks']} tasks "
+                f"({summary['pack_fallbacks']} fell back to single requests)"
+            )
+        if summary["batches"]:
+            print(
+                f"  Batched generation: {summary['batched_tasks']} tasks in "
+                f"{summary['batches']} model calls"
+            )
+        if summary["truncation_retries"]:
+            print(
+                f"  Truncated responses retried with a higher output cap: "
+                f"{summary['truncation_retries']}"
+            )
+        print(f"  Wall time: {summary['wall_time']:.2f}s")
+        if summary["concurrency_limit"] is not None:
+            print(
+                f"  Concurrency limit: {summary['concurrency_limit']} "
+                f"(peak {summary['max_concurrency_limit']})"
+            )
@@ -0,0 +1,105 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.models.openai import OpenAIModel
+from src.benchmark_framework.utils.cassette import (
+    Cassette,
+    CassetteServer,
+    get_request_key,
+)
+
+COMPLETION = {
+    "id": "chatcmpl-1",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4o",
+    "choices": [
+        {
+            "index": 0,
+            "finish_reason": "stop",
+            "message": {"role": "assistant", "content": '{"answer": "B"}'},
+        }
+    ],
+    "usage": {"prompt_tokens": 12, "completion_tokens": 4, "total_tokens": 16},
+}
+
+
+class UpstreamHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = json.dumps(COMPLETION).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def upstream_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), UpstreamHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture(autouse=True)
+def api_key(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+
+
+def ask(base_url: str) -> tuple:
+    model = OpenAIModel("gpt-4o", ModelConfig(base_url=base_url))
+    response = model.generate_response("system", "prompt")
+    return response, model.pop_call_info()
+
+
+def test_request_key_ignores_credentials_and_key_order():
+    first = get_request_key("POST", "/v1/x?key=secret", b'{"a": 1, "b": 2}')
+    second = get_request_key("POST", "/v1/x?key=other", b'{"b": 2, "a": 1}')
+
+    assert first == second
+    assert first != get_request_key("POST", "/v1/y", b'{"a": 1, "b": 2}')
+
+
+def test_recorded_exchanges_replay_without_upstream(tmp_path, upstream_url):
+    cassette_path = tmp_path / "openai.jsonl"
+    recorder = CassetteServer(cassette_path, upstream_url, record_mode=True)
+    recorded = ask(recorder.start())
+    recorder.stop()
+
+    replayer = CassetteServer(
+        cassette_path, "https://api.openai.com/v1", latency_scale=0
+    )
+    replayed = ask(replayer.start())
+    replayer.stop()
+
+    assert len(Cassette(cassette_path)) == 1
+    assert recorded == replayed
+    assert replayed[0] == '{"answer": "B"}'
+    assert replayed[1]["input_tokens"] == 12
+
+
+def test_replay_injects_errors_and_rejects_unknown_requests(tmp_path):
+    server = CassetteServer(
+        tmp_path / "empty.jsonl", "https://api.openai.com/v1", error_rate=1.0, seed=0
+    )
+    base_url = server.start()
+    injected = httpx.post(f"{base_url}/chat/completions", json={})
+    server.error_rate = 0.0
+    unknown = httpx.post(f"{base_url}/chat/completions", json={})
+    server.stop()
+
+    assert injected.status_code in (429, 503)
+    assert unknown.status_code == 404
@@ -0,0 +1,115 @@
+import random
+
+import pytest
+
+from src.benchmark_framework.utils.concurrency import AIMDLimiter
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_limit_starts_at_floor():
+    limiter = AIMDLimiter(min_limit=2, max_limit=10)
+    assert limiter.limit == 2
+
+
+def test_additive_increase_on_success():
+    limiter = AIMDLimiter(min_limit=1, max_limit=10)
+    for _ in range(10):
+        limiter.on_success(latency=1.0)
+    assert limiter.limit > 1
+
+
+def test_limit_never_exceeds_ceiling():
+    limiter = AIMDLimiter(min_limit=1, max_limit=3)
+    for _ in range(100):
+        limiter.on_success(latency=1.0)
+    assert limiter.limit == 3
+
+
+def test_multiplicative_decrease_on_overload():
+    limiter = AIMDLimiter(min_limit=1, max_limit=16, initial_limit=16)
+    limiter.on_overload()
+    assert limiter.limit == 8
+
+
+def test_decrease_never_goes_below_floor():
+    clock = FakeClock()
+    limiter = AIMDLimiter(min_limit=2, max_limit=16, initial_limit=4, clock=clock)
+    for _ in range(5):
+        clock.now += 10
+        limiter.on_overload()
+    assert limiter.limit == 2
+
+
+def test_burst_of_overloads_decreases_once_within_cooldown():
+    clock = FakeClock()
+    limiter = AIMDLimiter(
+        min_limit=1, max_limit=16, initial_limit=16, cooldown=1.0, clock=clock
+    )
+    limiter.on_overload()
+    limiter.on_overload()
+    assert limiter.limit == 8
+
+    clock.now += 2.0
+    limiter.on_overload()
+    assert limiter.limit == 4
+
+
+def test_sustained_latency_inflation_decreases_limit():
+    limiter = AIMDLimiter(
+        min_limit=1, max_limit=16, initial_limit=8, latency_tolerance=2.0
+    )
+    for _ in range(20):
+        limiter.on_success(latency=1.0)
+    limit_before = limiter.limit
+    for _ in range(5):
+        limiter.on_success(latency=5.0)
+    assert limiter.limit < limit_before
+
+
+def test_single_slow_request_does_not_decrease_limit():
+    limiter = AIMDLimiter(min_limit=1, max_limit=16, initial_limit=8)
+    for _ in range(20):
+        limiter.on_success(latency=1.0)
+    limit_before = limiter.limit
+    limiter.on_success(latency=5.0)
+    assert limiter.limit >= limit_before
+
+
+@pytest.mark.parametrize("sigma", [0.3, 0.5])
+def test_jittered_latency_without_overload_reaches_ceiling(sigma):
+    rng = random.Random(0)
+    clock = FakeClock()
+    limiter = AIMDLimiter(min_limit=1, max_limit=16, clock=clock)
+    limits = []
+    for _ in range(1000):
+        latency = 0.1 * rng.lognormvariate(0.0, sigma)
+        clock.now += latency
+        limiter.on_success(latency=latency)
+        limits.append(limiter.limit)
+    assert limiter.limit == 16
+    assert min(limits[500:]) == 16
+
+
+def test_acquire_and_release_track_in_flight():
+    limiter = AIMDLimiter(min_limit=2, max_limit=2)
+    limiter.acquire()
+    limiter.acquire()
+    assert limiter.in_flight == 2
+    limiter.release()
+    assert limiter.in_flight == 1
+
+
+@pytest.mark.parametrize(
+    "min_limit,max_limit",
+    [(0, 4), (4, 2)],
+)
+def test_invalid_bounds_raise(min_limit, max_limit):
+    with pytest.raises(ValueError):
+        AIMDLimiter(min_limit=min_limit, max_limit=max_limit)
@@ -0,0 +1,90 @@
+import json
+import string
+
+from src.benchmark_framework.utils.constrained_decoding import (
+    SchemaConstraint,
+    TokenIndex,
+    get_schema_segments,
+)
+from src.benchmark_framework.utils.response_schema import (
+    build_response_schema,
+    string_field,
+)
+
+SCHEMA = build_response_schema(
+    {
+        "answer": string_field("Litera odpowiedzi", ["A", "B", "C"]),
+        "legal_basis": string_field("Przepis"),
+    }
+)
+# Single characters plus a few merged tokens, like a BPE vocabulary; id 0 is EOS
+VOCAB = ["", *string.printable, '{"', '": "', '", "', '"}', '",', "answer", " k.c."]
+EOS = 0
+
+
+def _text_id(text):
+    return VOCAB.index(text)
+
+
+def _generate(constraint, target, max_tokens=200):
+    """
+    Emit the longest allowed token matching the rest of `target` until EOS. Off
+    target, close the open string or take the first allowed token.
+    """
+    output = ""
+    for _ in range(max_tokens):
+        allowed = constraint.allowed_tokens()
+        if allowed == [EOS]:
+            return output
+        rest = target[len(output) :] if target.startswith(output) else ""
+        matching = [i for i in allowed if rest.startswith(VOCAB[i])] or [
+            i for i in allowed if '"' in VOCAB[i]
+        ]
+        token_id = max(matching or allowed[:1], key=lambda i: len(VOCAB[i]))
+        output += VOCAB[token_id]
+        constraint.advance(token_id)
+    raise AssertionError(f"No EOS after {max_tokens} tokens: {output!r}")
+
+
+def test_schema_segments_force_keys_and_enum_values():
+    assert get_schema_segments(SCHEMA) == [
+        (
+            '{"answer": "A", "legal_basis": "',
+            '{"answer": "B", "legal_basis": "',
+            '{"answer": "C", "legal_basis": "',
+        ),
+        None,
+        ('"}',),
+    ]
+
+
+def test_generation_follows_schema_and_ends_at_closing_brace():
+    constraint = SchemaConstraint(SCHEMA, TokenIndex(VOCAB, EOS))
+
+    output = _generate(constraint, '{"answer": "B", "legal_basis": "art. 415 k.c."}')
+
+    assert json.loads(output) == {"answer": "B", "legal_basis": "art. 415 k.c."}
+    assert constraint.done
+    assert constraint.allowed_tokens() == [EOS]
+
+
+def test_prose_and_answers_outside_enum_are_not_allowed():
+    constraint = SchemaConstraint(SCHEMA, TokenIndex(VOCAB, EOS))
+
+    output = _generate(constraint, 'Odpowiedź: {"answer": "D", "legal_basis": "x"}')
+
+    assert output.startswith('{"answer": "')
+    assert json.loads(output)["answer"] in ("A", "B", "C")
+
+
+def test_strings_exclude_escapes_and_control_characters():
+    constraint = SchemaConstraint(SCHEMA, TokenIndex(VOCAB, EOS))
+    for text in '{"answer": "A", "legal_basis": "':
+        constraint.advance(_text_id(text))
+
+    allowed = {VOCAB[i] for i in constraint.allowed_tokens()}
+
+    assert "a" in allowed and " k.c." in allowed
+    # Quotes only close the string into the following part
+    assert '"' in allowed and '"}' in allowed and '",' not in allowed
+    assert "\\" not in allowed and "\n" not in allowed
@@ -0,0 +1,125 @@
+import json
+import threading
+from datetime import date
+
+import pytest
+
+from src.benchmark_framework.configs.pricing import ModelPrice, load_price_table
+from src.benchmark_framework.utils.cost_tracker import CostTracker
+
+PRICES = {"model-a": ModelPrice(input_per_million=1.0, output_per_million=2.0)}
+
+
+def test_record_prices_tokens():
+    tracker = CostTracker(PRICES)
+
+    cost = tracker.record("model-a", input_tokens=1_000_000, output_tokens=500_000)
+
+    assert cost == pytest.approx(2.0)
+    assert tracker.run_cost == pytest.approx(2.0)
+
+
+def test_unpriced_model_counts_tokens_at_zero_cost():
+    tracker = CostTracker(PRICES)
+
+    cost = tracker.record("unknown", input_tokens=100, output_tokens=10)
+
+    assert cost == 0.0
+    assert tracker.breakdown()["models"]["unknown"]["input_tokens"] == 100
+
+
+def test_breakdown_per_model():
+    tracker = CostTracker(PRICES)
+    tracker.record("model-a", 10, 5)
+    tracker.record("model-a", 20, 5)
+
+    usage = tracker.breakdown()["models"]["model-a"]
+
+    assert usage["requests"] == 2
+    assert usage["input_tokens"] == 30
+    assert usage["output_tokens"] == 10
+
+
+def test_run_budget_exceeded():
+    tracker = CostTracker(PRICES, max_run_cost=1.0)
+    assert not tracker.run_budget_exceeded()
+
+    tracker.record("model-a", input_tokens=1_000_000, output_tokens=0)
+
+    assert tracker.run_budget_exceeded()
+
+
+def test_daily_budget_includes_ledger(tmp_path):
+    ledger_path = tmp_path / "ledger.json"
+    ledger_path.write_text(json.dumps({date.today().isoformat(): 4.5}))
+    tracker = CostTracker(PRICES, max_daily_cost=5.0, ledger_path=ledger_path)
+    assert not tracker.daily_budget_exceeded()
+
+    tracker.record("model-a", input_tokens=500_000, output_tokens=0)
+
+    assert tracker.daily_budget_exceeded()
+
+
+def test_save_writes_breakdown(tmp_path):
+    tracker = CostTracker(PRICES)
+    tracker.record("model-a", input_tokens=1_000_000, output_tokens=0)
+
+    tracker.save(tmp_path / "costs.json")
+
+    saved = json.loads((tmp_path / "costs.json").read_text())
+    assert saved["total_cost"] == pytest.approx(1.0)
+
+
+def test_ledger_is_persisted_after_each_request(tmp_path):
+    ledger_path = tmp_path / "ledger.json"
+    tracker = CostTracker(PRICES, ledger_path=ledger_path)
+
+    tracker.record("model-a", input_tokens=1_000_000, output_tokens=0)
+
+    ledger = json.loads(ledger_path.read_text())
+    assert ledger[date.today().isoformat()] == pytest.approx(1.0)
+
+
+def test_concurrent_runs_add_up_in_the_ledger(tmp_path):
+    ledger_path = tmp_path / "ledger.json"
+    first = CostTracker(PRICES, max_daily_cost=2.5, ledger_path=ledger_path)
+    second = CostTracker(PRICES, max_daily_cost=2.5, ledger_path=ledger_path)
+
+    first.record("model-a", input_tokens=1_000_000, output_tokens=0)
+    second.record("model-a", input_tokens=1_000_000, output_tokens=0)
+    assert not second.daily_budget_exceeded()
+    first.record("model-a", input_tokens=1_000_000, output_tokens=0)
+
+    ledger = json.loads(ledger_path.read_text())
+    assert ledger[date.today().isoformat()] == pytest.approx(3.0)
+    assert first.daily_budget_exceeded()
+
+
+def test_concurrent_workers_do_not_lose_ledger_updates(tmp_path):
+    ledger_path = tmp_path / "ledger.json"
+    tracker = CostTracker(PRICES, ledger_path=ledger_path)
+    threads = [
+        threading.Thread(
+            target=lambda: [tracker.record("model-a", 1_000_000, 0) for _ in range(10)]
+        )
+        for _ in range(4)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ledger = json.loads(ledger_path.read_text())
+    assert ledger[date.today().isoformat()] == pytest.approx(40.0)
+
+
+def test_load_price_table_overrides_defaults(tmp_path):
+    path = tmp_path / "prices.json"
+    path.write_text(
+        json.dumps({"model-b": {"input_per_million": 3.0, "output_per_million": 4.0}})
+    )
+
+    prices = load_price_table(path)
+
+    assert prices["model-b"] == ModelPrice(3.0, 4.0)
+    assert "gpt-4o" in prices
@@ -0,0 +1,62 @@
+from datetime import datetime
+
+import pytest
+
+from src.benchmark_framework.utils.deadline import DeadlineTracker, parse_deadline
+
+
+class FakeClock:
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.mark.parametrize(
+    "value,expected_seconds",
+    [("90m", 5400), ("8h", 28800), ("1h30m", 5400), ("45s", 45), ("1.5h", 5400)],
+)
+def test_parse_deadline_durations(value, expected_seconds):
+    assert parse_deadline(value, now=1000.0) == pytest.approx(1000.0 + expected_seconds)
+
+
+def test_parse_deadline_iso_datetime():
+    expected = datetime(2025, 3, 17, 9, 0).timestamp()
+    assert parse_deadline("2025-03-17T09:00") == expected
+
+
+@pytest.mark.parametrize("value", ["tomorrow", "", "10x"])
+def test_parse_deadline_invalid(value):
+    with pytest.raises(ValueError, match="Invalid deadline"):
+        parse_deadline(value)
+
+
+def test_tracker_allows_start_before_any_observation():
+    clock = FakeClock(0.0)
+    tracker = DeadlineTracker(deadline=10.0, clock=clock)
+
+    assert tracker.can_start()
+
+
+def test_tracker_stops_when_next_task_would_overrun():
+    clock = FakeClock(0.0)
+    tracker = DeadlineTracker(deadline=10.0, clock=clock)
+    tracker.record_completion(4.0)
+
+    clock.now = 5.0
+    assert tracker.can_start()
+
+    clock.now = 7.0
+    assert not tracker.can_start()
+    assert tracker.reached
+
+
+def test_tracker_predict_fit_uses_throughput_and_concurrency():
+    clock = FakeClock(0.0)
+    tracker = DeadlineTracker(deadline=100.0, clock=clock)
+    tracker.record_completion(10.0)
+
+    assert tracker.predict_fit(pending=50) == 10
+    assert tracker.predict_fit(pending=50, concurrency=4) == 40
+    assert tracker.predict_fit(pending=5, concurrency=4) == 5
@@ -0,0 +1,75 @@
+import pytest
+
+from src.benchmark_framework.utils.errors import (
+    OTHER,
+    RATE_LIMIT,
+    SERVER_ERROR,
+    TIMEOUT,
+    classify_error,
+    get_status_code,
+    is_overload_error,
+    is_retryable_error,
+)
+
+
+class StatusError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+
+
+class APITimeoutError(Exception):
+    """Mimics the SDK timeout exceptions (openai/anthropic APITimeoutError)."""
+
+
+class ReadTimeout(ValueError):
+    """Mimics httpx/requests timeouts, which do not derive from TimeoutError."""
+
+
+class FakeResponse:
+    def __init__(self, status_code):
+        self.status_code = status_code
+
+
+class ResponseError(Exception):
+    def __init__(self, status_code):
+        super().__init__(f"status {status_code}")
+        self.response = FakeResponse(status_code)
+
+
+@pytest.mark.parametrize(
+    "exc,expected",
+    [
+        (StatusError(429), RATE_LIMIT),
+        (StatusError(503), SERVER_ERROR),
+        (StatusError(400), OTHER),
+        (ResponseError(429), RATE_LIMIT),
+        (ResponseError(500), SERVER_ERROR),
+        (ValueError("boom"), OTHER),
+        (TimeoutError(), TIMEOUT),
+        (APITimeoutError("timed out"), TIMEOUT),
+        (ReadTimeout("timed out"), TIMEOUT),
+    ],
+)
+def test_classify_error(exc, expected):
+    assert classify_error(exc) == expected
+
+
+def test_get_status_code_missing_returns_none():
+    assert get_status_code(RuntimeError("no status")) is None
+
+
+@pytest.mark.parametrize(
+    "kind,expected",
+    [(RATE_LIMIT, True), (SERVER_ERROR, True), (TIMEOUT, True), (OTHER, False)],
+)
+def test_is_overload_error(kind, expected):
+    assert is_overload_error(kind) is expected
+
+
+@pytest.mark.parametrize(
+    "kind,expected",
+    [(RATE_LIMIT, True), (SERVER_ERROR, True), (TIMEOUT, True), (OTHER, False)],
+)
+def test_is_retryable_error(kind, expected):
+    assert is_retryable_error(kind) is expected
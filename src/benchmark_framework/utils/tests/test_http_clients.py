@@ -0,0 +1,57 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+import pytest
+
+from src.benchmark_framework.utils.http_clients import (
+    ConnectionStats,
+    get_http_client,
+)
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 keeps connections open between requests
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/"
+    server.shutdown()
+
+
+def test_kept_alive_connection_is_reused(server_url):
+    stats = ConnectionStats()
+    with httpx.Client(event_hooks=stats.event_hooks()) as client:
+        for _ in range(10):
+            client.get(server_url)
+
+    summary = stats.summary()
+    assert summary["requests"] == 10
+    assert summary["connections"] == 1
+    assert summary["connections_per_1000_requests"] == 100.0
+    assert summary["tls_handshakes"] == 0
+
+
+def test_clients_are_shared_per_pool_settings():
+    client = get_http_client(8)
+
+    assert get_http_client(8) is client
+    assert get_http_client(16) is not client
+
+
+def test_summary_without_requests():
+    assert ConnectionStats().summary()["tls_handshakes_per_1000_requests"] == 0.0
@@ -0,0 +1,123 @@
+import json
+
+import numpy as np
+import pytest
+
+from src.benchmark_framework.utils.irt import (
+    AdaptiveTester,
+    ItemParameters,
+    estimate_ability,
+    fit_2pl,
+    get_item_key,
+    item_information,
+    load_response_matrix,
+)
+
+
+def simulate_responses(rng, theta, discrimination, difficulty):
+    p = 1 / (1 + np.exp(-discrimination * (theta[:, None] - difficulty)))
+    return (rng.random(p.shape) < p).astype(float)
+
+
+def test_fit_2pl_recovers_ability_and_difficulty_order():
+    rng = np.random.default_rng(0)
+    theta = np.linspace(-1.5, 1.5, 10)
+    difficulty = rng.normal(size=300)
+    responses = simulate_responses(rng, theta, np.ones(300), difficulty)
+    responses[rng.random(responses.shape) < 0.1] = np.nan
+
+    _, fitted_difficulty, fitted_theta = fit_2pl(responses)
+
+    assert np.corrcoef(fitted_theta, theta)[0, 1] > 0.95
+    assert np.corrcoef(fitted_difficulty, difficulty)[0, 1] > 0.7
+
+
+def test_estimate_ability_without_answers_is_prior():
+    theta, se = estimate_ability(np.empty(0), np.empty(0), np.empty(0))
+
+    assert theta == pytest.approx(0.0, abs=1e-9)
+    assert se == pytest.approx(1.0, abs=0.01)
+
+
+def test_estimate_ability_moves_with_answers():
+    discrimination = np.ones(5)
+    difficulty = np.zeros(5)
+
+    high, high_se = estimate_ability(discrimination, difficulty, np.ones(5))
+    low, _ = estimate_ability(discrimination, difficulty, np.zeros(5))
+
+    assert high > 0 > low
+    assert high_se < 1.0
+
+
+def test_item_information_peaks_at_difficulty():
+    information = item_information(np.ones(3), np.array([-2.0, 0.0, 2.0]), 0.0)
+
+    assert np.argmax(information) == 1
+    assert information[1] == pytest.approx(0.25)
+
+
+def test_adaptive_tester_stops_at_target_se():
+    rng = np.random.default_rng(1)
+    keys = [str(i) for i in range(200)]
+    parameters = ItemParameters(keys, np.full(200, 1.5), rng.normal(size=200))
+    tester = AdaptiveTester(parameters, target_se=0.4)
+
+    available = list(keys)
+    while not tester.done:
+        key = tester.next_item(available)
+        available.remove(key)
+        tester.record(key, float(rng.random() < 0.7))
+
+    assert tester.se <= 0.4
+    assert len(tester.answered) < 50
+
+
+def test_adaptive_tester_max_items_and_resume(tmp_path):
+    keys = ["a", "b", "c"]
+    parameters = ItemParameters(keys, np.ones(3), np.array([-1.0, 0.0, 1.0]))
+    tester = AdaptiveTester(parameters, target_se=0.0, max_items=2)
+    tester.record("b", 1.0)
+    tester.record("c", 0.0)
+    assert tester.done
+
+    path = tmp_path / "adaptive.json"
+    tester.save(path)
+    resumed = AdaptiveTester(parameters, target_se=0.0)
+    resumed.load(path)
+
+    assert resumed.answered == ["b", "c"]
+    assert resumed.theta == pytest.approx(tester.theta)
+    assert resumed.next_item(["a", "unknown"]) == "a"
+
+
+def test_load_response_matrix(tmp_path):
+    for model_name, answers in [("m1", [1.0, 0.0]), ("m2", [1.0])]:
+        year_dir = tmp_path / model_name / "exams" / "2024"
+        year_dir.mkdir(parents=True)
+        with open(year_dir / "notarialny.jsonl", "w", encoding="utf-8") as f:
+            for item_id, answer in enumerate(answers, start=1):
+                row = {
+                    "id": item_id,
+                    "year": 2024,
+                    "exam_type": "notarialny",
+                    "accuracy_metrics": {"answer": answer},
+                }
+                f.write(json.dumps(row) + "\n")
+
+    item_keys, model_names, matrix = load_response_matrix(tmp_path)
+
+    assert item_keys == [
+        get_item_key(2024, "notarialny", 1),
+        get_item_key(2024, "notarialny", 2),
+    ]
+    assert model_names == ["m1", "m2"]
+    assert matrix[0].tolist() == [1.0, 0.0]
+    assert matrix[1, 0] == 1.0 and np.isnan(matrix[1, 1])
+
+
+def test_item_parameters_fit_requires_two_models(tmp_path):
+    (tmp_path / "m1" / "exams").mkdir(parents=True)
+
+    with pytest.raises(ValueError):
+        ItemParameters.fit(tmp_path)
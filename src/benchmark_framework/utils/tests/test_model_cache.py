@@ -0,0 +1,86 @@
+import os
+
+import pytest
+
+from src.benchmark_framework.utils.model_cache import (
+    LOCAL_REVISION,
+    get_cache_path,
+    get_newest_cached_revision,
+    resolve_revision,
+    save_atomically,
+)
+
+
+def test_local_directory_is_keyed_by_given_revision(tmp_path):
+    assert resolve_revision(str(tmp_path), None) == LOCAL_REVISION
+    assert resolve_revision(str(tmp_path), "v2") == "v2"
+
+
+def test_cache_path_has_one_level_per_key(tmp_path):
+    path = get_cache_path(tmp_path, "speakleash/Bielik", "abc123", "int8")
+
+    assert path == tmp_path / "speakleash--Bielik" / "abc123" / "int8"
+
+
+def test_save_atomically_moves_complete_directory_into_place(tmp_path):
+    path = tmp_path / "model" / "rev"
+
+    save_atomically(path, lambda staging: (staging / "config.json").write_text("{}"))
+
+    assert (path / "config.json").read_text() == "{}"
+    assert [p.name for p in path.parent.iterdir()] == ["rev"]
+
+
+def test_interrupted_save_leaves_no_cache(tmp_path):
+    path = tmp_path / "model" / "rev"
+
+    def save(staging):
+        (staging / "model.safetensors").write_text("partial")
+        raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        save_atomically(path, save)
+
+    assert not path.exists()
+    assert list(path.parent.iterdir()) == []
+
+
+def test_offline_reuses_newest_cached_revision(tmp_path, monkeypatch):
+    monkeypatch.setenv("HF_HUB_OFFLINE", "1")
+    old = get_cache_path(tmp_path, "org/model", "aaa111", "int8")
+    new = get_cache_path(tmp_path, "org/model", "bbb222", "int8")
+    other_key = get_cache_path(tmp_path, "org/model", "ccc333", "4bit")
+    for i, path in enumerate((old, new, other_key)):
+        path.mkdir(parents=True)
+        os.utime(path, (i, i))
+
+    assert resolve_revision("org/model", None, tmp_path, ("int8",)) == "bbb222"
+    assert resolve_revision("org/model", "aaa111", tmp_path, ("int8",)) == "aaa111"
+
+
+def test_offline_without_cache_keeps_revision_name(tmp_path, monkeypatch):
+    monkeypatch.setenv("HF_HUB_OFFLINE", "1")
+
+    assert resolve_revision("org/model", None, tmp_path) == "main"
+    assert resolve_revision("org/model", "v2", tmp_path) == "v2"
+
+
+def test_staging_directories_are_not_cached_revisions(tmp_path):
+    get_cache_path(tmp_path, "org/model", ".staging-x1").mkdir(parents=True)
+
+    assert get_newest_cached_revision(tmp_path, "org/model") is None
+
+
+def test_save_keeps_copy_saved_concurrently_by_another_process(tmp_path):
+    path = tmp_path / "model" / "rev"
+
+    def save(staging):
+        (staging / "config.json").write_text("ours")
+        # Another process finishes the same cache entry meanwhile
+        path.mkdir()
+        (path / "config.json").write_text("theirs")
+
+    save_atomically(path, save)
+
+    assert (path / "config.json").read_text() == "theirs"
+    assert [p.name for p in path.parent.iterdir()] == ["rev"]
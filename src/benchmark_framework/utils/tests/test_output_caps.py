@@ -0,0 +1,47 @@
+import json
+
+from src.benchmark_framework.utils.output_caps import (
+    derive_output_cap,
+    load_output_lengths,
+)
+
+
+def write_results(path, rows):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(row) + "\n")
+
+
+def test_load_output_lengths_skips_truncated_packed_and_sampled(tmp_path):
+    write_results(
+        tmp_path / "2024" / "notarialny.jsonl",
+        [
+            {"usage": {"output_tokens": 30}},
+            {"usage": {"output_tokens": 99}, "truncated": True},
+            {"usage": {"output_tokens": 10}, "pack_size": 5},
+            {"usage": {"output_tokens": 90}, "sampled_responses": ["a", "b", "c"]},
+            {"model_answer": "A"},
+        ],
+    )
+
+    assert load_output_lengths(tmp_path) == [30]
+
+
+def test_derive_output_cap_adds_margin_to_percentile(tmp_path):
+    write_results(
+        tmp_path / "2024" / "notarialny.jsonl",
+        [{"usage": {"output_tokens": 40}} for _ in range(30)],
+    )
+
+    assert derive_output_cap(tmp_path, percentile=99, margin=1.25) == 50
+
+
+def test_derive_output_cap_needs_enough_samples(tmp_path):
+    write_results(
+        tmp_path / "2024" / "notarialny.jsonl",
+        [{"usage": {"output_tokens": 40}} for _ in range(5)],
+    )
+
+    assert derive_output_cap(tmp_path, min_samples=20) is None
+    assert derive_output_cap(tmp_path / "missing") is None
@@ -0,0 +1,49 @@
+from src.benchmark_framework.utils.provider_stats import (
+    RECENT_REQUESTS,
+    ProviderStats,
+    get_provider_slug,
+)
+
+MODEL = "meta-llama/llama-4-maverick"
+
+
+def test_provider_slug_from_reported_name():
+    assert get_provider_slug("Google AI Studio") == "google-ai-studio"
+    assert get_provider_slug("DeepInfra") == "deepinfra"
+
+
+def test_rank_prefers_fast_reliable_providers():
+    stats = ProviderStats()
+    for _ in range(4):
+        stats.record_success(MODEL, "Slow", 10.0)
+        stats.record_success(MODEL, "Fast", 2.0)
+        stats.record_success(MODEL, "Flaky", 1.0)
+        stats.record_error(MODEL, "Flaky")
+        stats.record_error(MODEL, "Flaky")
+    stats.record_error(MODEL, "Broken")
+
+    # Flaky: 1s / (1/3 success rate) = 3s per successful request
+    assert stats.rank(MODEL) == ["fast", "flaky", "slow", "broken"]
+    assert stats.rank("other/model") == []
+
+
+def test_only_recent_requests_are_kept():
+    stats = ProviderStats()
+    for _ in range(RECENT_REQUESTS):
+        stats.record_success(MODEL, "Novita", 20.0)
+    for _ in range(RECENT_REQUESTS):
+        stats.record_success(MODEL, "Novita", 1.0)
+
+    assert stats.score(MODEL, "Novita") == 1.0
+
+
+def test_stats_persist_between_runs(tmp_path):
+    path = tmp_path / ".provider_stats.json"
+    stats = ProviderStats(path)
+    stats.record_success(MODEL, "Together", 3.0)
+    stats.record_error(MODEL, "Together")
+
+    reloaded = ProviderStats(path)
+
+    assert reloaded.rank(MODEL) == ["together"]
+    assert reloaded.score(MODEL, "Together") == 6.0
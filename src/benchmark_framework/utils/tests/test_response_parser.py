@@ -2,6 +2,7 @@ import pytest
 from src.benchmark_framework.utils.response_parser import (
     strip_markdown_code_blocks,
     extract_json_field,
+    extract_json_objects,
 )
 
 
@@ -121,3 +122,22 @@ def test_extract_json_field_realistic_response():
     assert extract_json_field(response, "answer") == "B"
     assert extract_json_field(response, "legal_basis") == "Art. 415 § 1 k.c."
     assert "winy swojej" in extract_json_field(response, "legal_basis_content")
+
+
+# --- Tests for extract_json_objects ---
+@pytest.mark.parametrize(
+    "response,expected",
+    [
+        ('[{"id": 1, "answer": "A"}]', [{"id": 1, "answer": "A"}]),
+        ('```json\n[{"id": 1}, {"id": 2}]\n```', [{"id": 1}, {"id": 2}]),
+        ('{"answer": "B"}', [{"answer": "B"}]),
+        (
+            'Odpowiedzi: {"id": 1, "answer": "A"} oraz {"id": 2, "answer": "C"}',
+            [{"id": 1, "answer": "A"}, {"id": 2, "answer": "C"}],
+        ),
+        ("no json here", []),
+        ("", []),
+    ],
+)
+def test_extract_json_objects(response, expected):
+    assert extract_json_objects(response) == expected
@@ -0,0 +1,27 @@
+from src.benchmark_framework.utils.response_schema import (
+    build_response_schema,
+    get_json_schema_format,
+    string_field,
+)
+
+
+def test_build_response_schema_requires_every_field():
+    schema = build_response_schema(
+        {"answer": string_field("Litera", ["A", "B", "C"]), "legal_basis": {}}
+    )
+
+    assert schema["required"] == ["answer", "legal_basis"]
+    assert schema["additionalProperties"] is False
+    assert schema["properties"]["answer"]["enum"] == ["A", "B", "C"]
+
+
+def test_string_field_without_enum():
+    assert string_field("Treść") == {"type": "string", "description": "Treść"}
+
+
+def test_json_schema_format_is_strict():
+    response_format = get_json_schema_format({"type": "object"})
+
+    assert response_format["type"] == "json_schema"
+    assert response_format["json_schema"]["strict"] is True
+    assert response_format["json_schema"]["schema"] == {"type": "object"}
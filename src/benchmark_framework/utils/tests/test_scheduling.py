@@ -0,0 +1,61 @@
+import pytest
+
+from src.benchmark_framework.utils.scheduling import (
+    estimate_makespan,
+    interleave_by_group,
+    order_longest_first,
+)
+
+
+def test_interleave_round_robins_across_groups():
+    items = [("2024", 1), ("2024", 2), ("2024", 3), ("2025", 1), ("2025", 2)]
+
+    result = interleave_by_group(items, key=lambda item: item[0])
+
+    assert result == [("2024", 1), ("2025", 1), ("2024", 2), ("2025", 2), ("2024", 3)]
+
+
+def test_interleave_preserves_order_within_group():
+    items = [("a", 3), ("b", 1), ("a", 1), ("a", 2)]
+
+    result = interleave_by_group(items, key=lambda item: item[0])
+
+    assert [i for i in result if i[0] == "a"] == [("a", 3), ("a", 1), ("a", 2)]
+
+
+def test_interleave_empty():
+    assert interleave_by_group([], key=lambda item: item) == []
+
+
+def test_order_longest_first():
+    items = ["bb", "a", "dddd", "ccc"]
+
+    assert order_longest_first(items, cost=len) == ["dddd", "ccc", "bb", "a"]
+
+
+@pytest.mark.parametrize(
+    "costs,workers,expected",
+    [
+        ([], 2, 0.0),
+        ([3, 3, 3], 1, 9.0),
+        ([1, 1, 1, 1, 4], 2, 6.0),
+        ([4, 1, 1, 1, 1], 2, 4.0),
+        ([5, 2], 4, 5.0),
+    ],
+)
+def test_estimate_makespan(costs, workers, expected):
+    assert estimate_makespan(costs, workers) == expected
+
+
+def test_lpt_never_worse_than_file_order_on_long_tail():
+    costs = [1] * 12 + [10]
+
+    file_order = estimate_makespan(costs, workers=4)
+    lpt = estimate_makespan(sorted(costs, reverse=True), workers=4)
+
+    assert lpt < file_order
+
+
+def test_estimate_makespan_requires_workers():
+    with pytest.raises(ValueError):
+        estimate_makespan([1], workers=0)
@@ -0,0 +1,70 @@
+import pytest
+
+from src.benchmark_framework.configs.model_config import ModelConfig
+from src.benchmark_framework.models.base_model import BaseModel
+from src.benchmark_framework.utils.token_counter import (
+    DEFAULT_CHARS_PER_TOKEN,
+    TokenCounter,
+    get_task_hash,
+)
+
+
+class DummyModel(BaseModel):
+    def __init__(self, tokens_per_word=None):
+        super().__init__("dummy", ModelConfig())
+        self.tokens_per_word = tokens_per_word
+        self.count_calls = 0
+
+    def count_tokens(self, system_prompt, prompt):
+        if self.tokens_per_word is None:
+            return None
+        self.count_calls += 1
+        return len(f"{system_prompt} {prompt}".split()) * self.tokens_per_word
+
+    def generate_response(self, system_prompt, prompt):
+        return ""
+
+
+def test_uses_local_tokenizer_and_caches_counts(tmp_path):
+    model = DummyModel(tokens_per_word=2)
+    counter = TokenCounter(model, tmp_path / "counts.json")
+
+    assert counter.count("system", "one two") == 6
+    assert counter.count("system", "one two") == 6
+    assert model.count_calls == 1
+
+    counter.save()
+    reloaded = TokenCounter(model, tmp_path / "counts.json")
+    assert reloaded.count("system", "one two") == 6
+    assert model.count_calls == 1
+
+
+def test_estimates_without_tokenizer():
+    counter = TokenCounter(DummyModel())
+
+    short = counter.count("", "a" * 30)
+    long = counter.count("", "a" * 3000)
+
+    assert long > short * 50
+    assert long >= 3000 / DEFAULT_CHARS_PER_TOKEN
+
+
+def test_calibration_moves_towards_observed_ratio(tmp_path):
+    counter = TokenCounter(DummyModel(), tmp_path / "counts.json")
+    before = counter.estimate("a" * 1000)
+
+    for _ in range(50):
+        counter.calibrate(characters=1000, input_tokens=500)
+    counter.save()
+
+    assert counter.chars_per_token == pytest.approx(2.0, abs=0.05)
+    assert counter.estimate("a" * 1000) > before
+    assert TokenCounter(DummyModel(), tmp_path / "counts.json").chars_per_token == (
+        counter.chars_per_token
+    )
+
+
+def test_task_hash_depends_on_model_and_prompts():
+    assert get_task_hash("a", "s", "p") == get_task_hash("a", "s", "p")
+    assert get_task_hash("a", "s", "p") != get_task_hash("b", "s", "p")
+    assert get_task_hash("a", "s", "p") != get_task_hash("a", "sp", "")
@@ -0,0 +1,33 @@
+from src.benchmark_framework.utils.windowing import compact_masked_text
+
+
+def words(prefix: str, count: int) -> str:
+    return " ".join(f"{prefix}{i}" for i in range(count))
+
+
+def test_text_without_masks_is_unchanged():
+    text = words("w", 20)
+
+    assert compact_masked_text(text, window_tokens=2) == text
+
+
+def test_keeps_header_and_window_around_mask():
+    text = f"{words('h', 5)} {words('a', 20)} <ART_MASK> {words('b', 20)}"
+
+    result = compact_masked_text(text, window_tokens=2, header_tokens=3)
+
+    assert result == "h0 h1 h2\n[...]\na18 a19 <ART_MASK> b0 b1\n[...]"
+
+
+def test_overlapping_windows_are_merged():
+    text = f"{words('a', 10)} <ART_MASK> x y <TREŚĆ_MASK>. {words('b', 10)}"
+
+    result = compact_masked_text(text, window_tokens=2)
+
+    assert result == "[...]\na8 a9 <ART_MASK> x y <TREŚĆ_MASK>. b0 b1\n[...]"
+
+
+def test_window_covering_whole_text_keeps_line_breaks():
+    text = "Sąd Rejonowy\nUZASADNIENIE\nna podstawie <ART_MASK> k.c."
+
+    assert compact_masked_text(text, window_tokens=100, header_tokens=10) == text
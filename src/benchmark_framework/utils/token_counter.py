@@ -0,0 +1,79 @@
+import hashlib
+import json
+import threading
+from pathlib import Path
+from typing import Dict, Optional
+
+from src.benchmark_framework.models.base_model import BaseModel
+from src.common.file_operations import FileOperations
+from src.constants import ENCODING
+
+# Conservative characters per token for Polish legal text before calibration
+DEFAULT_CHARS_PER_TOKEN = 3.0
+# Estimates are inflated so that borderline tasks are not sent only to be rejected
+ESTIMATE_MARGIN = 1.1
+# Weight of a new observation in the calibrated characters-per-token ratio
+CALIBRATION_SMOOTHING = 0.1
+
+
+def get_task_hash(model_name: str, system_prompt: str, prompt: str) -> str:
+    content = "\0".join((model_name, system_prompt, prompt))
+    return hashlib.sha256(content.encode(ENCODING)).hexdigest()[:16]
+
+
+class TokenCounter:
+    """
+    Counts input tokens of a request before it is sent.
+
+    Uses the model's local tokenizer when it has one (`BaseModel.count_tokens`),
+    otherwise a characters-per-token estimate calibrated on the input token
+    usage that providers report. Tokenizer counts (keyed by a hash of the model
+    name and both prompts) and the calibration are cached in a JSON file.
+    """
+
+    def __init__(self, model: BaseModel, cache_path: Optional[Path] = None):
+        self.model = model
+        self.cache_path = cache_path
+        self.counts: Dict[str, int] = {}
+        self.chars_per_token = DEFAULT_CHARS_PER_TOKEN
+        if cache_path is not None and cache_path.exists():
+            with open(cache_path, "r", encoding=ENCODING) as f:
+                cached = json.load(f)
+            self.counts = cached.get("counts", {})
+            self.chars_per_token = cached.get("chars_per_token", self.chars_per_token)
+        # Runner workers calibrate concurrently
+        self._lock = threading.Lock()
+
+    def count(self, system_prompt: str, prompt: str) -> int:
+        task_hash = get_task_hash(self.model.model_name, system_prompt, prompt)
+        if task_hash in self.counts:
+            return self.counts[task_hash]
+
+        tokens = self.model.count_tokens(system_prompt, prompt)
+        if tokens is None:
+            # Estimates follow the latest calibration, so they are not cached
+            return self.estimate(system_prompt + prompt)
+        with self._lock:
+            self.counts[task_hash] = tokens
+        return tokens
+
+    def estimate(self, text: str) -> int:
+        return int(len(text) / self.chars_per_token * ESTIMATE_MARGIN) + 1
+
+    def calibrate(self, characters: int, input_tokens: int) -> None:
+        """
+        Update the characters-per-token ratio from a request's reported usage.
+        """
+        if characters <= 0 or input_tokens <= 0:
+            return
+        with self._lock:
+            self.chars_per_token += CALIBRATION_SMOOTHING * (
+                characters / input_tokens - self.chars_per_token
+            )
+
+    def save(self) -> None:
+        if self.cache_path is None:
+            return
+        with self._lock:
+            cached = {"chars_per_token": self.chars_per_token, "counts": self.counts}
+            FileOperations.save_json(cached, self.cache_path)
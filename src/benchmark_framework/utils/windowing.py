@@ -0,0 +1,57 @@
+import re
+from typing import List, Sequence, Tuple
+
+JUDGMENT_MASKS = ("<ART_MASK>", "<TREŚĆ_MASK>")
+WINDOW_SEPARATOR = "\n[...]\n"
+
+_TOKEN_PATTERN = re.compile(r"\S+")
+
+
+def _merge_spans(spans: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    merged: List[Tuple[int, int]] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def compact_masked_text(
+    text: str,
+    window_tokens: int,
+    header_tokens: int = 0,
+    masks: Sequence[str] = JUDGMENT_MASKS,
+) -> str:
+    """
+    Keep the first `header_tokens` tokens and `window_tokens` tokens on each side of
+    every mask; overlapping windows are merged and gaps are marked with `[...]`.
+
+    Tokens are whitespace-separated words, so the original line breaks are kept
+    inside each window. Texts without masks are returned unchanged.
+    """
+    tokens = [match.span() for match in _TOKEN_PATTERN.finditer(text)]
+    mask_indices = [
+        i
+        for i, (start, end) in enumerate(tokens)
+        if any(mask in text[start:end] for mask in masks)
+    ]
+    if not mask_indices:
+        return text
+
+    spans = [(0, min(header_tokens, len(tokens)))] if header_tokens > 0 else []
+    spans += [
+        (max(0, i - window_tokens), min(len(tokens), i + window_tokens + 1))
+        for i in mask_indices
+    ]
+    spans = _merge_spans(spans)
+
+    compacted = WINDOW_SEPARATOR.join(
+        text[tokens[first][0] : tokens[last - 1][1]] for first, last in spans
+    )
+    # Mark text cut before the first and after the last window
+    if spans[0][0] > 0:
+        compacted = "[...]\n" + compacted
+    if spans[-1][1] < len(tokens):
+        compacted += "\n[...]"
+    return compacted